@@ -0,0 +1,437 @@
+"""Incrementally maintained account model for rules and enforcement.
+
+Every event updates the model in O(1) before any rule runs, so rules can
+ask for aggregate state (net position, open orders, P&L, fill counts)
+without querying the SDK or scanning history.
+
+Sources:
+
+* ``POSITION_*`` events               -> net position per contract
+* ``ORDER_*`` events and raw
+  ``order_update`` from the user hub   -> open orders per contract
+* raw ``trade_execution`` from the
+  user hub                             -> fill counts, realized P&L, fees
+* ``QUOTE_UPDATE``                     -> mark price, unrealized P&L
+
+``order_update`` and ``trade_execution`` are not forwarded to the EventBus
+by the SDK, so the daemon registers them on the realtime client and feeds
+them through the rule engine under these string event types.
+"""
+
+import time
+
+from daemon.dispatch import symbol_from_contract
+from daemon.pnl import PnlSession
+from daemon.windows import WindowStore
+
+from project_x_py import EventType
+from project_x_py.types import PositionType
+
+ORDER_UPDATE = "order_update"
+TRADE_EXECUTION = "trade_execution"
+
+POSITION_EVENT_TYPES = (
+    EventType.POSITION_OPENED,
+    EventType.POSITION_UPDATED,
+    EventType.POSITION_CLOSED,
+)
+ORDER_EVENT_TYPES = (
+    EventType.ORDER_PLACED,
+    EventType.ORDER_MODIFIED,
+    EventType.ORDER_FILLED,
+    EventType.ORDER_CANCELLED,
+    EventType.ORDER_REJECTED,
+    EventType.ORDER_EXPIRED,
+)
+STATE_EVENT_TYPES = (
+    *POSITION_EVENT_TYPES,
+    *ORDER_EVENT_TYPES,
+    EventType.QUOTE_UPDATE,
+    ORDER_UPDATE,
+    TRADE_EXECUTION,
+)
+
+# Gateway order status codes that leave the order working
+OPEN_ORDER_STATUSES = (1, 6)  # Open, Pending
+
+
+def unwrap_payload(raw):
+    """Strip SignalR list/``{"action", "data"}`` wrappers from a user-hub payload."""
+    while True:
+        if isinstance(raw, list):
+            dicts = [item for item in raw if isinstance(item, dict)]
+            if not dicts:
+                return None
+            raw = dicts[-1]
+        elif isinstance(raw, dict) and isinstance(raw.get("data"), dict | list):
+            raw = raw["data"]
+        else:
+            return raw if isinstance(raw, dict) else None
+
+
+def _field(obj, name, default=None):
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
+class AccountState:
+    def __init__(self, account_id=None):
+        self.account_id = account_id
+        # rule name -> dict a rule may keep its own per-account memory in
+        self._rule_state = {}
+        # WindowSpec -> WindowStore of sliding-window counters (see windows.py)
+        self._windows = {}
+        # (rule, name, seconds, buckets) -> saved window contents, claimed on first use
+        self._saved_windows = {}
+        self.clock = time.time  # replay substitutes the recorded time
+        # contract_id -> {"account_id", "type", "size", "net", "average_price"}
+        self._positions = {}
+        # contract_id -> {order_id: {"side", "size", "type", "limit_price", "stop_price"}}
+        self._orders = {}
+        self._order_contract = {}
+        # contract_id -> number of executions
+        self._fills = {}
+        self.total_fills = 0
+        self.orders_filled = 0
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        # Unrealized P&L: per contract, with a running total kept in step
+        self._point_values = {}
+        self._marks = {}
+        self._contracts_by_root = {}
+        self._unrealized = {}
+        self.unrealized_pnl = 0.0
+        # Something dump() saves changed since it last ran (see snapshot.py)
+        self._unsaved = True
+
+        self._handlers = {
+            EventType.POSITION_OPENED: self._on_position,
+            EventType.POSITION_UPDATED: self._on_position,
+            EventType.POSITION_CLOSED: self._on_position,
+            EventType.ORDER_PLACED: self._on_order_placed,
+            EventType.ORDER_MODIFIED: self._on_order_modified,
+            EventType.ORDER_FILLED: self._on_order_done,
+            EventType.ORDER_CANCELLED: self._on_order_done,
+            EventType.ORDER_REJECTED: self._on_order_done,
+            EventType.ORDER_EXPIRED: self._on_order_done,
+            EventType.QUOTE_UPDATE: self._on_quote,
+            ORDER_UPDATE: self._on_order_update,
+            TRADE_EXECUTION: self._on_trade,
+        }
+
+    # -- set-up ---------------------------------------------------------
+
+    def set_point_value(self, symbol, point_value):
+        """Dollar value of a one-point move for an instrument root."""
+        self._point_values[symbol] = point_value
+
+    def seed(self, positions, orders=()):
+        """Load one bulk REST snapshot of positions (and optionally orders)."""
+        for contract_id in list(self._positions):
+            self._set_position(contract_id, None)
+        for position in positions:
+            if position.size:
+                self._set_position(
+                    position.contractId,
+                    {
+                        "account_id": position.accountId,
+                        "type": position.type,
+                        "size": position.size,
+                        "average_price": position.averagePrice,
+                    },
+                )
+        self._orders.clear()
+        self._order_contract.clear()
+        for order in orders:
+            self._upsert_order(order.contractId, order.id, order)
+
+    # -- updates --------------------------------------------------------
+
+    def apply(self, event):
+        if event.type != EventType.QUOTE_UPDATE:
+            # Quotes only move marks and unrealized P&L, which the next quote restores
+            self._unsaved = True
+        handler = self._handlers.get(event.type)
+        if handler is not None and isinstance(event.data, dict | list):
+            handler(event.data)
+
+    def _on_position(self, data):
+        data = unwrap_payload(data)
+        if not data or not data.get("contractId"):
+            return
+        contract_id = data["contractId"]
+        size = data.get("size", 0)
+        if not size:
+            self._set_position(contract_id, None)
+            return
+        entry = dict(self._positions.get(contract_id, {}))
+        entry["size"] = size
+        for field, key in (
+            ("accountId", "account_id"),
+            ("type", "type"),
+            ("averagePrice", "average_price"),
+        ):
+            if field in data:
+                entry[key] = data[field]
+        self._set_position(contract_id, entry)
+
+    def _set_position(self, contract_id, entry):
+        root = symbol_from_contract(contract_id)
+        if entry is None:
+            self._positions.pop(contract_id, None)
+            contracts = self._contracts_by_root.get(root)
+            if contracts is not None:
+                contracts.discard(contract_id)
+        else:
+            sign = -1 if entry.get("type") == PositionType.SHORT else 1
+            entry["net"] = sign * abs(entry["size"])
+            self._positions[contract_id] = entry
+            self._contracts_by_root.setdefault(root, set()).add(contract_id)
+        self._mark_to_market(contract_id, root)
+
+    def _on_order_placed(self, data):
+        contract_id = data.get("contract_id")
+        order_id = data.get("order_id")
+        if contract_id and order_id is not None:
+            self._upsert_order(
+                contract_id,
+                order_id,
+                {
+                    "side": data.get("side"),
+                    "size": data.get("size"),
+                    "type": data.get("order_type"),
+                    "limitPrice": data.get("limit_price"),
+                    "stopPrice": data.get("stop_price"),
+                },
+            )
+
+    def _on_order_modified(self, data):
+        order_id = data.get("order_id")
+        contract_id = self._order_contract.get(order_id)
+        if contract_id is None:
+            return
+        order = self._orders[contract_id][order_id]
+        for key, value in (data.get("modifications") or {}).items():
+            if value is not None:
+                order[key] = value
+
+    def _on_order_done(self, data):
+        order = data.get("order")
+        order_id = _field(order, "id", data.get("order_id"))
+        if data.get("new_status") == 2 or _field(order, "status") == 2:
+            self.orders_filled += 1
+        self._remove_order(order_id)
+
+    def _on_order_update(self, data):
+        data = unwrap_payload(data)
+        if not data or data.get("id") is None:
+            return
+        if data.get("status") in OPEN_ORDER_STATUSES:
+            self._upsert_order(data.get("contractId"), data["id"], data)
+        else:
+            self._remove_order(data["id"])
+
+    def _upsert_order(self, contract_id, order_id, source):
+        if not contract_id:
+            return
+        self._orders.setdefault(contract_id, {})[order_id] = {
+            "side": _field(source, "side"),
+            "size": _field(source, "size"),
+            "type": _field(source, "type"),
+            "limit_price": _field(source, "limitPrice"),
+            "stop_price": _field(source, "stopPrice"),
+        }
+        self._order_contract[order_id] = contract_id
+
+    def _remove_order(self, order_id):
+        contract_id = self._order_contract.pop(order_id, None)
+        if contract_id is not None:
+            orders = self._orders.get(contract_id)
+            if orders is not None:
+                orders.pop(order_id, None)
+
+    def _on_trade(self, data):
+        data = unwrap_payload(data)
+        if not data or data.get("voided"):
+            return
+        contract_id = data.get("contractId")
+        self._fills[contract_id] = self._fills.get(contract_id, 0) + 1
+        self.total_fills += 1
+        if data.get("profitAndLoss") is not None:  # None on the opening half-turn
+            self.realized_pnl += data["profitAndLoss"]
+        self.fees += data.get("fees") or 0.0
+
+    def _on_quote(self, data):
+        symbol = data.get("symbol")
+        if not symbol:
+            return
+        price = data.get("last")
+        if price is None:
+            bid, ask = data.get("bid"), data.get("ask")
+            if bid is None or ask is None:
+                return
+            price = (bid + ask) / 2
+        root = symbol_from_contract(symbol)
+        self._marks[root] = price
+        for contract_id in self._contracts_by_root.get(root, ()):
+            self._mark_to_market(contract_id, root)
+
+    def _mark_to_market(self, contract_id, root):
+        position = self._positions.get(contract_id)
+        mark = self._marks.get(root)
+        point_value = self._point_values.get(root)
+        value = 0.0
+        if position is not None and mark is not None and point_value is not None:
+            average_price = position.get("average_price")
+            if average_price is not None:
+                value = (mark - average_price) * position["net"] * point_value
+        self.unrealized_pnl += value - self._unrealized.get(contract_id, 0.0)
+        if position is None:
+            self._unrealized.pop(contract_id, None)
+        else:
+            self._unrealized[contract_id] = value
+
+    # -- O(1) lookups for rules -----------------------------------------
+
+    def position(self, contract_id):
+        return self._positions.get(contract_id)
+
+    def net_position(self, contract_id):
+        """Signed size: positive long, negative short, 0 flat."""
+        position = self._positions.get(contract_id)
+        return position["net"] if position else 0
+
+    def open_orders(self, contract_id):
+        return self._orders.get(contract_id, {})
+
+    def open_order_count(self, contract_id):
+        return len(self._orders.get(contract_id, ()))
+
+    def fill_count(self, contract_id=None):
+        if contract_id is None:
+            return self.total_fills
+        return self._fills.get(contract_id, 0)
+
+    def unrealized_pnl_for(self, contract_id):
+        return self._unrealized.get(contract_id, 0.0)
+
+    @property
+    def net_pnl(self):
+        """Realized minus fees plus unrealized, since the daemon started."""
+        return self.realized_pnl - self.fees + self.unrealized_pnl
+
+    def open_contracts(self):
+        """Contract IDs with a non-zero position."""
+        return list(self._positions)
+
+    def rule_state(self, name):
+        """Private, per-account scratch space for the rule called ``name``."""
+        state = self._rule_state.get(name)
+        if state is None:
+            state = self._rule_state[name] = {}
+            self._unsaved = True
+        return state
+
+    def window(self, spec, key=None):
+        """Sliding-window counter for ``spec`` and ``key`` (contract ID, or None for the account)."""
+        self._unsaved = True  # the rule asking is about to count into it
+        store = self._windows.get(spec)
+        if store is None:
+            store = self._windows[spec] = WindowStore(spec)
+            for saved_key, head, slots in self._saved_windows.pop(spec[:4], ()):
+                store.get(saved_key).load(head, slots)
+        return store.get(key)
+
+    def resolve(self, identifier):
+        """Map a contract ID or bare symbol to a contract with an open position."""
+        if identifier in self._positions:
+            return identifier
+        contracts = self._contracts_by_root.get(symbol_from_contract(identifier))
+        return next(iter(contracts)) if contracts else None
+
+    def snapshot(self):
+        return {
+            "positions": {c: p["net"] for c, p in self._positions.items()},
+            "open_orders": {c: len(o) for c, o in self._orders.items() if o},
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "fees": self.fees,
+            "fills": self.total_fills,
+            "orders_filled": self.orders_filled,
+        }
+
+    # -- crash recovery (see snapshot.py) -------------------------------
+
+    @property
+    def unsaved(self):
+        """Whether anything ``dump`` saves changed since it last ran.
+
+        Quotes alone do not count, unless they moved a rule's ``PnlSession``
+        (new high-water mark, reset or latch).
+        """
+        if self._unsaved:
+            return True
+        return any(
+            isinstance(value, PnlSession) and value.unsaved
+            for memory in self._rule_state.values()
+            for value in memory.values()
+        )
+
+    def dump(self):
+        """JSON-safe copy of the model, for the crash-recovery snapshot."""
+        self._unsaved = False
+        rules = {}
+        for name, memory in self._rule_state.items():
+            saved = {}
+            for key, value in memory.items():
+                if isinstance(value, PnlSession):
+                    saved[key] = {"pnl_session": value.dump()}
+                elif value is None or isinstance(value, bool | int | float | str):
+                    saved[key] = value
+            rules[name] = saved
+        windows = []
+        for spec, store in self._windows.items():
+            keys = [
+                [key, *window.dump()]
+                for key, window in store.windows.items()
+                if window.count
+            ]
+            if keys:
+                windows.append([list(spec[:4]), keys])
+        return {
+            "positions": {c: p["net"] for c, p in self._positions.items()},
+            "open_orders": {c: len(o) for c, o in self._orders.items() if o},
+            "fills": [[c, n] for c, n in self._fills.items()],
+            "total_fills": self.total_fills,
+            "orders_filled": self.orders_filled,
+            "realized_pnl": self.realized_pnl,
+            "fees": self.fees,
+            "marks": self._marks,
+            "rules": rules,
+            "windows": windows,
+        }
+
+    def restore(self, saved):
+        """Load what REST cannot give back: P&L, fill counts, marks, rule memory.
+
+        Call after ``seed``: positions and orders always come from the broker.
+        """
+        self._fills = dict(saved["fills"])
+        self.total_fills = saved["total_fills"]
+        self.orders_filled = saved["orders_filled"]
+        self.realized_pnl = saved["realized_pnl"]
+        self.fees = saved["fees"]
+        self._marks.update(saved["marks"])
+        for contract_id in self._positions:
+            self._mark_to_market(contract_id, symbol_from_contract(contract_id))
+        for name, memory in saved["rules"].items():
+            state = self.rule_state(name)
+            for key, value in memory.items():
+                if isinstance(value, dict) and "pnl_session" in value:
+                    value = PnlSession.load(value["pnl_session"])
+                state[key] = value
+        self._saved_windows = {tuple(spec): keys for spec, keys in saved["windows"]}
+
+    def __len__(self):
+        return len(self._positions)
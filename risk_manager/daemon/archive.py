@@ -0,0 +1,183 @@
+"""Columnar archive of the audit trail, and breach queries over it.
+
+Only the active ``audit.ndjson`` segment is NDJSON. When the audit writer
+rotates a segment (daily, or at ``audit.rotate_mb``), ``AuditArchive``
+compacts it in a background thread into zstd-compressed Parquet files,
+one per day of records, and deletes the segment:
+
+    logs/archive/day=2025-10-17/audit-20251018-000000.parquet
+
+Each breach is also written to the audit trail as one structured record
+(``"kind": "breach"`` plus account, rule, contract, action, enforcement
+and reason), so breaches become typed columns rather than text to parse.
+
+``query_breaches`` scans the archive lazily with polars. The ``day``
+partition prunes whole directories for a time range, the filters on
+account and rule are pushed down to the Parquet reader, and only the
+needed columns are read. Segments not yet compacted and the active
+segment are scanned as NDJSON on top.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, time as dt_time, timedelta
+from pathlib import Path
+
+import polars as pl
+
+SCHEMA = {
+    "timestamp": pl.Utf8,
+    "level": pl.Utf8,
+    "message": pl.Utf8,
+    "kind": pl.Utf8,
+    "account": pl.Int64,
+    "rule": pl.Utf8,
+    "contract": pl.Utf8,
+    "action": pl.Utf8,
+    "enforcement": pl.Utf8,
+    "reason": pl.Utf8,
+}
+# How the audit writer serialises a breach record's kind; cheap pre-filter for NDJSON
+BREACH_MARKER = '"kind": "breach"'
+BREACH_FIELDS = (
+    "timestamp",
+    "account",
+    "rule",
+    "contract",
+    "action",
+    "enforcement",
+    "reason",
+)
+
+
+def _read_segment(path, marker=None):
+    """Records of one NDJSON segment; with ``marker``, only lines containing it are parsed."""
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if marker is not None and marker not in line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line of a crashed writer
+            if isinstance(record, dict):
+                rows.append(record)
+    return rows
+
+
+def compact(segment, archive_dir):
+    """Rewrite one rotated NDJSON segment as per-day Parquet files, then delete it."""
+    segment = Path(segment)
+    rows = _read_segment(segment)
+    if rows:
+        frame = pl.from_dicts(rows, schema=SCHEMA, strict=False).with_columns(
+            pl.col("timestamp").str.to_datetime(strict=False)
+        )
+        frame = frame.with_columns(pl.col("timestamp").dt.date().alias("day"))
+        for (day,), part in frame.partition_by("day", as_dict=True).items():
+            directory = Path(archive_dir) / f"day={day}"
+            directory.mkdir(parents=True, exist_ok=True)
+            target = directory / f"{segment.stem}.parquet"
+            partial = target.with_suffix(".parquet.tmp")
+            part.drop("day").write_parquet(partial, compression="zstd", statistics=True)
+            os.replace(partial, target)
+    segment.unlink()
+
+
+class AuditArchive:
+    """Compacts rotated segments in the background; pass ``on_rotate`` to the writer."""
+
+    def __init__(self, archive_dir, logger):
+        self.archive_dir = Path(archive_dir)
+        self.logger = logger
+
+    def on_rotate(self, segment):
+        threading.Thread(
+            target=self._compact, args=(segment,), name="audit-archive", daemon=True
+        ).start()
+
+    def compact_pending(self, audit_path):
+        """Compact segments a previous run rotated but did not finish archiving."""
+        for segment in pending_segments(audit_path):
+            self.on_rotate(segment)
+
+    def _compact(self, segment):
+        try:
+            compact(segment, self.archive_dir)
+            self.logger.info(f"Archived audit segment {segment} to {self.archive_dir}")
+        except Exception as e:
+            # The segment stays on disk and is still searched as NDJSON
+            self.logger.error(f"Archiving audit segment {segment} failed: {e}")
+
+
+def pending_segments(audit_path):
+    audit_path = Path(audit_path)
+    return sorted(audit_path.parent.glob(f"{audit_path.stem}-*{audit_path.suffix}"))
+
+
+def query_breaches(
+    archive_dir, audit_path, account=None, rule=None, since=None, until=None, limit=20
+):
+    """Newest ``limit`` breaches matching the filters, oldest first.
+
+    ``since`` / ``until`` are naive local datetimes; ``until`` is exclusive.
+    """
+    predicate = pl.col("kind") == "breach"
+    if account is not None:
+        predicate &= pl.col("account") == account
+    if rule is not None:
+        predicate &= pl.col("rule") == rule
+    if since is not None:
+        predicate &= pl.col("timestamp") >= since
+    if until is not None:
+        predicate &= pl.col("timestamp") < until
+
+    frames = []
+    archive_dir = Path(archive_dir)
+    if any(archive_dir.glob("day=*/*.parquet")):
+        scan = pl.scan_parquet(
+            archive_dir / "day=*" / "*.parquet", hive_partitioning=True
+        )
+        # Partition pruning: whole days outside the range are never opened
+        if since is not None:
+            scan = scan.filter(pl.col("day") >= since.date())
+        if until is not None:
+            # ``until`` is exclusive: at midnight, its own day holds nothing to read
+            scan = scan.filter(
+                pl.col("day") <= (until - timedelta(microseconds=1)).date()
+            )
+        frames.append(scan.filter(predicate).select(BREACH_FIELDS).collect())
+
+    rows = []
+    for path in [*pending_segments(audit_path), Path(audit_path)]:
+        if path.exists():
+            rows.extend(
+                record
+                for record in _read_segment(path, BREACH_MARKER)
+                if record.get("kind") == "breach"
+            )
+    if rows:
+        recent = pl.from_dicts(rows, schema=SCHEMA, strict=False).with_columns(
+            pl.col("timestamp").str.to_datetime(strict=False)
+        )
+        frames.append(recent.filter(predicate).select(BREACH_FIELDS))
+
+    if not frames:
+        return []
+    result = pl.concat(frames).sort("timestamp").tail(limit)
+    return [
+        {**row, "timestamp": row["timestamp"].isoformat() if row["timestamp"] else None}
+        for row in result.iter_rows(named=True)
+    ]
+
+
+def parse_when(value, end=False):
+    """``YYYY-MM-DD`` or an ISO datetime; a bare date as ``until`` covers the whole day."""
+    if value is None:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        return datetime.combine(parsed.date() + timedelta(days=1), dt_time())
+    return parsed
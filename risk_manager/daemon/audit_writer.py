@@ -0,0 +1,282 @@
+"""Background group-commit writer for logs/audit.ndjson.
+
+``write()`` only appends to an in-memory queue and returns immediately, so
+the event handler never waits on disk. A writer thread wakes every
+``flush_interval_ms`` (or sooner once ``batch_size`` records are waiting),
+serialises the whole batch and appends it with a single ``write()`` call.
+
+fsync policy:
+
+* ``"never"``    - leave durability to the OS page cache.
+* ``"batch"``    - fsync after every batch.
+* ``"interval"`` - fsync at most once every ``fsync_interval_s`` seconds.
+
+The queue is bounded by ``max_queue``. When it is full, INFO records are
+dropped and counted; WARNING and ERROR records (breaches, enforcement,
+failures) are still accepted, up to twice ``max_queue``, so the decision
+trail survives a burst without the queue growing without limit when the
+disk cannot keep up.
+
+An I/O error (disk full, file removed) never stops the writer thread. The
+failed batch is kept and retried every ``retry_interval_s`` on a reopened
+file, and the errors are counted in ``stats()``. A record cut off by the
+failed write is terminated before the retry so every other line stays valid
+JSON; records of the batch that reached the file before the error are
+written again.
+
+Listeners registered with ``add_listener`` are called from the writer thread
+with each committed batch (a list of record dicts), after it reaches the
+file. The control socket uses this to stream the trail to ``riskd tail``.
+
+``set_rotation`` turns on segment rotation: at the first write of a new day,
+or once the file reaches ``max_bytes``, it is renamed to
+``<stem>-<YYYYmmdd-HHMMSS>.ndjson`` and a fresh one is started. The
+``on_rotate`` callback receives the closed segment's path (archive.py
+compacts it to Parquet).
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, datetime
+from pathlib import Path
+
+FSYNC_POLICIES = ("never", "batch", "interval")
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        path,
+        flush_interval_ms=200,
+        batch_size=512,
+        max_queue=10000,
+        fsync="interval",
+        fsync_interval_s=1.0,
+        retry_interval_s=1.0,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval_s
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+        self._dropped = 0
+        self._dropped_critical = 0  # WARNING/ERROR records over the hard limit
+        self._lost = 0  # records still unwritten when closed during an I/O failure
+        self._write_errors = 0
+        self._last_error = None
+        self.retry_interval = retry_interval_s
+        self._pending = None  # batch taken from the queue, not yet on disk
+        self._written = 0
+        self._batches = 0
+        self._unsynced = False
+        self._last_fsync = 0.0
+        self._listeners = []
+        self.rotate_bytes = 0  # 0: never rotate on size
+        self.rotate_daily = False
+        self.on_rotate = None
+        self._segment_day = None
+        atexit.register(self.close)
+
+    def configure(self, settings):
+        """Apply the ``audit`` section of the config. Missing keys keep their value."""
+        fsync = settings.get("fsync", self.fsync)
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"audit.fsync must be one of {FSYNC_POLICIES}, got {fsync!r}"
+            )
+        with self._cond:
+            if "flush_interval_ms" in settings:
+                self.flush_interval = settings["flush_interval_ms"] / 1000
+            self.batch_size = settings.get("batch_size", self.batch_size)
+            self.max_queue = settings.get("max_queue", self.max_queue)
+            self.fsync_interval = settings.get("fsync_interval_s", self.fsync_interval)
+            self.retry_interval = settings.get("retry_interval_s", self.retry_interval)
+            self.fsync = fsync
+
+    def set_rotation(self, max_bytes=0, daily=False, on_rotate=None):
+        """Rotate the file daily and/or at ``max_bytes``; ``on_rotate(path)`` gets each closed segment."""
+        with self._cond:
+            self.rotate_bytes = max_bytes
+            self.rotate_daily = daily
+            self.on_rotate = on_rotate
+
+    def write(self, message, level="INFO", fields=None):
+        """Queue one audit record. Never blocks on I/O.
+
+        ``fields`` are extra top-level keys for the record (e.g. a breach's
+        account, rule and outcome, for the archive).
+        """
+        record = (datetime.now().isoformat(), level, message, fields)
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._queue) >= self.max_queue and level == "INFO":
+                self._dropped += 1
+                return False
+            if len(self._queue) >= 2 * self.max_queue:
+                self._dropped_critical += 1
+                return False
+            self._queue.append(record)
+            if self._thread is None:
+                self._start()
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def add_listener(self, listener):
+        """Call ``listener(records)`` from the writer thread after every batch."""
+        with self._cond:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        with self._cond:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue": self.max_queue,
+                "dropped": self._dropped,
+                "dropped_critical": self._dropped_critical,
+                "write_errors": self._write_errors,
+                "last_error": self._last_error,
+                "lost": self._lost,
+                "written": self._written,
+                "batches": self._batches,
+                "fsync": self.fsync,
+            }
+
+    def close(self):
+        """Flush everything still queued and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    self._segment_opened(f)
+                    closed = self._write_segment(f)
+                if closed:
+                    return
+                self._rotate()
+            except OSError as e:
+                with self._cond:
+                    self._write_errors += 1
+                    self._last_error = f"{type(e).__name__}: {e}"
+                    if self._closed:
+                        # Shutting down with the disk still failing: give up on the rest
+                        self._lost += len(self._pending or ()) + len(self._queue)
+                        self._pending = None
+                        self._queue.clear()
+                        return
+                    self._cond.wait(self.retry_interval)
+
+    def _write_segment(self, f):
+        """Commit batches to ``f`` until closing (True) or a rotation is due (False)."""
+        while True:
+            with self._cond:
+                if self._pending is None:
+                    if not self._closed and len(self._queue) < self.batch_size:
+                        self._cond.wait(self.flush_interval)
+                    self._pending = self._queue
+                    self._queue = deque()
+                closing = self._closed
+            if self._pending:
+                if self._rotation_due(f):
+                    self._maybe_fsync(f, force=True)
+                    return False
+                self._commit(f, self._pending)
+            self._pending = None
+            self._maybe_fsync(f, force=closing)
+            if closing:
+                with self._cond:
+                    # A retried batch went first; records queued behind it still go out
+                    if not self._queue:
+                        return True
+
+    def _segment_opened(self, f):
+        stat = os.fstat(f.fileno())
+        # An existing file belongs to the day it was last written
+        self._segment_day = (
+            date.fromtimestamp(stat.st_mtime) if stat.st_size else date.today()
+        )
+        if stat.st_size:
+            with open(self.path, "rb") as existing:
+                existing.seek(-1, os.SEEK_END)
+                if existing.read(1) != b"\n":
+                    # A failed write cut the last record short; end its line
+                    f.write("\n")
+
+    def _rotation_due(self, f):
+        if self.rotate_daily and self._segment_day != date.today():
+            return f.tell() > 0
+        return bool(self.rotate_bytes) and f.tell() >= self.rotate_bytes
+
+    def _rotate(self):
+        path = Path(self.path)
+        segment = path.with_name(
+            f"{path.stem}-{datetime.now():%Y%m%d-%H%M%S}{path.suffix}"
+        )
+        os.replace(path, segment)
+        if self.on_rotate is not None:
+            # Archiving is best effort; the segment stays on disk
+            with contextlib.suppress(Exception):
+                self.on_rotate(segment)
+
+    def _records(self, batch):
+        return [
+            {"timestamp": ts, "level": level, "message": message, **(fields or {})}
+            for ts, level, message, fields in batch
+        ]
+
+    def _commit(self, f, batch):
+        records = self._records(batch)
+        f.write("".join(json.dumps(record, default=str) + "\n" for record in records))
+        f.flush()
+        self._unsynced = True
+        with self._cond:
+            self._written += len(batch)
+            self._batches += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            # A broken subscriber must not stop the trail
+            with contextlib.suppress(Exception):
+                listener(records)
+
+    def _maybe_fsync(self, f, force=False):
+        if not self._unsynced or self.fsync == "never":
+            return
+        now = time.monotonic()
+        if (
+            force
+            or self.fsync == "batch"
+            or now - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(f.fileno())
+            self._unsynced = False
+            self._last_fsync = now
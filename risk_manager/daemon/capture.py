@@ -0,0 +1,26 @@
+"""Raw event capture for ``riskd replay``.
+
+With ``capture.enabled`` the daemon records every user-hub payload and every
+EventBus event it handles, before translation, one JSON object per line:
+
+    {"ts": 1760745600.123, "account": 12345, "feed": "position_update", "data": {...}}
+
+``account`` is null for market events, which are shared by all accounts.
+Records go through the same background group-commit path as the audit
+trail, so capturing costs the event handler one queue append.
+"""
+
+import time
+
+from daemon.audit_writer import AuditWriter
+
+
+class EventCapture(AuditWriter):
+    def record(self, account_id, feed, data):
+        self.write((time.time(), account_id, feed, data))
+
+    def _records(self, batch):
+        return [
+            {"ts": ts, "account": account_id, "feed": feed, "data": data}
+            for _, _, (ts, account_id, feed, data), _ in batch
+        ]
@@ -0,0 +1,198 @@
+"""Unix domain control socket for the running daemon.
+
+``riskd status``, ``riskd metrics``, ``riskd breaches`` and ``riskd tail``
+connect to ``logs/riskd.sock`` instead of starting a second copy of the
+daemon, so their answers come from live state.
+
+Protocol: one JSON object per line in each direction. The client sends a
+request such as ``{"cmd": "status"}`` and reads one response line
+(``{"ok": true, "result": ...}`` or ``{"ok": false, "error": ...}``).
+``{"cmd": "tail"}`` is the exception: the server keeps the connection open
+and writes each audit record as its own line as soon as the audit writer
+commits it.
+
+Each tail subscriber has a bounded queue. A subscriber that cannot keep up
+loses records (and is told how many) rather than slowing the daemon down.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import json
+import os
+
+SUBSCRIBER_QUEUE = 1000
+
+
+class ControlServer:
+    def __init__(self, path, commands, audit_writer, logger):
+        self.path = str(path)
+        # name -> callable(request) returning JSON-able data (or an awaitable of it)
+        self.commands = commands
+        self.audit_writer = audit_writer
+        self.logger = logger
+        self._server = None
+        self._loop = None
+        self._subscribers = {}  # queue -> records dropped since last delivery
+
+    async def start(self):
+        if os.path.exists(self.path):
+            if await is_listening(self.path):
+                raise RuntimeError(
+                    f"Another daemon is already listening on {self.path}"
+                )
+            os.unlink(self.path)  # left behind by a crashed daemon
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o600)
+        self.audit_writer.add_listener(self._on_audit_batch)
+        self.logger.info(f"Control socket listening on {self.path}")
+
+    async def close(self):
+        self.audit_writer.remove_listener(self._on_audit_batch)
+        for queue in list(self._subscribers):
+            self._end_stream(queue)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)
+
+    async def _handle(self, reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                cmd = request["cmd"]
+            except (ValueError, KeyError, TypeError):
+                await _send(writer, {"ok": False, "error": "invalid request"})
+                return
+            if cmd == "tail":
+                await self._stream_audit(reader, writer)
+                return
+            handler = self.commands.get(cmd)
+            if handler is None:
+                await _send(writer, {"ok": False, "error": f"unknown command: {cmd}"})
+                return
+            try:
+                result = handler(request)
+                if inspect.isawaitable(result):
+                    result = await result
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                self.logger.error(f"Control command {cmd} failed: {e}")
+                response = {"ok": False, "error": str(e)}
+            await _send(writer, response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _stream_audit(self, reader, writer):
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE)
+        self._subscribers[queue] = 0
+        # Notice a reader that hangs up even while no records are flowing
+        hangup = asyncio.ensure_future(reader.read())
+        hangup.add_done_callback(lambda _: self._end_stream(queue))
+        try:
+            while True:
+                record = await queue.get()
+                if record is None:
+                    return
+                dropped = self._subscribers[queue]
+                if dropped:
+                    self._subscribers[queue] = 0
+                    writer.write(
+                        _encode(
+                            {
+                                "level": "WARNING",
+                                "message": f"{dropped} audit records skipped (reader too slow)",
+                            }
+                        )
+                    )
+                writer.write(_encode(record))
+                if queue.empty():
+                    await writer.drain()
+        finally:
+            hangup.cancel()
+            self._subscribers.pop(queue, None)
+
+    def _end_stream(self, queue):
+        if queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+    def _on_audit_batch(self, records):
+        # Audit writer thread -> event loop
+        if self._subscribers:
+            self._loop.call_soon_threadsafe(self._publish, records)
+
+    def _publish(self, records):
+        for queue in self._subscribers:
+            for record in records:
+                if queue.full():
+                    self._subscribers[queue] += 1
+                else:
+                    queue.put_nowait(record)
+
+
+def _encode(message):
+    return (json.dumps(message, default=str) + "\n").encode()
+
+
+async def _send(writer, message):
+    writer.write(_encode(message))
+    await writer.drain()
+
+
+async def is_listening(path):
+    try:
+        _, writer = await asyncio.open_unix_connection(str(path))
+    except (ConnectionError, FileNotFoundError, OSError):
+        return False
+    writer.close()
+    return True
+
+
+async def request(path, cmd, **params):
+    """Send one command to the daemon and return its result.
+
+    Raises ``ConnectionError`` when no daemon is listening and
+    ``RuntimeError`` when the daemon reports an error.
+    """
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path), limit=1 << 20)
+    except (FileNotFoundError, OSError) as e:
+        raise ConnectionError(f"daemon not reachable at {path}") from e
+    try:
+        await _send(writer, {"cmd": cmd, **params})
+        line = await reader.readline()
+    finally:
+        writer.close()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "unknown error"))
+    return response["result"]
+
+
+async def subscribe(path, cmd="tail"):
+    """Yield records streamed by the daemon until it disconnects."""
+    try:
+        reader, writer = await asyncio.open_unix_connection(str(path), limit=1 << 20)
+    except (FileNotFoundError, OSError) as e:
+        raise ConnectionError(f"daemon not reachable at {path}") from e
+    try:
+        await _send(writer, {"cmd": cmd})
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield json.loads(line)
+    finally:
+        writer.close()
@@ -0,0 +1,91 @@
+"""One enforcement action at a time per (account, contract, action).
+
+Once a position is over a limit, every following position, order and fill
+event re-evaluates to BREACH. The user hub dispatches those events
+concurrently, so without coordination each one would start another flatten
+while the first is still waiting on the broker. That is a burst of API calls,
+and a rate-limit lockout, at exactly the moment enforcement matters.
+
+``EnforcementCoordinator.run`` merges them:
+
+* **coalesced** - the same action is already in flight; this breach is
+  folded into it and nothing is sent.
+* **suppressed** - the action completed and the account model for that
+  contract (net position, open orders) has not changed since. The broker
+  update confirming the flatten is usually still on its way. Suppression
+  ends as soon as the state changes, or after ``settle_timeout_s`` in case
+  that update never arrives.
+* After a failure the same state may retry once ``retry_after_s`` has passed.
+"""
+
+import time
+
+DEFAULT_SETTLE_TIMEOUT_S = 5.0
+DEFAULT_RETRY_AFTER_S = 1.0
+
+
+def state_fingerprint(state, contract_id):
+    """What has to change before a settled action may run again."""
+    return state.net_position(contract_id), state.open_order_count(contract_id)
+
+
+class EnforcementCoordinator:
+    def __init__(
+        self,
+        settle_timeout_s=DEFAULT_SETTLE_TIMEOUT_S,
+        retry_after_s=DEFAULT_RETRY_AFTER_S,
+    ):
+        self.settle_timeout = settle_timeout_s
+        self.retry_after = retry_after_s
+        self.clock = time.monotonic
+        self._in_flight = {}  # key -> start time of the running action
+        self._settled = {}  # key -> (fingerprint, settled_at, succeeded)
+        self._counts = {"started": 0, "coalesced": 0, "suppressed": 0, "failed": 0}
+
+    def configure(self, settings):
+        """Apply the ``enforcement`` section of the config."""
+        self.settle_timeout = settings.get("settle_timeout_s", self.settle_timeout)
+        self.retry_after = settings.get("retry_after_s", self.retry_after)
+
+    async def run(self, key, fingerprint, action):
+        """Run ``action()`` for ``key`` unless it is in flight or settled.
+
+        ``fingerprint`` is a zero-argument callable returning the current
+        state fingerprint. Returns ``("done", result)``, ``("coalesced",
+        None)`` or ``("suppressed", None)``. Exceptions from ``action``
+        propagate after being recorded.
+        """
+        if key in self._in_flight:
+            self._counts["coalesced"] += 1
+            return "coalesced", None
+        settled = self._settled.get(key)
+        if settled is not None:
+            seen, settled_at, succeeded = settled
+            hold = self.settle_timeout if succeeded else self.retry_after
+            if seen == fingerprint() and self.clock() - settled_at < hold:
+                self._counts["suppressed"] += 1
+                return "suppressed", None
+            del self._settled[key]
+
+        self._in_flight[key] = self.clock()
+        self._counts["started"] += 1
+        succeeded = False
+        try:
+            result = await action()
+            succeeded = True
+            return "done", result
+        except Exception:
+            self._counts["failed"] += 1
+            raise
+        finally:
+            # Fingerprint after the broker answered: updates that arrived
+            # while in flight are part of the state this action dealt with
+            self._settled[key] = (fingerprint(), self.clock(), succeeded)
+            del self._in_flight[key]
+
+    def in_flight(self):
+        now = self.clock()
+        return [(key, now - started) for key, started in self._in_flight.items()]
+
+    def stats(self):
+        return {**self._counts, "in_flight": len(self._in_flight)}
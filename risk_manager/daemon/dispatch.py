@@ -0,0 +1,184 @@
+"""Event-type dispatch table for the rule engine.
+
+Rules declare which events they consume with a module-level ``EVENT_TYPES``
+tuple. The symbols a rule watches come from config: the rule's own
+``symbols`` list, falling back to the global ``symbols`` list (empty means
+all symbols, see CONFIG.md).
+
+The table is built once at load time so that ``RuleEngine.handle`` only pays a
+dict lookup per event instead of calling every rule's ``check``.
+
+A rule may also define ``prepare(config)``. It runs once when the table is
+built, should raise ``ValueError`` for bad parameters, and returns the
+config object later passed to ``check`` (e.g. with defaults resolved).
+
+Rules that count events over time declare ``WINDOWS`` (see windows.py). The
+binding merges it with the rule's ``windows`` config into ``WindowSpec``s
+under ``config["windows"]`` before ``prepare`` runs.
+
+Each rule has a tier: a module-level ``TIER`` (default ``"standard"``) that
+the rule's ``tier`` config may override. ``rules_for`` returns critical
+rules first, then standard, then advisory. The engine evaluates critical and
+standard rules inline and defers advisory ones off the event's path.
+"""
+
+import inspect
+
+from daemon.windows import build_windows
+
+CRITICAL = "critical"
+STANDARD = "standard"
+ADVISORY = "advisory"
+TIERS = (CRITICAL, STANDARD, ADVISORY)
+
+
+class RuleBinding:
+    """A loaded rule module together with its config and symbol filter."""
+
+    __slots__ = ("config", "module", "name", "rank", "symbols", "tier", "wants_state")
+
+    def __init__(self, name, module, config, symbols):
+        self.name = name
+        self.module = module
+        self.tier = config.get("tier", getattr(module, "TIER", STANDARD))
+        if self.tier not in TIERS:
+            raise ValueError(
+                f"rules.{name}.tier must be one of {TIERS}, got {self.tier!r}"
+            )
+        self.rank = TIERS.index(self.tier)
+        declared = getattr(module, "WINDOWS", None)
+        prepare = getattr(module, "prepare", None)
+        try:
+            if declared is not None or "windows" in config:
+                config = {
+                    **config,
+                    "windows": build_windows(
+                        name, declared or {}, config.get("windows", {})
+                    ),
+                }
+            if prepare is not None:
+                config = prepare(config)
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"rules.{name}: {e}") from e
+        self.config = config
+        self.symbols = symbols  # frozenset of roots, or None for all symbols
+        # check(event, config, state) receives the daemon's AccountState
+        self.wants_state = len(inspect.signature(module.check).parameters) >= 3
+
+    def evaluate(self, event, state):
+        if self.wants_state:
+            return self.module.check(event, self.config, state)
+        return self.module.check(event, self.config)
+
+    def accepts(self, symbol):
+        return self.symbols is None or symbol in self.symbols
+
+
+def symbol_from_contract(identifier):
+    """Reduce a contract ID or feed symbol to its instrument root.
+
+    "CON.F.US.MNQ.Z25" -> "MNQ", "F.US.MNQ" -> "MNQ", "MNQ" -> "MNQ".
+    """
+    parts = str(identifier).split(".")
+    if len(parts) >= 5 and parts[0] == "CON":
+        return parts[3]
+    return parts[-1]
+
+
+def event_contract(event):
+    """Return the contract ID (or symbol) an event refers to, or None."""
+    data = event.data
+    if not isinstance(data, dict):
+        return None
+    identifier = (
+        data.get("contractId")
+        or data.get("contract_id")
+        or data.get("instrument")
+        or data.get("symbol")
+    )
+    if not identifier and "order" in data:
+        order = data["order"]
+        identifier = (
+            order.get("contractId")
+            if isinstance(order, dict)
+            else getattr(order, "contractId", None)
+        )
+    return identifier or None
+
+
+def event_symbol(event):
+    """Return the instrument root an event refers to, or None if unknown."""
+    identifier = event_contract(event)
+    if identifier is None:
+        return None
+    return symbol_from_contract(identifier)
+
+
+class RuleDispatcher:
+    """Maps each event type to the rules subscribed to it."""
+
+    def __init__(self, rules, config):
+        self.bindings = []
+        self._table = {}
+        self._wildcard = []
+        # Event types whose bindings carry a symbol filter
+        self._filtered = set()
+
+        default_symbols = config.get("symbols") or []
+        for name, module in rules.items():
+            rule_config = config["rules"][name]
+            symbols = rule_config.get("symbols", default_symbols)
+            binding = RuleBinding(
+                name, module, rule_config, frozenset(symbols) if symbols else None
+            )
+            self.bindings.append(binding)
+
+            event_types = getattr(module, "EVENT_TYPES", None)
+            if event_types is None:
+                self._wildcard.append(binding)
+                continue
+            for event_type in event_types:
+                self._table.setdefault(event_type, []).append(binding)
+
+        # Rules without EVENT_TYPES see every event, after the declared ones;
+        # then by tier (stable, so load order holds within a tier)
+        self._wildcard.sort(key=lambda b: b.rank)
+        for event_type, bindings in self._table.items():
+            bindings.extend(self._wildcard)
+            bindings.sort(key=lambda b: b.rank)
+            if any(b.symbols is not None for b in bindings):
+                self._filtered.add(event_type)
+        self._wildcard_filtered = any(b.symbols is not None for b in self._wildcard)
+
+    @property
+    def event_types(self):
+        """Event types at least one rule has declared, in load order."""
+        return list(self._table)
+
+    def rules_for(self, event):
+        """Return the bindings that should evaluate this event."""
+        bindings = self._table.get(event.type)
+        if bindings is None:
+            bindings = self._wildcard
+            filtered = self._wildcard_filtered
+        else:
+            filtered = event.type in self._filtered
+        if not filtered or not bindings:
+            return bindings
+        symbol = event_symbol(event)
+        if symbol is None:
+            return bindings
+        return [b for b in bindings if b.accepts(symbol)]
+
+    def describe(self):
+        """Human-readable summary of the dispatch table for live.log."""
+        lines = []
+        for event_type, bindings in self._table.items():
+            label = getattr(event_type, "value", str(event_type))
+            lines.append(
+                f"{label} -> {', '.join(f'{b.name} [{b.tier}]' for b in bindings)}"
+            )
+        if self._wildcard:
+            names = ", ".join(f"{b.name} [{b.tier}]" for b in self._wildcard)
+            lines.append(f"* -> {names}")
+        return lines
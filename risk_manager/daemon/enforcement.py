@@ -0,0 +1,224 @@
+"""Fast-path enforcement executor.
+
+``OrderManager.close_position`` looks the position up over REST
+(``search_open_positions``) before it can place the closing order, which
+alone can use most of the 100ms budget. The executor reads the position from
+the daemon's event-maintained AccountState (seeded once at start-up) and
+sends the flattening market order straight away. The contract's open orders
+are taken from the same model at decision time, before the flatten order
+exists, and cancelled concurrently so they never delay the flatten.
+
+Every flatten logs its per-step latency:
+
+* ``decision`` - event received -> rule decided to enforce
+* ``submit``   - decision -> closing order handed to the SDK
+* ``ack``      - order handed to the SDK -> broker response
+* ``total``    - event received -> broker response
+"""
+
+import asyncio
+import time
+
+from daemon.dispatch import symbol_from_contract
+from daemon.lane import LaneUnavailable
+
+from project_x_py.exceptions import ProjectXOrderError
+from project_x_py.models import OrderPlaceResponse
+from project_x_py.types import OrderSide, OrderType, PositionType
+
+# Position types the side of a closing order can be taken from
+DIRECTED_TYPES = (PositionType.LONG, PositionType.SHORT)
+
+
+class AccountOrders:
+    """Order calls for one account, through the enforcement lane if there is one.
+
+    ``OrderManager.place_order`` rejects any account but the authenticated
+    one, so without a lane, market orders for other accounts are sent
+    through the shared client with the same ``/Order/place`` payload.
+    Cancels and searches already accept an account ID and are delegated to
+    the OrderManager. With a lane (lane.py), placement and cancels for every
+    account use its dedicated connection instead, and fall back to the
+    paths above when the lane could not send them.
+    """
+
+    def __init__(self, client, orders, account_id, lane=None):
+        self.client = client
+        self.orders = orders
+        self.account_id = account_id
+        self.lane = lane
+
+    async def place_market_order(self, contract_id, side, size, account_id=None):
+        if self.lane is not None:
+            try:
+                return await self.lane.place_market_order(
+                    contract_id, side, size, account_id or self.account_id
+                )
+            except LaneUnavailable as e:
+                self.lane.fell_back(e)
+        response = await self.client._make_request(
+            "POST",
+            "/Order/place",
+            data={
+                "accountId": account_id or self.account_id,
+                "contractId": contract_id,
+                "type": OrderType.MARKET,
+                "side": side,
+                "size": size,
+                "limitPrice": None,
+                "stopPrice": None,
+                "trailPrice": None,
+                "linkedOrderId": None,
+            },
+        )
+        if not isinstance(response, dict) or not response.get("success", False):
+            message = (
+                response.get("errorMessage") if isinstance(response, dict) else None
+            )
+            raise ProjectXOrderError(message or "Order placement failed")
+        return OrderPlaceResponse(
+            orderId=response.get("orderId", 0),
+            success=True,
+            errorCode=response.get("errorCode", 0),
+            errorMessage=response.get("errorMessage"),
+        )
+
+    async def cancel_order(self, order_id, account_id=None):
+        if self.lane is not None:
+            try:
+                return await self.lane.cancel_order(
+                    order_id, account_id or self.account_id
+                )
+            except LaneUnavailable as e:
+                self.lane.fell_back(e)
+        return await self.orders.cancel_order(order_id, account_id or self.account_id)
+
+    async def search_open_orders(self, contract_id=None, account_id=None):
+        return await self.orders.search_open_orders(
+            contract_id=contract_id, account_id=account_id or self.account_id
+        )
+
+    async def close_position(self, contract_id, account_id=None):
+        account_id = account_id or self.account_id
+        positions = await self.client.search_open_positions(account_id=account_id)
+        position = next(
+            (p for p in positions if p.contractId == contract_id and p.size), None
+        )
+        if position is None:
+            return None
+        side = OrderSide.SELL if position.type == PositionType.LONG else OrderSide.BUY
+        return await self.place_market_order(
+            contract_id, side, abs(position.size), account_id
+        )
+
+
+class EnforcementExecutor:
+    def __init__(self, orders, state, account_id, logger, audit, metrics, contract_ids):
+        self.orders = orders
+        self.metrics = metrics
+        self.state = state
+        self.account_id = account_id
+        self.logger = logger
+        self.audit = audit
+        self.contract_ids = contract_ids  # symbol root -> active contract ID
+
+    async def flatten(self, identifier, reason, event_time, decision_time):
+        """Flatten ``identifier`` with a market order and cancel its open orders.
+
+        ``event_time`` and ``decision_time`` are ``time.perf_counter()`` values.
+        """
+        contract_id = self.state.resolve(identifier)
+        if contract_id is None:
+            # Nothing cached: fall back to the SDK's REST lookup path
+            return await self._flatten_via_rest(identifier, reason)
+
+        position = self.state.position(contract_id)
+        net = position.get("net", 0) if position else 0
+        if not net or position.get("type") not in DIRECTED_TYPES:
+            # Resolved, but the cached position went away, is flat or has no known
+            # direction: closing it with a guessed side could double it instead
+            return await self._flatten_via_rest(identifier, reason)
+        account_id = position.get("account_id", self.account_id)
+        # The same signed size the account model and rules work from
+        side = OrderSide.SELL if net > 0 else OrderSide.BUY
+        size = abs(net)
+        orders = self.orders
+        working = list(self.state.open_orders(contract_id))
+
+        submit_time = time.perf_counter()
+        submit = asyncio.create_task(
+            orders.place_market_order(contract_id, side, size, account_id)
+        )
+        cancel = asyncio.create_task(
+            self._cancel_open_orders(orders, contract_id, account_id, working)
+        )
+        try:
+            response = await submit
+        finally:
+            ack_time = time.perf_counter()
+            self.metrics.record("submit", submit_time - decision_time)
+            self.metrics.record("ack", ack_time - submit_time)
+            self.metrics.record("enforcement_total", ack_time - event_time)
+            self.logger.info(
+                f"Enforcement latency: decision={(decision_time - event_time) * 1000:.1f}ms "
+                f"submit={(submit_time - decision_time) * 1000:.1f}ms "
+                f"ack={(ack_time - submit_time) * 1000:.1f}ms "
+                f"total={(ack_time - event_time) * 1000:.1f}ms ({contract_id})"
+            )
+            # Wait for the cancels even if the order failed, so their errors are seen;
+            # a failed order is re-raised once they are done
+            (cancelled,) = await asyncio.gather(cancel, return_exceptions=True)
+            if isinstance(cancelled, Exception):
+                self.logger.error(
+                    f"Cancelling open orders on {contract_id} failed: {cancelled}"
+                )
+        self.logger.info(
+            f"Enforced flatten on {contract_id} (account {account_id}): "
+            f"{size} contracts, order {response.orderId}"
+        )
+        self.audit(
+            f"Enforced: Flattened {size} {contract_id} on account {account_id} due to {reason}.",
+            level="WARNING",
+        )
+        return response
+
+    async def _flatten_via_rest(self, identifier, reason):
+        contract_id = self.contract_ids.get(
+            symbol_from_contract(identifier), identifier
+        )
+        self.logger.warning(
+            f"No cached position for {identifier}; using REST close_position"
+        )
+        orders = self.orders
+        working = list(self.state.open_orders(contract_id))
+        response = await orders.close_position(contract_id, account_id=self.account_id)
+        if response is None:
+            self.logger.info(f"No open position to flatten for {contract_id}")
+            return None
+        self.audit(
+            f"Enforced: Flattened {contract_id} on account {self.account_id} due to {reason}.",
+            level="WARNING",
+        )
+        await self._cancel_open_orders(orders, contract_id, self.account_id, working)
+        return response
+
+    async def _cancel_open_orders(self, orders, contract_id, account_id, targets):
+        results = await asyncio.gather(
+            *(orders.cancel_order(order_id, account_id) for order_id in targets),
+            return_exceptions=True,
+        )
+        cancelled = 0
+        for order_id, result in zip(targets, results, strict=True):
+            if isinstance(result, Exception):
+                self.logger.error(f"Cancel failed for order {order_id}: {result}")
+            elif result:
+                cancelled += 1
+        if targets:
+            self.logger.info(
+                f"Cancelled {cancelled}/{len(targets)} open orders on {contract_id}"
+            )
+            self.audit(
+                f"Enforced: Cancelled {cancelled} open orders on {contract_id}.",
+                level="WARNING",
+            )
+        return cancelled
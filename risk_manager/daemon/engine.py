@@ -0,0 +1,373 @@
+"""Rule engine: account-model update, rule evaluation and enforcement decisions.
+
+The live daemon and ``riskd replay`` both drive this class. Replay results
+therefore come from exactly the code that runs in production. Only the
+inputs differ (recorded events instead of SignalR) and the outputs
+(``StubExecutor`` instead of the broker).
+
+Enforcement runs off the event's path: a breach starts a background task and
+evaluation moves on without waiting for the broker's ack, so a slow order on
+one account never holds up events (or released quotes) for the others. The
+coordinator merges repeated breaches while a task is in flight. ``drain()``
+waits for the running tasks; replay calls it after every event to keep the
+outcome deterministic, and the daemon before it shuts down.
+"""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+
+from daemon.conflation import QuoteConflator
+from daemon.coordinator import EnforcementCoordinator, state_fingerprint
+from daemon.dispatch import ADVISORY, event_contract, event_symbol
+from daemon.event_log import EventLog
+from daemon.shadow import ShadowLane
+
+from project_x_py import EventType
+
+
+class RuleEngine:
+    def __init__(
+        self,
+        ruleset,
+        partitions,
+        metrics,
+        logger,
+        audit,
+        default_instrument,
+        breach_history=200,
+        log_events=True,
+        capture=None,
+        advisory_queue=10000,
+        shadow_queue=10000,
+    ):
+        # Replaced whole by reload; read once per event
+        self.ruleset = ruleset
+        self.partitions = partitions
+        self.metrics = metrics
+        self.logger = logger
+        self.audit = audit
+        self.default_instrument = default_instrument
+        self.event_log = EventLog(logger, audit) if log_events else None
+        self.capture = capture  # EventCapture for riskd replay, or None
+        self.snapshot = None  # StateSnapshot for crash recovery, or None
+        self.breaches = deque(maxlen=breach_history)
+        # Merges repeated breaches into one in-flight action per (account, contract, action)
+        self.coordinator = EnforcementCoordinator()
+        # Background _breach tasks; held here so they are not garbage collected
+        self._enforcing = set()
+        # Quotes reach the rules as conflated snapshots, not one by one
+        self.conflator = QuoteConflator()
+        self.now = datetime.now  # replay substitutes the recorded time
+        # Advisory-tier rules run from run_advisory(), after the event; replay runs them inline
+        self.defer_advisory = True
+        self._advisory = asyncio.Queue(maxsize=advisory_queue)
+        self.advisory_dropped = 0
+        # Candidate rules of ruleset.shadow, evaluated after the live ones; never enforced
+        self.shadow = ShadowLane(metrics, logger, audit, shadow_queue)
+
+    async def on_market_event(self, event):
+        received = time.perf_counter()
+        if self.capture is not None:
+            self.capture.record(
+                None, getattr(event.type, "value", event.type), event.data
+            )
+        # Event.timestamp is on the loop clock; re-anchor it on perf_counter
+        delivery = max(0.0, asyncio.get_running_loop().time() - event.timestamp)
+        self.metrics.record("delivery", delivery)
+        await self.on_market(event, received - delivery)
+
+    async def on_market(self, event, event_time):
+        if event.type == EventType.QUOTE_UPDATE and isinstance(event.data, dict):
+            root = event_symbol(event)
+            if root is not None:
+                released = self.conflator.offer(root, event.data, event_time)
+                if released is None:
+                    return  # merged; released by move_ticks or the next tick
+                event, event_time = released
+        await self._fan_out(event, event_time)
+
+    async def flush_quotes(self, now):
+        """Release conflated quotes whose tick is due. ``now`` on the conflation clock.
+
+        Breaches found on a released quote enforce in the background, so a
+        stalled broker never holds back the next release.
+        """
+        for event, event_time in self.conflator.due(now):
+            await self._fan_out(event, event_time)
+
+    async def run_conflation(self):
+        """Release conflated quotes every ``conflate_ms`` until cancelled."""
+        while True:
+            await asyncio.sleep(self.conflator.interval or 0.05)
+            await self.flush_quotes(time.monotonic())
+
+    async def _fan_out(self, event, event_time):
+        # Market data is shared: every supervised account sees each quote. handle()
+        # never waits on the broker, so one account's enforcement cannot delay the next
+        for partition in self.partitions:
+            await self.handle(event, partition, event_time)
+
+    async def on_user_feed(self, partition, feed, data):
+        event_time = time.perf_counter()
+        if self.capture is not None:
+            self.capture.record(partition.account_id, feed, data)
+        for event in partition.translate(feed, data):
+            await self.handle(event, partition, event_time)
+
+    async def handle(self, event, partition, event_time):
+        # One rule set for the whole event, even if a reload lands mid-enforcement
+        rules = self.ruleset
+        state = partition.state
+        # Keep the account model current before any rule runs
+        state.apply(event)
+
+        if self.event_log is not None:
+            # Full, sampled or summarised per event type (event_logging config)
+            self.event_log.record(event, partition)
+
+        # Only the rules subscribed to this event type (and symbol) run, critical tier first
+        bindings = rules.dispatcher.rules_for(event)
+        # Live decisions for this event, compared with the shadow rules' afterwards
+        live = [] if rules.shadow is not None else None
+        if not bindings:
+            self._shadow(event, partition, rules, live, event_time)
+            return
+        deferred = None
+        if self.defer_advisory and bindings[-1].tier == ADVISORY:
+            cut = next(
+                i for i, binding in enumerate(bindings) if binding.tier == ADVISORY
+            )
+            bindings, deferred = bindings[:cut], bindings[cut:]
+        await self._evaluate(
+            bindings, event, partition, rules, event_time, "rule_eval", live
+        )
+        if deferred:
+            # Queued only now, so the worker cannot run ahead of this event's decisions
+            self._defer(deferred, event, partition, rules, event_time, live)
+        else:
+            self._shadow(event, partition, rules, live, event_time)
+
+    def _shadow(self, event, partition, rules, live, event_time):
+        if live is None:
+            return
+        if self.defer_advisory:
+            self.shadow.offer(rules.shadow, event, partition, live, event_time)
+        else:
+            self.shadow.evaluate(rules.shadow, event, partition, live)
+
+    async def _evaluate(
+        self, bindings, event, partition, rules, event_time, stage, live=None
+    ):
+        state = partition.state
+        eval_time = 0.0
+        for binding in bindings:
+            name = binding.name
+            rule_start = time.perf_counter()
+            result = binding.evaluate(event, state)
+            rule_time = time.perf_counter() - rule_start
+            eval_time += rule_time
+            self.metrics.record(f"rule:{name}", rule_time)
+            if result["status"] == "BREACH":
+                decision_time = time.perf_counter()
+                if live is not None:
+                    live.append((name, result["action"], result["reason"]))
+                # Send now, in the background; the remaining rules run while the order is in flight
+                task = asyncio.create_task(
+                    self._breach(
+                        event, partition, rules, name, result, event_time, decision_time
+                    )
+                )
+                self._enforcing.add(task)
+                task.add_done_callback(self._enforcement_done)
+                await asyncio.sleep(0)
+        if bindings:
+            self.metrics.record(stage, eval_time)
+
+    def _enforcement_done(self, task):
+        self._enforcing.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # _enforce reports broker failures itself; this is anything else in _breach
+            self.logger.error(f"Enforcement task failed: {task.exception()!r}")
+
+    async def drain(self, timeout=None):
+        """Wait for background enforcement, including tasks started meanwhile.
+
+        Returns False if ``timeout`` (seconds) passed with tasks still running.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while self._enforcing:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            await asyncio.wait(set(self._enforcing), timeout=remaining)
+        return True
+
+    def enforcing(self):
+        """Number of enforcement tasks still running."""
+        return len(self._enforcing)
+
+    def _defer(self, bindings, event, partition, rules, event_time, live):
+        try:
+            self._advisory.put_nowait(
+                (bindings, event, partition, rules, event_time, live)
+            )
+        except asyncio.QueueFull:
+            self.advisory_dropped += (
+                1  # advisory by definition; never back-pressure the feed
+            )
+
+    async def run_advisory(self):
+        """Evaluate deferred advisory rules, oldest event first, until cancelled."""
+        while True:
+            (
+                bindings,
+                event,
+                partition,
+                rules,
+                event_time,
+                live,
+            ) = await self._advisory.get()
+            self.metrics.record("advisory_lag", time.perf_counter() - event_time)
+            try:
+                await self._evaluate(
+                    bindings, event, partition, rules, event_time, "advisory_eval", live
+                )
+            except Exception as e:
+                self.logger.error(f"Advisory rules failed on {event.type}: {e}")
+            # With every live decision in, including the advisory ones
+            self._shadow(event, partition, rules, live, event_time)
+
+    def advisory_stats(self):
+        return {"queued": self._advisory.qsize(), "dropped": self.advisory_dropped}
+
+    async def _breach(
+        self, event, partition, rules, name, result, event_time, decision_time
+    ):
+        action = result["action"]
+        self.logger.warning(
+            f"BREACH: {result['reason']} (Rule: {name}, account {partition.account_id})"
+        )
+        breach = {
+            "timestamp": self.now().isoformat(),
+            "account": partition.account_id,
+            "rule": name,
+            "reason": result["reason"],
+            "action": action,
+            "contract": event_contract(event),
+            "enforcement": "dry-run" if rules.dry_run else "pending",
+        }
+        self.breaches.append(breach)
+        if rules.dry_run:
+            self.audit(
+                f"BREACH detected on account {partition.label}: {result['reason']}. Action: {action} (dry-run: no enforcement)",
+                level="WARNING",
+            )
+            self._record_breach(partition, breach)
+            return
+
+        instrument = event_contract(event) or self.default_instrument
+        if action == "flatten_all":
+            # Account-level breach (e.g. daily loss): every open contract, concurrently
+            contracts = partition.state.open_contracts()
+            outcomes = await asyncio.gather(
+                *(
+                    self._enforce(
+                        partition,
+                        contract_id,
+                        "flatten",
+                        result,
+                        event_time,
+                        decision_time,
+                    )
+                    for contract_id in contracts
+                )
+            )
+            if not outcomes:
+                breach["enforcement"] = "flat"
+            elif "failed" in outcomes:
+                breach["enforcement"] = "failed"
+            else:
+                breach["enforcement"] = "done" if "done" in outcomes else outcomes[0]
+        else:
+            breach["enforcement"] = await self._enforce(
+                partition, instrument, action, result, event_time, decision_time
+            )
+        self._record_breach(partition, breach)
+
+    def _record_breach(self, partition, breach):
+        # One structured record per breach; archive.py queries these as columns
+        outcome = breach["enforcement"]
+        self.audit(
+            f"Breach outcome on account {partition.label}: {breach['rule']} {breach['action']} -> {outcome}",
+            level="INFO" if outcome in ("coalesced", "suppressed") else "WARNING",
+            fields={
+                "kind": "breach",
+                **{k: v for k, v in breach.items() if k != "timestamp"},
+            },
+        )
+
+    async def _enforce(
+        self, partition, instrument, action, result, event_time, decision_time
+    ):
+        if action != "flatten":
+            # Nothing is sent to the broker: never reported as done, nor settled
+            self.logger.error(
+                f"Unsupported enforcement action {action!r} for {instrument} on account {partition.account_id}"
+            )
+            self.audit(
+                f"BREACH detected on account {partition.label}: {result['reason']}. "
+                f"Action {action!r} is not supported; nothing was sent.",
+                level="ERROR",
+            )
+            return "unsupported"
+
+        state = partition.state
+        contract_id = state.resolve(instrument) or instrument
+        key = (partition.account_id, contract_id, action)
+
+        async def enforce():
+            self.audit(
+                f"BREACH detected on account {partition.label}: {result['reason']}. Action: {action}",
+                level="WARNING",
+            )
+            self.logger.info(
+                f"Attempting to flatten position for {instrument} on account {partition.account_id}"
+            )
+            if self.snapshot is None:
+                return await partition.executor.flatten(
+                    instrument, result["reason"], event_time, decision_time
+                )
+            self.snapshot.enforcement_started(key, result["reason"])
+            try:
+                return await partition.executor.flatten(
+                    instrument, result["reason"], event_time, decision_time
+                )
+            finally:
+                self.snapshot.enforcement_finished(key)
+
+        try:
+            outcome, _ = await self.coordinator.run(
+                key, lambda: state_fingerprint(state, contract_id), enforce
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Enforcement failed for {instrument} on account {partition.account_id}: {e}"
+            )
+            self.audit(
+                f"Enforcement failed for {instrument} on account {partition.label}: {e}",
+                level="ERROR",
+            )
+            return "failed"
+        if outcome != "done":
+            # Already in flight or just completed; nothing is sent to the broker
+            self.logger.info(
+                f"Breach {outcome}: {action} on {contract_id} already handled (account {partition.account_id})"
+            )
+            self.audit(
+                f"BREACH repeated on account {partition.label}: {result['reason']}. "
+                f"{action.capitalize()} of {contract_id} already {'in progress' if outcome == 'coalesced' else 'sent'}; not repeated."
+            )
+        return outcome
@@ -0,0 +1,184 @@
+"""Per-event-type logging policy for the ``Event received`` lines.
+
+Logging every event in full (one ``live.log`` line and one audit record,
+each with the whole payload) costs more than evaluating the rules once
+quotes arrive at market rates. The ``event_logging`` config picks a
+policy per event type:
+
+* ``"full"``    - every event, as before.
+* ``"sample"``  - one event in ``every``.
+* ``"summary"`` - nothing per event; every ``interval_s`` one ``live.log``
+  line per event type and symbol with the count and the min/max of the
+  type's main value (price for quotes and fills, size for positions).
+* ``"off"``     - nothing.
+
+The decision is a dict lookup and a counter; a payload is only formatted
+when a line is actually written. Breaches, enforcement and errors are
+logged by the engine and executor directly and never go through here.
+
+``riskd replay`` of an audit file only sees events logged in full or
+sampled; use ``capture`` for a complete record.
+"""
+
+import logging
+import time
+from datetime import datetime
+
+from daemon.dispatch import event_symbol
+
+FULL = "full"
+SAMPLE = "sample"
+SUMMARY = "summary"
+OFF = "off"
+MODES = (FULL, SAMPLE, SUMMARY, OFF)
+DEFAULT_SAMPLE_EVERY = 100
+DEFAULT_SUMMARY_INTERVAL_S = 10.0
+# Payload field summarised as min/max, by event type
+SUMMARY_FIELDS = {
+    "quote_update": "last",
+    "position_opened": "size",
+    "position_updated": "size",
+    "position_closed": "size",
+    "trade_execution": "price",
+    "order_update": "size",
+}
+
+
+class LogPolicy:
+    __slots__ = ("every", "field", "interval", "mode", "seen", "started", "stats")
+
+    def __init__(
+        self,
+        mode,
+        every=DEFAULT_SAMPLE_EVERY,
+        interval=DEFAULT_SUMMARY_INTERVAL_S,
+        field=None,
+    ):
+        self.mode = mode
+        self.every = every
+        self.interval = interval
+        self.field = field
+        self.seen = 0
+        self.started = None  # monotonic start of the current summary period
+        self.stats = {}  # symbol -> [count, min, max]
+
+
+def parse_policies(settings):
+    """Validate ``event_logging``; return ``{event type label: (mode, every, interval_s)}``.
+
+    ``"default"`` applies to every type not listed. Raises ``ValueError``.
+    """
+    if not isinstance(settings, dict):
+        raise ValueError("event_logging must be an object")
+    policies = {}
+    for label, entry in settings.items():
+        if isinstance(entry, str):
+            entry = {"mode": entry}
+        if not isinstance(entry, dict) or entry.get("mode") not in MODES:
+            raise ValueError(
+                f"event_logging.{label} must be one of {MODES} or an object with a mode"
+            )
+        every = entry.get("every", DEFAULT_SAMPLE_EVERY)
+        interval = entry.get("interval_s", DEFAULT_SUMMARY_INTERVAL_S)
+        if isinstance(every, bool) or not isinstance(every, int) or every < 1:
+            raise ValueError(f"event_logging.{label}.every must be a positive integer")
+        if (
+            isinstance(interval, bool)
+            or not isinstance(interval, int | float)
+            or interval <= 0
+        ):
+            raise ValueError(
+                f"event_logging.{label}.interval_s must be a positive number"
+            )
+        policies[label] = (entry["mode"], every, float(interval))
+    return policies
+
+
+class EventLog:
+    def __init__(self, logger, audit):
+        self.logger = logger
+        self.audit = audit
+        self.clock = time.monotonic
+        self.now = datetime.now
+        self._settings = {}
+        self._policies = {}  # event type (enum or str) -> LogPolicy, filled lazily
+
+    def configure(self, settings):
+        """Apply the ``event_logging`` section; pending summaries are written first."""
+        self.flush(force=True)
+        self._settings = parse_policies(settings)
+        self._policies = {}
+
+    def _policy(self, event_type):
+        label = getattr(event_type, "value", event_type)
+        mode, every, interval = (
+            self._settings.get(label) or self._settings.get("default") or (FULL, 1, 1.0)
+        )
+        policy = self._policies[event_type] = LogPolicy(
+            mode, every, interval, SUMMARY_FIELDS.get(label)
+        )
+        return policy
+
+    def record(self, event, partition):
+        policy = self._policies.get(event.type) or self._policy(event.type)
+        mode = policy.mode
+        if mode == FULL:
+            self._write(event, partition)
+        elif mode == SAMPLE:
+            policy.seen += 1
+            if policy.seen >= policy.every:
+                policy.seen = 0
+                self._write(event, partition, policy.every)
+        elif mode == SUMMARY:
+            self._aggregate(policy, event)
+
+    def _write(self, event, partition, sampled=None):
+        note = f" (1 in {sampled})" if sampled else ""
+        if self.logger.isEnabledFor(logging.INFO):
+            event_data = {
+                "type": str(event.type),
+                "account": partition.account_id,
+                "data": event.data,
+                "timestamp": self.now().isoformat(),
+            }
+            self.logger.info(f"Event received{note}: {event_data}")
+        self.audit(
+            f"Received event: {event.type} on account {partition.label}. Data: {event.data}.{note}"
+        )
+
+    def _aggregate(self, policy, event):
+        now = self.clock()
+        if policy.started is None:
+            policy.started = now
+        symbol = event_symbol(event)
+        entry = policy.stats.get(symbol)
+        if entry is None:
+            entry = policy.stats[symbol] = [0, None, None]
+        entry[0] += 1
+        if policy.field is not None and isinstance(event.data, dict):
+            value = event.data.get(policy.field)
+            if isinstance(value, int | float):
+                if entry[1] is None or value < entry[1]:
+                    entry[1] = value
+                if entry[2] is None or value > entry[2]:
+                    entry[2] = value
+        if now - policy.started >= policy.interval:
+            self._summarise(event.type, policy, now)
+
+    def flush(self, force=False):
+        """Write summaries whose period has ended (all of them with ``force``)."""
+        now = self.clock()
+        for event_type, policy in self._policies.items():
+            if policy.stats and (force or now - policy.started >= policy.interval):
+                self._summarise(event_type, policy, now)
+
+    def _summarise(self, event_type, policy, now):
+        label = getattr(event_type, "value", event_type)
+        elapsed = now - policy.started
+        for symbol, (count, low, high) in policy.stats.items():
+            spread = f", {policy.field} {low:g}..{high:g}" if low is not None else ""
+            self.logger.info(
+                f"Event summary: {label} {symbol or '-'}: {count:,} events in {elapsed:.1f}s{spread}"
+            )
+        policy.stats = {}
+        policy.started = None
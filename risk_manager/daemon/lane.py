@@ -0,0 +1,238 @@
+"""Dedicated HTTP lane for enforcement orders.
+
+Through the SDK, a flatten shares one ``httpx.AsyncClient`` and one
+``RateLimiter`` with every other request the process makes. It can also be
+the call that finds the token about to expire and re-authenticates inline.
+The lane keeps enforcement off that path:
+
+* **Own connection.** A separate HTTP/2 client with a small keep-alive
+  pool. A warm-up request at start-up and a ping every
+  ``ping_interval_s`` keep the TLS connection open, so an order never pays
+  for DNS, TCP or TLS set-up.
+* **Own budget.** A separate ``RateLimiter`` sized by ``rate_limit``.
+  Enforcement never queues behind history downloads or searches. The
+  broker's limit applies to the login as a whole, so keep the SDK's budget
+  plus this one below it.
+* **Token ahead of time.** A background task re-authenticates the shared
+  client ``refresh_before_s`` before the token expires. That is earlier
+  than the SDK's own 5-minute inline refresh, so no request on any path
+  waits for a login. The new token is picked up by the lane and, via
+  ``Supervisor.refresh_tokens``, by the per-account user-hub connections.
+
+Only order placement and cancellation go through the lane. Position
+lookups for the REST fallback still use the SDK. A request the lane could
+not even send (no connection) is sent through the shared client instead;
+one that may have reached the broker is never sent twice.
+"""
+
+import asyncio
+import datetime
+import time
+
+import httpx
+
+from project_x_py.exceptions import ProjectXOrderError
+from project_x_py.models import OrderPlaceResponse
+from project_x_py.types import OrderType
+from project_x_py.utils.async_rate_limiter import RateLimiter
+
+DEFAULT_PING_INTERVAL_S = 20.0
+DEFAULT_REFRESH_BEFORE_S = 900.0
+DEFAULT_RATE_LIMIT = 60  # requests per minute reserved for enforcement
+# Cheapest authenticated call that also proves the token is accepted
+PING_ENDPOINT = "/Account/search"
+
+
+class LaneError(ProjectXOrderError):
+    """The enforcement lane could not get a usable answer from the broker."""
+
+
+class LaneUnavailable(LaneError):
+    """The request never reached the broker: safe to send another way."""
+
+
+class EnforcementLane:
+    def __init__(self, client, logger, metrics, settings=None):
+        settings = settings or {}
+        self.client = client  # shared SDK client: base URL and the login
+        self.logger = logger
+        self.metrics = metrics
+        self.ping_interval = settings.get("ping_interval_s", DEFAULT_PING_INTERVAL_S)
+        self.refresh_before = settings.get("refresh_before_s", DEFAULT_REFRESH_BEFORE_S)
+        self.rate_limiter = RateLimiter(
+            max_requests=settings.get("rate_limit", DEFAULT_RATE_LIMIT),
+            window_seconds=60,
+        )
+        self._http = None
+        self._tasks = []
+        self._refresh_lock = asyncio.Lock()
+        self.requests = 0
+        self.pings = 0
+        self.refreshes = 0
+        self.fallbacks = 0
+        self.last_ping_ms = None
+
+    async def start(self):
+        self._http = httpx.AsyncClient(
+            base_url=self.client.base_url,
+            http2=True,
+            timeout=httpx.Timeout(connect=5.0, read=10.0, write=10.0, pool=1.0),
+            limits=httpx.Limits(
+                max_connections=4, max_keepalive_connections=4, keepalive_expiry=300.0
+            ),
+            headers={"Accept": "application/json", "User-Agent": "riskd-enforcement"},
+        )
+        try:
+            await self.ping()  # open the connection before the first breach needs it
+        except LaneUnavailable as e:
+            # Orders use the shared client until a ping gets through
+            self.logger.warning(f"Enforcement lane unavailable at start-up: {e}")
+        else:
+            self.logger.info(
+                f"Enforcement lane ready ({self.last_ping_ms:.1f}ms round trip)"
+            )
+        self._tasks = [
+            asyncio.create_task(self._keep_warm()),
+            asyncio.create_task(self._keep_token_fresh()),
+        ]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        if self._http is not None:
+            await self._http.aclose()
+
+    # -- broker calls -----------------------------------------------------
+
+    async def place_market_order(self, contract_id, side, size, account_id):
+        response = await self._post(
+            "/Order/place",
+            {
+                "accountId": account_id,
+                "contractId": contract_id,
+                "type": OrderType.MARKET,
+                "side": side,
+                "size": size,
+                "limitPrice": None,
+                "stopPrice": None,
+                "trailPrice": None,
+                "linkedOrderId": None,
+            },
+        )
+        if not response.get("success", False):
+            raise LaneError(response.get("errorMessage") or "Order placement failed")
+        return OrderPlaceResponse(
+            orderId=response.get("orderId", 0),
+            success=True,
+            errorCode=response.get("errorCode", 0),
+            errorMessage=response.get("errorMessage"),
+        )
+
+    async def cancel_order(self, order_id, account_id):
+        response = await self._post(
+            "/Order/cancel", {"accountId": account_id, "orderId": order_id}
+        )
+        if not response.get("success", False):
+            raise LaneError(
+                response.get("errorMessage") or f"Cancel of order {order_id} failed"
+            )
+        return True
+
+    async def ping(self):
+        started = time.perf_counter()
+        await self._post(PING_ENDPOINT, {"onlyActiveAccounts": True}, ping=True)
+        self.last_ping_ms = (time.perf_counter() - started) * 1000
+        self.pings += 1
+
+    async def _post(self, endpoint, payload, ping=False, retried=False):
+        await self.rate_limiter.acquire()
+        if not ping and not retried:
+            self.requests += 1
+        token = self.client.session_token
+        try:
+            response = await self._http.post(
+                endpoint, json=payload, headers={"Authorization": f"Bearer {token}"}
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            raise LaneUnavailable(f"{endpoint}: {e}") from e
+        except httpx.HTTPError as e:
+            # Possibly received by the broker: resending could double the order
+            raise LaneError(f"{endpoint}: {e}") from e
+        if response.status_code == 401 and not retried:
+            # Token rejected early (e.g. revoked): refresh once and retry
+            await self.refresh_token(token)
+            return await self._post(endpoint, payload, ping, retried=True)
+        if response.status_code == 429:
+            raise LaneError(
+                f"{endpoint}: rate limited (Retry-After {response.headers.get('Retry-After', '?')}s)"
+            )
+        if response.status_code >= 400:
+            raise LaneError(
+                f"{endpoint}: HTTP {response.status_code} {response.text[:200]}"
+            )
+        try:
+            body = response.json()
+        except ValueError as e:
+            raise LaneError(f"{endpoint}: invalid JSON response") from e
+        if not isinstance(body, dict):
+            raise LaneError(f"{endpoint}: unexpected response {body!r:.200}")
+        return body
+
+    def fell_back(self, error):
+        """Note a request sent through the shared client because the lane was down."""
+        self.fallbacks += 1
+        self.logger.warning(f"Enforcement lane down, using the shared client: {error}")
+
+    # -- background upkeep ------------------------------------------------
+
+    async def refresh_token(self, rejected=None):
+        """Re-authenticate, unless the ``rejected`` token was already replaced."""
+        token = rejected or self.client.session_token
+        async with self._refresh_lock:
+            if self.client.session_token != token:
+                return  # another caller already refreshed
+            started = time.perf_counter()
+            await self.client.authenticate()
+            self.refreshes += 1
+            self.metrics.record("token_refresh", time.perf_counter() - started)
+            self.logger.info(
+                f"Session token refreshed; expires {self.client.token_expiry}"
+            )
+
+    def seconds_to_expiry(self):
+        expiry = self.client.token_expiry
+        if expiry is None:
+            return 0.0
+        return (expiry - datetime.datetime.now(datetime.UTC)).total_seconds()
+
+    async def _keep_warm(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await self.ping()
+            except Exception as e:
+                self.logger.warning(f"Enforcement lane ping failed: {e}")
+
+    async def _keep_token_fresh(self):
+        while True:
+            wait = self.seconds_to_expiry() - self.refresh_before
+            if wait > 0:
+                await asyncio.sleep(min(wait, 60.0))
+                continue
+            try:
+                await self.refresh_token()
+            except Exception as e:
+                self.logger.error(f"Background token refresh failed: {e}")
+                await asyncio.sleep(30.0)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "pings": self.pings,
+            "last_ping_ms": round(self.last_ping_ms, 1)
+            if self.last_ping_ms is not None
+            else None,
+            "token_refreshes": self.refreshes,
+            "fallbacks": self.fallbacks,
+            "token_expires_in_s": round(self.seconds_to_expiry()),
+        }
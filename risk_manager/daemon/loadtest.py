@@ -0,0 +1,398 @@
+"""``riskd loadtest``: drive the rule engine with a synthetic event storm.
+
+No broker connection is made. Events are generated at fixed rates and
+delivered the way the SDK delivers them, one task per message:
+
+* quotes for every configured symbol (a random walk), through quote
+  conflation, as market events shared by all accounts;
+* fills (``trade_execution``) and position updates (``position_update``),
+  as raw user-hub payloads translated by each account's partition;
+* periodic bursts of fills and position updates, as at a fast open.
+
+The generator is open-loop: each event has a scheduled arrival time, and
+its latency runs from that time to the moment the engine has finished
+with it. A daemon that cannot keep up shows it as a growing backlog and
+rising latency, not as a slower generator. The real ``RuleEngine`` runs
+with the configured rules, conflation, coordinator, advisory and shadow
+workers and event logging (to a discarded logger and audit file).
+Enforcement goes to the replay ``StubExecutor``.
+
+``--ramp N`` repeats the run N times, doubling the quote rate each step,
+and reports the first step that saturated.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import resource
+import time
+
+from daemon.audit_writer import AuditWriter
+from daemon.engine import RuleEngine
+from daemon.metrics import DaemonMetrics, LatencyHistogram
+from daemon.replay import ReplayPartitions
+from daemon.ruleset import build_ruleset
+
+from project_x_py import EventType
+from project_x_py.event_bus import Event
+
+DEFAULT_PROFILE = {
+    "quotes_per_s": 20000,
+    "fills_per_s": 20,
+    "positions_per_s": 10,
+    "burst_every_s": 5.0,
+    "burst_size": 200,
+    "accounts": 1,
+    "duration_s": 30.0,
+    "max_backlog": 200000,
+    "seed": 1,
+}
+TICK_S = 0.001  # generator resolution
+SAMPLE_S = 1.0
+# Keeps up: delivered at least this share of the offered events, with a backlog under 1s
+SATURATION_DELIVERED = 0.95
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Stream:
+    """One event source at a fixed rate; ``due(now)`` yields scheduled times."""
+
+    def __init__(self, rate, start):
+        self.interval = 1.0 / rate if rate > 0 else None
+        self.next = start
+
+    def due(self, now):
+        if self.interval is None:
+            return
+        while self.next <= now:
+            yield self.next
+            self.next += self.interval
+
+
+class EventStorm:
+    def __init__(self, config, profile, point_values=None, tick_sizes=None):
+        self.profile = {**DEFAULT_PROFILE, **profile}
+        self.config = {**config, "dry_run": False}  # enforcement is stubbed
+        self.point_values = point_values or {}
+        self.tick_sizes = tick_sizes or {}
+        self.random = random.Random(self.profile["seed"])
+        self.symbols = self.config.get("symbols") or ["MNQ"]
+        self.prices = dict.fromkeys(self.symbols, 20000.0)
+        self.produced = 0
+        self.completed = 0
+        self.trade_id = 0
+
+    def _engine(self, metrics, orders):
+        ruleset = build_ruleset(self.config, version=1)
+        partitions = ReplayPartitions(self.point_values, orders, time.time)
+        logger = logging.getLogger("riskd.loadtest")
+        logger.propagate = False
+        if not logger.handlers:
+            logger.addHandler(logging.NullHandler())
+        logger.setLevel(logging.INFO)  # lines are formatted, then discarded
+        self.audit = AuditWriter(os.devnull)
+        # Same batching as live; fsync is meaningless on /dev/null
+        self.audit.configure({**self.config.get("audit", {}), "fsync": "never"})
+        engine = RuleEngine(
+            ruleset, partitions, metrics, logger, self.audit.write, self.symbols[0]
+        )
+        engine.coordinator.configure(self.config.get("enforcement", {}))
+        engine.conflator.configure(self.config.get("quotes", {}))
+        engine.event_log.configure(self.config.get("event_logging", {}))
+        for symbol in self.symbols:
+            engine.conflator.set_tick_size(symbol, self.tick_sizes.get(symbol, 0.25))
+        for account_id in range(1, self.profile["accounts"] + 1):
+            partitions.get(account_id)
+        return engine, partitions
+
+    # -- synthetic payloads -----------------------------------------------
+
+    def _quote(self):
+        symbol = self.random.choice(self.symbols)
+        tick = self.tick_sizes.get(symbol, 0.25)
+        price = self.prices[symbol] = self.prices[symbol] + self.random.choice(
+            (-tick, 0.0, tick)
+        )
+        return Event(
+            EventType.QUOTE_UPDATE,
+            {
+                "symbol": f"F.US.{symbol}",
+                "bid": price - tick,
+                "ask": price,
+                "last": price,
+            },
+            source="loadtest",
+        )
+
+    def _account(self):
+        return self.random.randint(1, self.profile["accounts"])
+
+    def _fill(self, account_id):
+        symbol = self.random.choice(self.symbols)
+        self.trade_id += 1
+        return "trade_execution", {
+            "id": self.trade_id,
+            "accountId": account_id,
+            "contractId": f"CON.F.US.{symbol}.Z25",
+            "price": self.prices[symbol],
+            "profitAndLoss": self.random.choice((None, self.random.uniform(-50, 50))),
+            "fees": 0.74,
+            "side": self.random.randint(0, 1),
+            "size": 1,
+            "voided": False,
+        }
+
+    def _position(self, account_id):
+        symbol = self.random.choice(self.symbols)
+        return "position_update", {
+            "id": 1,
+            "accountId": account_id,
+            "contractId": f"CON.F.US.{symbol}.Z25",
+            "type": 1,
+            "size": self.random.randint(0, 6),
+            "averagePrice": self.prices[symbol],
+        }
+
+    # -- delivery ---------------------------------------------------------
+
+    async def _deliver_quote(self, engine, event, scheduled, latency, window):
+        await engine.on_market(event, scheduled)
+        self._done(scheduled, latency, window)
+
+    async def _deliver_user(
+        self, engine, partition, feed, data, scheduled, latency, window
+    ):
+        for event in partition.translate(feed, data):
+            await engine.handle(event, partition, scheduled)
+        self._done(scheduled, latency, window)
+
+    def _done(self, scheduled, latency, window):
+        elapsed = time.perf_counter() - scheduled
+        latency.record(elapsed)
+        window.record(elapsed)
+        self.completed += 1
+
+    async def run(self, quotes_per_s=None):
+        """One run at ``quotes_per_s`` (default: the profile's). Returns a report dict."""
+        profile = self.profile
+        quotes_per_s = profile["quotes_per_s"] if quotes_per_s is None else quotes_per_s
+        self.produced = self.completed = 0
+        metrics = DaemonMetrics()
+        orders = []
+        engine, partitions = self._engine(metrics, orders)
+        latency = metrics.histogram("event_to_decision")
+        window = LatencyHistogram()
+        workers = [
+            asyncio.create_task(engine.run_conflation()),
+            asyncio.create_task(engine.run_advisory()),
+            asyncio.create_task(engine.shadow.run()),
+        ]
+        samples = []
+        start = time.perf_counter()
+        end = start + profile["duration_s"]
+        streams = {
+            "quote": Stream(quotes_per_s, start),
+            "fill": Stream(profile["fills_per_s"], start),
+            "position": Stream(profile["positions_per_s"], start),
+        }
+        next_burst = (
+            start + profile["burst_every_s"]
+            if profile["burst_every_s"] > 0
+            else float("inf")
+        )
+        next_sample = start + SAMPLE_S
+        last_completed = 0
+        saturated = False
+        spawn = asyncio.ensure_future
+        try:
+            while True:
+                now = time.perf_counter()
+                if now >= end:
+                    break
+                for scheduled in streams["quote"].due(now):
+                    spawn(
+                        self._deliver_quote(
+                            engine, self._quote(), scheduled, latency, window
+                        )
+                    )
+                    self.produced += 1
+                for kind in ("fill", "position"):
+                    for scheduled in streams[kind].due(now):
+                        account_id = self._account()
+                        feed, data = (
+                            self._fill(account_id)
+                            if kind == "fill"
+                            else self._position(account_id)
+                        )
+                        spawn(
+                            self._deliver_user(
+                                engine,
+                                partitions.get(account_id),
+                                feed,
+                                data,
+                                scheduled,
+                                latency,
+                                window,
+                            )
+                        )
+                        self.produced += 1
+                if now >= next_burst:
+                    for _ in range(profile["burst_size"]):
+                        account_id = self._account()
+                        feed, data = (
+                            self._fill(account_id)
+                            if self.random.random() < 0.5
+                            else self._position(account_id)
+                        )
+                        spawn(
+                            self._deliver_user(
+                                engine,
+                                partitions.get(account_id),
+                                feed,
+                                data,
+                                next_burst,
+                                latency,
+                                window,
+                            )
+                        )
+                        self.produced += 1
+                    next_burst += profile["burst_every_s"]
+                if now >= next_sample:
+                    samples.append(
+                        {
+                            "t_s": round(now - start, 1),
+                            "handled_per_s": round(
+                                (self.completed - last_completed)
+                                / (now - next_sample + SAMPLE_S)
+                            ),
+                            "backlog": self.produced - self.completed,
+                            "p99_ms": round(window.percentile(99) / 1000, 3),
+                            "rss_mb": round(rss_mb(), 1),
+                            "audit_queue": self.audit.stats()["queue_depth"],
+                            "advisory_queue": engine.advisory_stats()["queued"],
+                        }
+                    )
+                    window.reset()
+                    last_completed = self.completed
+                    next_sample = now + SAMPLE_S
+                if self.produced - self.completed > profile["max_backlog"]:
+                    saturated = True
+                    break
+                await asyncio.sleep(TICK_S)
+            elapsed = time.perf_counter() - start
+            backlog = self.produced - self.completed
+            # Let the backlog drain so the latency tail is counted, within reason
+            drain_until = time.perf_counter() + 5.0
+            while self.completed < self.produced and time.perf_counter() < drain_until:
+                await asyncio.sleep(0.01)
+            await engine.drain(timeout=max(0.0, drain_until - time.perf_counter()))
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.audit.close()
+
+        offered = quotes_per_s + profile["fills_per_s"] + profile["positions_per_s"]
+        if profile["burst_every_s"] > 0:
+            offered += profile["burst_size"] / profile["burst_every_s"]
+        delivered = (self.produced - backlog) / elapsed if elapsed else 0
+        saturated = (
+            saturated or delivered < SATURATION_DELIVERED * offered or backlog > offered
+        )
+        snapshot = metrics.snapshot()["latency"]
+        return {
+            "quotes_per_s": quotes_per_s,
+            "offered_per_s": round(offered),
+            "handled_per_s": round(delivered),
+            "duration_s": round(elapsed, 1),
+            "produced": self.produced,
+            "completed": self.completed,
+            "backlog_at_end": backlog,
+            "saturated": saturated,
+            "latency": snapshot["event_to_decision"],
+            "stages": {
+                name: stats
+                for name, stats in snapshot.items()
+                if name != "event_to_decision"
+            },
+            "quotes": engine.conflator.stats(),
+            "enforcement": engine.coordinator.stats(),
+            "breaches": len(engine.breaches),
+            "orders": len(orders),
+            "peak_rss_mb": round(
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+            ),
+            "samples": samples,
+        }
+
+    async def ramp(self, steps):
+        """Double the quote rate each step; stop after the first saturated step."""
+        reports = []
+        rate = self.profile["quotes_per_s"]
+        for _ in range(steps):
+            report = await self.run(rate)
+            reports.append(report)
+            if report["saturated"]:
+                break
+            rate *= 2
+        return reports
+
+
+def format_load_report(report):
+    latency = report["latency"]
+    lines = [
+        f"Offered {report['offered_per_s']:,} events/s ({report['quotes_per_s']:,} quotes/s) for "
+        f"{report['duration_s']}s: handled {report['handled_per_s']:,}/s, backlog at end "
+        f"{report['backlog_at_end']:,}{'  SATURATED' if report['saturated'] else ''}",
+    ]
+    if latency.get("count"):
+        lines.append(
+            f"Event to decision: p50 {latency['p50_ms']:.3f}ms  p99 {latency['p99_ms']:.3f}ms  "
+            f"p99.9 {latency['p99_9_ms']:.3f}ms  max {latency['max_ms']:.3f}ms"
+        )
+    quotes = report["quotes"]
+    lines.append(
+        f"Quotes: {quotes['received']:,} received, {quotes['released']:,} evaluated; "
+        f"{report['breaches']:,} breaches, {report['orders']:,} stub orders, "
+        f"{report['enforcement']['coalesced']:,} coalesced; peak RSS {report['peak_rss_mb']} MB"
+    )
+    lines.append(
+        f"{'t':>6}{'handled/s':>11}{'backlog':>10}{'p99':>10}{'rss':>9}{'audit q':>9}{'advisory q':>12}"
+    )
+    for sample in report["samples"]:
+        lines.append(
+            f"{sample['t_s']:>5}s{sample['handled_per_s']:>11,}{sample['backlog']:>10,}"
+            f"{sample['p99_ms']:>8.2f}ms{sample['rss_mb']:>7.1f}MB{sample['audit_queue']:>9,}"
+            f"{sample['advisory_queue']:>12,}"
+        )
+    return lines
+
+
+def format_ramp(reports):
+    lines = [
+        f"{'quotes/s':>10}{'offered':>10}{'handled':>10}{'p99':>10}{'backlog':>10}  verdict"
+    ]
+    for report in reports:
+        lines.append(
+            f"{report['quotes_per_s']:>10,}{report['offered_per_s']:>10,}{report['handled_per_s']:>10,}"
+            f"{report['latency'].get('p99_ms', 0):>8.2f}ms{report['backlog_at_end']:>10,}  "
+            f"{'saturated' if report['saturated'] else 'ok'}"
+        )
+    if reports and reports[-1]["saturated"]:
+        if len(reports) > 1:
+            lines.append(
+                f"Saturation point between {reports[-2]['offered_per_s']:,} and "
+                f"{reports[-1]['offered_per_s']:,} events/s."
+            )
+        else:
+            lines.append("Saturated at the first step; lower --quotes-per-s.")
+    else:
+        lines.append("Not saturated; raise --quotes-per-s or --ramp.")
+    return lines
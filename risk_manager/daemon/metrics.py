@@ -0,0 +1,145 @@
+"""Latency histograms for the daemon's hot path.
+
+``LatencyHistogram`` is a fixed-size, HdrHistogram-style log-linear
+histogram over integer microseconds: values below 128us are counted
+exactly, larger values fall into one of 64 linear sub-buckets per power of
+two (under 1.6% relative error). Recording is O(1) and allocation free;
+percentiles are only computed when a snapshot is requested.
+
+Stages recorded by the daemon:
+
+* ``delivery``          - EventBus emit -> ``event_handler`` entry
+* ``rule_eval``         - all rules for one event
+* ``rule:<name>``       - one rule's ``check``
+* ``submit``            - enforcement decision -> order handed to the SDK
+* ``ack``               - order handed to the SDK -> broker response
+* ``enforcement_total`` - event emitted -> broker response
+
+``delivery`` is measured against ``Event.timestamp``, which is taken from the
+event loop clock (1ms resolution under uvloop). Every other stage uses
+``time.perf_counter()``.
+"""
+
+import json
+import os
+import time
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+BUCKET_COUNT = 64 * SUB_BUCKET_HALF  # covers values up to ~2^63us
+
+
+def _index(value):
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return shift * SUB_BUCKET_HALF + (value >> shift)
+
+
+def _upper_bound(index):
+    if index < 2 * SUB_BUCKET_HALF:
+        return index
+    shift = index // SUB_BUCKET_HALF - 1
+    return ((index - shift * SUB_BUCKET_HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    __slots__ = ("count", "counts", "max", "min", "total")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.reset()
+
+    def reset(self):
+        for i in range(BUCKET_COUNT):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def record(self, seconds):
+        """Record one latency given in seconds."""
+        value = int(seconds * 1_000_000)
+        if value < 0:
+            value = 0
+        self.counts[_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentile(self, p):
+        """Value in microseconds at or below which ``p`` percent of samples fall."""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket:
+                seen += bucket
+                if seen >= target:
+                    return min(_upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        """p50/p99/p99.9 in milliseconds, plus count, mean and max."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count / 1000, 3),
+            "min_ms": round(self.min / 1000, 3),
+            "p50_ms": round(self.percentile(50) / 1000, 3),
+            "p99_ms": round(self.percentile(99) / 1000, 3),
+            "p99_9_ms": round(self.percentile(99.9) / 1000, 3),
+            "max_ms": round(self.max / 1000, 3),
+        }
+
+
+class DaemonMetrics:
+    def __init__(self):
+        self.started = time.time()
+        self._histograms = {}
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram()
+        return histogram
+
+    def record(self, name, seconds):
+        self.histogram(name).record(seconds)
+
+    def snapshot(self):
+        return {
+            "generated_at": time.time(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "latency": {
+                name: histogram.summary()
+                for name, histogram in sorted(self._histograms.items())
+            },
+        }
+
+    def dump(self, path):
+        """Atomically write ``snapshot()`` as JSON."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+
+def format_latency(snapshot):
+    """Plain-text table of a snapshot's latency section."""
+    lines = [f"{'stage':<28}{'count':>9}{'p50':>10}{'p99':>10}{'p99.9':>10}{'max':>10}"]
+    for name, stats in snapshot.get("latency", {}).items():
+        if not stats.get("count"):
+            continue
+        lines.append(
+            f"{name:<28}{stats['count']:>9}"
+            f"{stats['p50_ms']:>8.2f}ms{stats['p99_ms']:>8.2f}ms"
+            f"{stats['p99_9_ms']:>8.2f}ms{stats['max_ms']:>8.2f}ms"
+        )
+    return lines
@@ -0,0 +1,142 @@
+"""Session P&L tracking for loss and drawdown rules.
+
+The account model already keeps P&L incrementally: realized P&L and fees
+from each user-hub execution, and unrealized P&L marked on each quote with
+the instrument's point value (tick value / tick size). ``AccountState.net_pnl``
+is their sum. A ``PnlSession`` turns that running total into what loss
+rules compare against:
+
+* ``session_pnl`` - net P&L since the current session began.
+* ``drawdown``    - distance below the session's high-water mark.
+
+Each ``update`` is a few float operations. The session boundary is kept as
+an epoch timestamp, so the timezone maths runs once per session rather
+than once per event. No SDK P&L helpers or REST calls are involved.
+
+P&L before the daemon started is not known: a session that is already
+under way when the daemon starts begins at 0.
+"""
+
+import math
+from datetime import datetime, time as dt_time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DEFAULT_RESET_TIME = "17:00"
+DEFAULT_TIMEZONE = "America/Chicago"
+
+
+def parse_session(parameters, default_reset=DEFAULT_RESET_TIME):
+    """Validate ``reset_time``/``timezone`` parameters; return ``(time | None, ZoneInfo)``.
+
+    ``reset_time`` of ``None`` means the session never resets.
+    """
+    reset = parameters.get("reset_time", default_reset)
+    zone = parameters.get("timezone", DEFAULT_TIMEZONE)
+    try:
+        tz = ZoneInfo(zone)
+    except (ZoneInfoNotFoundError, ValueError, TypeError) as e:
+        raise ValueError(f"unknown timezone {zone!r}") from e
+    if reset is None:
+        return None, tz
+    try:
+        hour, minute = (int(part) for part in str(reset).split(":"))
+        return dt_time(hour, minute), tz
+    except ValueError as e:
+        raise ValueError(f"reset_time must be HH:MM, got {reset!r}") from e
+
+
+class PnlSession:
+    __slots__ = (
+        "_latched",
+        "next_reset",
+        "peak",
+        "reset_time",
+        "start",
+        "tz",
+        "unsaved",
+    )
+
+    def __init__(self, reset_time, tz):
+        self.reset_time = reset_time
+        self.tz = tz
+        self.next_reset = -math.inf  # first update opens the session
+        self.start = 0.0
+        self.peak = 0.0
+        self._latched = False
+        # Changed since the crash-recovery snapshot last saved it (see snapshot.py)
+        self.unsaved = True
+
+    @property
+    def latched(self):
+        """A rule may latch once per session."""
+        return self._latched
+
+    @latched.setter
+    def latched(self, value):
+        if value != self._latched:
+            self._latched = value
+            self.unsaved = True
+
+    def update(self, net_pnl, now):
+        """Feed the account's current net P&L at epoch time ``now``."""
+        if now >= self.next_reset:
+            self.start = net_pnl
+            self.peak = net_pnl
+            self._latched = False
+            self.next_reset = self._next_reset(now)
+            self.unsaved = True
+        elif net_pnl > self.peak:
+            self.peak = net_pnl
+            self.unsaved = True
+        return self
+
+    def dump(self):
+        self.unsaved = False
+        reset = (
+            self.reset_time.strftime("%H:%M") if self.reset_time is not None else None
+        )
+        return [
+            reset,
+            self.tz.key,
+            self.next_reset,
+            self.start,
+            self.peak,
+            self.latched,
+        ]
+
+    @classmethod
+    def load(cls, values):
+        reset, zone, next_reset, start, peak, latched = values
+        session = cls(*parse_session({"reset_time": reset, "timezone": zone}))
+        session.next_reset = next_reset
+        session.start = start
+        session.peak = peak
+        session.latched = latched
+        return session
+
+    def session_pnl(self, net_pnl):
+        return net_pnl - self.start
+
+    def drawdown(self, net_pnl):
+        return self.peak - net_pnl
+
+    def _next_reset(self, now):
+        if self.reset_time is None:
+            return math.inf
+        local = datetime.fromtimestamp(now, self.tz)
+        boundary = datetime.combine(local.date(), self.reset_time, self.tz)
+        if boundary <= local:
+            boundary = datetime.combine(
+                local.date() + timedelta(days=1), self.reset_time, self.tz
+            )
+        return boundary.timestamp()
+
+
+def session_for(state, name, parameters):
+    """The rule's ``PnlSession`` in this account, rebuilt if its schedule changed."""
+    memory = state.rule_state(name)
+    schedule = parameters["session"]
+    session = memory.get("session")
+    if session is None or (session.reset_time, session.tz) != schedule:
+        session = memory["session"] = PnlSession(*schedule)
+    return session
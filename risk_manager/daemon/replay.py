@@ -0,0 +1,334 @@
+"""``riskd replay``: run recorded events through the rule engine offline.
+
+Input is either a raw capture (``capture.enabled``, see capture.py) or an
+existing ``audit.ndjson``:
+
+* Capture records carry the untranslated user-hub payloads plus each
+  account's start-up seed. They go through ``AccountPartition.translate``
+  and ``RuleEngine`` exactly as they did live.
+* Audit records are parsed from their "Received event" lines. Payloads that
+  were logged as object reprs (e.g. ``Order(...)``) cannot be rebuilt and
+  are counted as skipped. INFO records the audit writer dropped under load
+  are missing too, so captures are the better regression input.
+
+Events are replayed back to back, ignoring their original spacing. Quote
+conflation still runs on the recorded timestamps, so rules see the same
+snapshots they would have seen live.
+Enforcement goes to ``StubExecutor``, which records the order the live
+executor would have sent. ``dry_run`` is forced off so every breach
+reaches it. With ``shadow`` enabled, the candidate rules are evaluated
+after each event and the report shows where their decisions differ.
+"""
+
+import ast
+import json
+import re
+import time
+from dataclasses import fields
+from datetime import datetime
+
+from daemon.account_state import AccountState
+from daemon.engine import RuleEngine
+from daemon.metrics import DaemonMetrics
+from daemon.ruleset import build_ruleset
+from daemon.supervisor import AccountPartition
+
+from project_x_py import EventType
+from project_x_py.event_bus import Event
+from project_x_py.models import Order, Position
+from project_x_py.types import PositionType
+
+# Older daemons added the dry-run note in every mode; sampled lines end "(1 in N)"
+AUDIT_EVENT = re.compile(
+    r"^Received event: (?P<type>\S+?)(?: on account (?P<account>.+?))?\. "
+    r"Data: (?P<data>.*?)\."
+    r"(?: In dry-run mode, no action taken\.)?(?: \(1 in \d+\))?$"
+)
+ACCOUNT_LABEL = re.compile(r"\((-?\d+)\)$|^(-?\d+)$")
+UNKNOWN_ACCOUNT = 0
+
+
+class NullLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+    warning = error = debug = info
+
+
+def _null_audit(message, level="INFO", fields=None):
+    pass
+
+
+def _event_type(name):
+    if name.startswith("EventType."):
+        return EventType[name.split(".", 1)[1]]
+    try:
+        return EventType(name)
+    except ValueError:
+        return name  # order_update, trade_execution
+
+
+def _account_id(label):
+    if not label:
+        return UNKNOWN_ACCOUNT
+    match = ACCOUNT_LABEL.search(label.strip())
+    if match is None:
+        return UNKNOWN_ACCOUNT
+    return int(match.group(1) or match.group(2))
+
+
+def _build(cls, data):
+    names = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in names})
+
+
+class RecordedStream:
+    """Iterate ``(ts, account_id, kind, payload)`` from a capture or audit file.
+
+    ``kind`` is ``"raw"`` (user-hub feed name in ``payload[0]``), ``"event"``
+    (an already translated ``Event``) or ``"seed"``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lines = 0
+        self.skipped = 0
+        self.format = None
+
+    def __iter__(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                self.lines += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    self.skipped += 1
+                    continue
+                if "feed" in record:
+                    self.format = self.format or "capture"
+                    item = self._from_capture(record)
+                else:
+                    self.format = self.format or "audit"
+                    item = self._from_audit(record)
+                if item is not None:
+                    yield item
+
+    def _from_capture(self, record):
+        ts, account_id, feed, data = (
+            record["ts"],
+            record["account"],
+            record["feed"],
+            record["data"],
+        )
+        if feed == "seed":
+            return ts, account_id, "seed", data
+        if account_id is not None:
+            return ts, account_id, "raw", (feed, data)
+        return ts, None, "event", Event(_event_type(feed), data, source="Replay")
+
+    def _from_audit(self, record):
+        message = record.get("message", "")
+        if not message.startswith("Received event: "):
+            return None
+        match = AUDIT_EVENT.match(message)
+        if match is None:
+            self.skipped += 1
+            return None
+        try:
+            data = ast.literal_eval(match["data"])
+            event_type = _event_type(match["type"])
+        except (ValueError, SyntaxError, KeyError):
+            self.skipped += 1
+            return None
+        ts = datetime.fromisoformat(record["timestamp"]).timestamp()
+        event = Event(event_type, data, source="Replay")
+        if event_type == EventType.QUOTE_UPDATE:
+            return ts, None, "event", event
+        return ts, _account_id(match["account"]), "event", event
+
+
+class StubExecutor:
+    """Stands in for EnforcementExecutor and records what it would have sent."""
+
+    def __init__(self, state, account_id, orders):
+        self.state = state
+        self.account_id = account_id
+        self.orders = orders
+
+    async def flatten(self, identifier, reason, event_time, decision_time):
+        contract_id = self.state.resolve(identifier)
+        position = self.state.position(contract_id) if contract_id else None
+        order = {
+            "account": self.account_id,
+            "action": "flatten",
+            "contract": contract_id or identifier,
+            "side": None,
+            "size": 0,
+            "cancel_orders": 0,
+            "reason": reason,
+        }
+        if position is not None:
+            order["side"] = (
+                "SELL" if position.get("type") == PositionType.LONG else "BUY"
+            )
+            order["size"] = abs(position["size"])
+            order["cancel_orders"] = self.state.open_order_count(contract_id)
+        self.orders.append(order)
+        return order
+
+
+class ReplayPartitions:
+    """Account partitions created on first sight of each account ID."""
+
+    def __init__(self, point_values, orders, clock):
+        self.point_values = point_values
+        self.orders = orders
+        self.clock = clock
+        self.partitions = {}
+
+    def __iter__(self):
+        return iter(list(self.partitions.values()))
+
+    def __len__(self):
+        return len(self.partitions)
+
+    def get(self, account_id):
+        partition = self.partitions.get(account_id)
+        if partition is None:
+            state = AccountState(account_id)
+            state.clock = self.clock
+            for symbol, value in self.point_values.items():
+                state.set_point_value(symbol, value)
+            executor = StubExecutor(state, account_id, self.orders)
+            partition = AccountPartition(
+                account_id, None, None, None, state, executor, True
+            )
+            self.partitions[account_id] = partition
+        return partition
+
+
+async def replay(path, config, point_values=None, tick_sizes=None):
+    config = {**config, "dry_run": False}  # enforcement is stubbed
+    ruleset = build_ruleset(config, version=1)
+    metrics = DaemonMetrics()
+    orders = []
+    clock = [0.0]
+    partitions = ReplayPartitions(point_values or {}, orders, lambda: clock[0])
+    symbols = config.get("symbols") or ["MNQ"]
+    engine = RuleEngine(
+        ruleset,
+        partitions,
+        metrics,
+        NullLogger(),
+        _null_audit,
+        symbols[0],
+        breach_history=None,
+        log_events=False,
+    )
+    engine.defer_advisory = (
+        False  # decisions in recorded order, advisory rules included
+    )
+    engine.coordinator.configure(config.get("enforcement", {}))
+    engine.conflator.configure(config.get("quotes", {}))
+    for root, tick_size in (tick_sizes or {}).items():
+        engine.conflator.set_tick_size(root, tick_size)
+    engine.now = lambda: datetime.fromtimestamp(clock[0])
+    engine.coordinator.clock = lambda: clock[0]  # settle timeouts in recorded time
+
+    stream = RecordedStream(path)
+    events = 0
+    started = time.perf_counter()
+    for ts, account_id, kind, payload in stream:
+        clock[0] = ts
+        if kind == "seed":
+            partitions.get(account_id).state.seed(
+                [_build(Position, p) for p in payload.get("positions", [])],
+                [_build(Order, o) for o in payload.get("orders", [])],
+            )
+            continue
+        events += 1
+        # Conflated quotes whose tick passed in recorded time go first
+        await engine.flush_quotes(ts)
+        event_time = time.perf_counter()
+        if kind == "raw":
+            feed, data = payload
+            await engine.on_user_feed(partitions.get(account_id), feed, data)
+        elif account_id is None:
+            await engine.on_market(payload, event_time)
+        else:
+            await engine.handle(payload, partitions.get(account_id), event_time)
+        # Enforcement runs in the background live; settle it before the next event
+        await engine.drain()
+    await engine.flush_quotes(float("inf"))
+    await engine.drain()
+    elapsed = time.perf_counter() - started
+
+    latency = metrics.snapshot()["latency"]
+    return {
+        "file": str(path),
+        "format": stream.format,
+        "events": events,
+        "skipped": stream.skipped,
+        "accounts": len(partitions),
+        "elapsed_s": round(elapsed, 3),
+        "events_per_s": round(events / elapsed) if elapsed else 0,
+        "rules": {
+            name.split(":", 1)[1]: stats
+            for name, stats in latency.items()
+            if name.startswith("rule:")
+        },
+        "breaches": list(engine.breaches),
+        "enforcement": engine.coordinator.stats(),
+        "quotes": engine.conflator.stats(),
+        "orders": orders,
+        "shadow": engine.shadow.stats() if ruleset.shadow is not None else None,
+    }
+
+
+def format_report(report, limit=20):
+    lines = [
+        f"Replayed {report['events']:,} events ({report['format']}, "
+        f"{report['accounts']} accounts) in {report['elapsed_s']:.2f}s: "
+        f"{report['events_per_s']:,} events/s",
+    ]
+    quotes = report["quotes"]
+    if quotes["received"]:
+        lines.append(
+            f"Quotes: {quotes['received']:,} received, {quotes['released']:,} evaluated after conflation"
+        )
+    if report["skipped"]:
+        lines.append(f"Skipped {report['skipped']:,} unreadable records")
+    lines.append(f"{'rule':<28}{'calls':>10}{'mean':>10}{'p99':>10}{'breaches':>10}")
+    breach_counts = {}
+    for breach in report["breaches"]:
+        breach_counts[breach["rule"]] = breach_counts.get(breach["rule"], 0) + 1
+    for name, stats in report["rules"].items():
+        lines.append(
+            f"{name:<28}{stats['count']:>10,}"
+            f"{stats['mean_ms'] * 1000:>8.1f}us{stats['p99_ms'] * 1000:>8.1f}us"
+            f"{breach_counts.get(name, 0):>10,}"
+        )
+    lines.append(
+        f"Decisions: {len(report['breaches'])} breaches, {len(report['orders'])} enforcement orders"
+    )
+    enforcement = report["enforcement"]
+    lines.append(
+        f"Coordinator: {enforcement['coalesced']} coalesced, {enforcement['suppressed']} suppressed, "
+        f"{enforcement['failed']} failed"
+    )
+    shadow = report["shadow"]
+    if shadow:
+        lines.append(
+            f"Shadow rules: {shadow['both']} decisions agree, {shadow['shadow_only']} candidate only, "
+            f"{shadow['live_only']} live only, {shadow['action_differs']} different action"
+        )
+        for name, counts in shadow["rules"].items():
+            lines.append(
+                f"  {name}: live {counts['live']:,}, candidate {counts['shadow']:,}"
+            )
+    for breach in report["breaches"][-limit:]:
+        lines.append(
+            f"  {breach['timestamp']}  {breach['account']}  {breach['rule']}  "
+            f"{breach['contract']}  {breach['action']} ({breach['enforcement']}): {breach['reason']}"
+        )
+    return lines
@@ -1,19 +1,29 @@
+import argparse
 import asyncio
 import json
+import logging
 import os
 import sys
-import logging
+import time
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
-import argparse
-from pathlib import Path
-import importlib
-import sys
 from pathlib import Path
-import time
 
+from project_x_py import EventType, TradingSuite
+
+# Add risk_manager root to path for rules.* and daemon.* imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from project_x_py import TradingSuite, EventType
+from daemon import control, loadtest, replay
+from daemon.archive import AuditArchive, parse_when, query_breaches
+from daemon.audit_writer import AuditWriter
+from daemon.capture import EventCapture
+from daemon.engine import RuleEngine
+from daemon.lane import EnforcementLane
+from daemon.metrics import DaemonMetrics, format_latency
+from daemon.ruleset import build_ruleset, config_diff
+from daemon.snapshot import StateSnapshot, restore_account
+from daemon.supervisor import USER_EVENT_TYPES, Supervisor
 
 # Ensure directories exist
 Path("logs").mkdir(exist_ok=True)
@@ -26,6 +36,44 @@ if not config_path.exists():
         "dry_run": True,
         "log_level": "INFO",
         "symbols": ["MNQ"],
+        "accounts": [],
+        "audit": {
+            "flush_interval_ms": 200,
+            "max_queue": 10000,
+            "fsync": "interval",
+            "fsync_interval_s": 1.0,
+            "rotate_mb": 64,
+            "rotate_daily": True,
+            "archive_dir": "logs/archive"
+        },
+        "quotes": {
+            "conflate_ms": 50,
+            "move_ticks": 4
+        },
+        "event_logging": {
+            "default": "full",
+            "quote_update": {"mode": "summary", "interval_s": 10}
+        },
+        "enforcement": {
+            "settle_timeout_s": 5.0,
+            "retry_after_s": 1.0,
+            "lane": {
+                "enabled": True,
+                "ping_interval_s": 20,
+                "refresh_before_s": 900,
+                "rate_limit": 60
+            }
+        },
+        "capture": {
+            "enabled": False,
+            "path": "logs/events.ndjson"
+        },
+        "snapshot": {
+            "enabled": True,
+            "path": "logs/state.snap",
+            "interval_ms": 250,
+            "max_age_s": 3600
+        },
         "rules": {
             "max_contracts": {
                 "enabled": True,
@@ -53,19 +101,55 @@ live_logger.addHandler(live_handler)
 live_logger.setLevel(logging.INFO)
 
 audit_file = log_dir / "audit.ndjson"
+audit_writer = AuditWriter(audit_file)
+metrics_file = log_dir / "metrics.json"
+metrics = DaemonMetrics()
+socket_path = log_dir / "riskd.sock"
 
 # Global state
 suite = None
 running = False
-loaded_rules = {}
+# Rule engine; its RuleSet (config + rules + dispatch table) is replaced whole on reload
+engine = None
+reload_lock = asyncio.Lock()
+subscribed = set()
+supervisor = None
+control_server = None
+capture = None  # EventCapture when capture.enabled
+lane = None  # EnforcementLane when enforcement.lane.enabled
+snapshot = None  # StateSnapshot when snapshot.enabled
+
+# Market events the daemon always listens to, on top of those declared by rules.
+# Position and order events come from each account's own user-hub connection.
+BASE_EVENT_TYPES = (EventType.QUOTE_UPDATE,)
+# On shutdown, how long to wait for in-flight enforcement before closing connections
+ENFORCEMENT_DRAIN_S = 5.0
+
+def log_to_audit(message, level="INFO", fields=None):
+    # Queued for the background writer; never touches the disk here
+    audit_writer.write(message, level, fields)
 
-def log_to_audit(message):
-    with open(audit_file, "a") as f:
-        f.write(json.dumps({
-            "timestamp": datetime.now().isoformat(),
-            "level": "INFO",
-            "message": message
-        }) + "\n")
+def report_audit_stats(last):
+    stats = audit_writer.stats()
+    if last is None:
+        last = {"dropped": 0, "dropped_critical": 0, "write_errors": 0}
+    if stats["dropped"] > last["dropped"]:
+        live_logger.warning(
+            f"Audit writer dropped {stats['dropped'] - last['dropped']} records "
+            f"(queue depth {stats['queue_depth']}/{stats['max_queue']})"
+        )
+    if stats["dropped_critical"] > last["dropped_critical"]:
+        live_logger.error(
+            f"Audit writer dropped {stats['dropped_critical'] - last['dropped_critical']} "
+            f"WARNING/ERROR records: queue at its hard limit"
+        )
+    if stats["write_errors"] > last["write_errors"]:
+        live_logger.error(
+            f"Audit writer failed to write {stats['write_errors'] - last['write_errors']} "
+            f"time(s), retrying: {stats['last_error']} "
+            f"(queue depth {stats['queue_depth']}/{stats['max_queue']})"
+        )
+    return stats
 
 def prompt_passcode():
     return input("Enter admin passcode: ")
@@ -74,91 +158,222 @@ def load_config():
     with open(config_path, "r") as f:
         return json.load(f)
 
-def load_rules_from_config(config):
-       rules = {}
-       # Add risk_manager root to path for imports
-       sys.path.insert(0, str(Path(__file__).parent.parent))
-       for rule_name in config['rules']:
-           if config['rules'][rule_name]['enabled']:
-               try:
-                   module = importlib.import_module(f'rules.{rule_name}')  # Relative import from risk_manager
-                   rules[rule_name] = module
-                   live_logger.info(f"Successfully loaded rule module: {rule_name}")
-               except ImportError as e:
-                   live_logger.error(f"Failed to load rule module: rules.{rule_name} - {e}")
-                   log_to_audit(f"Failed to load rule module: {rule_name} - {e}", level="ERROR")
-               except Exception as e:
-                   live_logger.error(f"Error in rule module {rule_name}: {e}")
-                   log_to_audit(f"Error in rule module {rule_name}: {e}", level="ERROR")
-       return rules
-
-async def event_handler(event):
-    global loaded_rules, current_config
-    
-    # Log event
-    event_data = {
-        "type": str(event.type),
-        "data": event.data,
-        "timestamp": datetime.now().isoformat()
+def config_signature():
+    stat = config_path.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+def log_ruleset(rules):
+    for name in rules.rules:
+        live_logger.info(f"Successfully loaded rule module: {name}")
+    for error in rules.errors:
+        live_logger.error(f"Failed to load rule module: {error}")
+        log_to_audit(f"Failed to load rule module: {error}", level="ERROR")
+    for line in rules.dispatcher.describe():
+        live_logger.info(f"Dispatch (v{rules.version}): {line}")
+    if rules.shadow is not None:
+        for error in rules.shadow.errors:
+            live_logger.error(f"Failed to load shadow rule module: {error}")
+        for line in rules.shadow.dispatcher.describe():
+            live_logger.info(f"Shadow dispatch (v{rules.version}): {line}")
+
+async def subscribe_event_types(event_types):
+    for event_type in event_types:
+        if (
+            isinstance(event_type, EventType)
+            and event_type not in USER_EVENT_TYPES
+            and event_type not in subscribed
+        ):
+            await suite.on(event_type, engine.on_market_event)
+            subscribed.add(event_type)
+
+async def reload_config(source):
+    """Validate and build the new rule set off the hot path, then swap it in."""
+    async with reload_lock:
+        current = engine.ruleset
+        try:
+            config = await asyncio.to_thread(load_config)
+            candidate = await asyncio.to_thread(build_ruleset, config, current.version + 1)
+        except (OSError, ValueError) as e:  # includes ConfigError and bad JSON
+            live_logger.error(f"Config reload ({source}) rejected: {e}")
+            log_to_audit(
+                f"Config change rejected: {e}. Still enforcing config version {current.version}.",
+                level="ERROR",
+            )
+            return {"applied": False, "version": current.version, "error": str(e)}
+        changes = config_diff(current.config, candidate.config)
+        if not changes:
+            return {"applied": False, "version": current.version, "changes": []}
+        # Listen for any newly declared event types before rules expect them
+        await subscribe_event_types(candidate.event_types)
+        audit_writer.configure(candidate.config.get("audit", {}))
+        engine.coordinator.configure(candidate.config.get("enforcement", {}))
+        engine.conflator.configure(candidate.config.get("quotes", {}))
+        engine.event_log.configure(candidate.config.get("event_logging", {}))
+        engine.ruleset = candidate  # atomic: the next event sees only the new set
+    log_ruleset(candidate)
+    live_logger.info(f"Config reloaded ({source}): version {candidate.version}: {'; '.join(changes)}")
+    log_to_audit(
+        f"Config updated to version {candidate.version}: {'; '.join(changes)}.",
+        level="WARNING",
+    )
+    missing = [s for s in candidate.config.get("symbols", []) if s not in suite]
+    if missing:
+        live_logger.warning(f"Symbols {missing} are not connected; they take effect after a restart")
+    if candidate.config.get("accounts", []) != current.config.get("accounts", []):
+        live_logger.warning("Account list changes take effect after a restart")
+    return {"applied": True, "version": candidate.version, "changes": changes}
+
+def control_status(request):
+    return {
+        "pid": os.getpid(),
+        "uptime_s": round(time.time() - metrics.started, 1),
+        "config_version": engine.ruleset.version,
+        "config_loaded_at": engine.ruleset.loaded_at,
+        "dry_run": engine.ruleset.dry_run,
+        "symbols": engine.ruleset.config.get("symbols", []),
+        "rules": list(engine.ruleset.rules),
+        "dispatch": engine.ruleset.dispatcher.describe(),
+        "accounts": {p.label: p.state.snapshot() for p in supervisor},
+        "audit": audit_writer.stats(),
+        "breaches": len(engine.breaches),
+        "enforcement": engine.coordinator.stats(),
+        "quotes": engine.conflator.stats(),
+        "advisory": engine.advisory_stats(),
+        "shadow": engine.shadow.stats() if engine.ruleset.shadow else None,
+        "lane": lane.stats() if lane else None,
+        "snapshot": snapshot.stats() if snapshot else None,
     }
-    live_logger.info(f"Event received: {event_data}")
-    log_to_audit(f"Received event: {event.type}. Data: {event.data}. In dry-run mode, no action taken.")
-    
-    # Single rule evaluation loop
-    for name, module in loaded_rules.items():
-        rule_config = current_config['rules'][name]
-        result = module.check(event, rule_config)
-        if result['status'] == 'BREACH':
-            live_logger.warning(f'BREACH: {result["reason"]} (Rule: {name})')
-            log_message = f'BREACH detected: {result["reason"]}. Action: {result["action"]}'
-            if current_config['dry_run']:
-                log_message += ' (dry-run: no enforcement)'
-            log_to_audit(log_message, level="WARNING")
-
-            if not current_config['dry_run']:
-                enforce_start_time = time.perf_counter()
-                try:
-                    if result['action'] == 'flatten':
-                        instrument_symbol = event.data.get('instrument', 'MNQ')
-                        live_logger.info(f'Attempting to flatten position for {instrument_symbol}')
-                        await suite.positions.close_position(instrument_symbol)
-                        live_logger.info(f'Enforced flatten on {instrument_symbol}')
-                        log_to_audit(f'Enforced: Flattened {instrument_symbol} due to {result["reason"]}.')
-                except Exception as e:
-                    live_logger.error(f"Enforcement failed for {instrument_symbol}: {e}")
-                    log_to_audit(f"Enforcement failed for {instrument_symbol}: {e}", level="ERROR")
-                finally:
-                    enforce_end_time = time.perf_counter()
-                    live_logger.info(f"Enforcement latency: {(enforce_end_time - enforce_start_time)*1000:.0f}ms")
+
+def control_breaches(request):
+    limit = request.get("limit") or len(engine.breaches)
+    return list(engine.breaches)[-limit:]
+
+CONTROL_COMMANDS = {
+    "status": control_status,
+    "metrics": lambda request: metrics.snapshot(),
+    "breaches": control_breaches,
+    "reload": lambda request: reload_config("riskd reload"),
+}
 
 async def start_daemon(args):
-    global suite, running, loaded_rules, current_config
-    if running:
+    global suite, running, engine, supervisor, control_server, capture, lane, snapshot
+    if running or await control.is_listening(socket_path):
         print("Daemon already running.")
         return
     passcode = prompt_passcode()
     if passcode != "admin123":  # Placeholder passcode in .env or hardcode for now
         print("Invalid passcode.")
         return
-    current_config = load_config()
-    loaded_rules = load_rules_from_config(current_config)
-    if current_config["dry_run"]:
+    try:
+        config_seen = config_signature()
+        ruleset = build_ruleset(load_config(), version=1, strict=False)
+    except (OSError, ValueError) as e:
+        print(f"Invalid configuration: {e}")
+        return
+    audit_config = ruleset.config.get("audit", {})
+    audit_writer.configure(audit_config)
+    # Rotated segments are compacted to Parquet for riskd breaches
+    archive = AuditArchive(audit_config.get("archive_dir", str(log_dir / "archive")), live_logger)
+    audit_writer.set_rotation(
+        int(audit_config.get("rotate_mb", 64) * 1024 * 1024),
+        audit_config.get("rotate_daily", True),
+        archive.on_rotate,
+    )
+    archive.compact_pending(audit_file)
+    log_ruleset(ruleset)
+    if ruleset.dry_run:
         print("Starting in dry-run mode.")
-    suite = await TradingSuite.create(["MNQ"], features=[])
-    account_id = int(os.getenv('PROJECT_X_ACCOUNT_ID', 12089421))
-    suite.realtime.account_id = account_id
-    await suite.realtime.subscribe_user_updates()
-    await suite.on(EventType.ORDER_FILLED, event_handler)
-    await suite.on(EventType.POSITION_UPDATED, event_handler)
-    await suite.on(EventType.QUOTE_UPDATE, event_handler)
-    await suite["MNQ"].data.start_realtime_feed()
+    capture_config = ruleset.config.get("capture", {})
+    if capture_config.get("enabled"):
+        capture = EventCapture(capture_config.get("path", str(log_dir / "events.ndjson")))
+        capture.configure(ruleset.config.get("audit", {}))
+        print(f"Capturing raw events to {capture.path} for riskd replay.")
+    snapshot_config = ruleset.config.get("snapshot", {})
+    saved = None
+    if snapshot_config.get("enabled", True):
+        snapshot = StateSnapshot(
+            snapshot_config.get("path", str(log_dir / "state.snap")),
+            snapshot_config.get("interval_ms", 250),
+            snapshot_config.get("max_age_s", 3600),
+        )
+        saved = snapshot.load()
+        snapshot.open()
+    # One suite: one authenticated client and one market-data connection for all symbols
+    suite = await TradingSuite.create(ruleset.config.get("symbols") or ["MNQ"], features=[])
+    lane_config = ruleset.config.get("enforcement", {}).get("lane", {})
+    if lane_config.get("enabled", True):
+        # Warm connection and fresh token before any account can breach
+        lane = EnforcementLane(suite.client, live_logger, metrics, lane_config)
+        await lane.start()
+    supervisor = Supervisor(suite, live_logger, log_to_audit, metrics, capture, lane)
+    engine = RuleEngine(
+        ruleset, supervisor, metrics, live_logger, log_to_audit, next(iter(suite)), capture=capture
+    )
+    engine.snapshot = snapshot
+    engine.coordinator.configure(ruleset.config.get("enforcement", {}))
+    engine.conflator.configure(ruleset.config.get("quotes", {}))
+    engine.event_log.configure(ruleset.config.get("event_logging", {}))
+    for symbol, context in suite.items():
+        engine.conflator.set_tick_size(symbol, context.instrument_info.tickSize)
+    wanted = ruleset.config.get("accounts") or []
+    if not wanted and os.getenv("PROJECT_X_ACCOUNT_ID"):
+        wanted = [int(os.getenv("PROJECT_X_ACCOUNT_ID"))]
+    for account_id, name in await supervisor.resolve_accounts(wanted):
+        partition = await supervisor.add_account(account_id, name, engine.on_user_feed)
+        if saved is not None:
+            # After the REST seed: positions come from the broker, the rest from the snapshot
+            restore_account(partition, saved, live_logger, log_to_audit)
+    if saved is not None:
+        engine.breaches.extend(saved["breaches"])
+        print(f"Resumed from state snapshot ({time.time() - saved['saved_at']:.1f}s old).")
+    if snapshot is not None:
+        snapshot.save(supervisor, engine.breaches)
+        snapshots = asyncio.create_task(snapshot.run(supervisor, engine.breaches))
+    await subscribe_event_types(dict.fromkeys([*BASE_EVENT_TYPES, *engine.ruleset.event_types]))
+    conflation = asyncio.create_task(engine.run_conflation())
+    advisory = asyncio.create_task(engine.run_advisory())
+    shadow = asyncio.create_task(engine.shadow.run())
+    for context in suite.values():
+        await context.data.start_realtime_feed()
+    print(f"Supervising {len(supervisor)} account(s) on {list(suite)}.")
+    control_server = control.ControlServer(socket_path, CONTROL_COMMANDS, audit_writer, live_logger)
+    await control_server.start()
     running = True
     print("Daemon started. Press Ctrl+C to stop.")
+    audit_seen = None
+    last_dump = time.monotonic()
     try:
         while running:
             await asyncio.sleep(1)
+            audit_seen = report_audit_stats(audit_seen)
+            engine.event_log.flush()
+            await supervisor.refresh_tokens()
+            if engine.ruleset.config.get("watch_config", True):
+                try:
+                    signature = config_signature()
+                except OSError:
+                    signature = config_seen
+                if signature != config_seen:
+                    config_seen = signature
+                    await reload_config("file change")
+            if time.monotonic() - last_dump >= engine.ruleset.config.get("metrics_dump_interval_s", 10):
+                metrics.dump(metrics_file)
+                last_dump = time.monotonic()
     except KeyboardInterrupt:
         await stop_daemon(None)
+    finally:
+        conflation.cancel()
+        advisory.cancel()
+        shadow.cancel()
+        engine.event_log.flush(force=True)
+        if snapshot is not None:
+            snapshots.cancel()
+            snapshot.close(supervisor, engine.breaches)
+        await control_server.close()
+        metrics.dump(metrics_file)
+        audit_writer.close()
+        if capture:
+            capture.close()
 
 async def stop_daemon(args):
     global running
@@ -167,36 +382,244 @@ async def stop_daemon(args):
         print("Invalid passcode.")
         return
     running = False
-    await suite.realtime.unsubscribe_user_updates()
+    if engine and not await engine.drain(timeout=ENFORCEMENT_DRAIN_S):
+        print(f"Stopping with {engine.enforcing()} enforcement action(s) still unacknowledged.")
+    if supervisor:
+        await supervisor.close()
+    if lane:
+        await lane.close()
     if suite:
+        await suite.realtime.unsubscribe_user_updates()
         await suite.disconnect()
+    audit_writer.close()
+    if capture:
+        capture.close()
     print("Daemon stopped.")
 
 async def status_daemon(args):
-    global loaded_rules, current_config
     try:
-        current_config = load_config()
-    except Exception:
-        print("Failed to load configuration.")
+        status = await control.request(socket_path, "status")
+    except ConnectionError:
+        status = None
+    if status is not None:
+        print(f"Daemon is running (pid {status['pid']}, up {status['uptime_s']:.0f}s).")
+        loaded = datetime.fromtimestamp(status["config_loaded_at"]).isoformat(timespec="seconds")
+        print(f"Config version {status['config_version']} (loaded {loaded})")
+        print(f"dry_run={status['dry_run']}, symbols={status['symbols']}")
+        print(f"Rules loaded: {status['rules']}")
+        for line in status["dispatch"]:
+            print(f"  {line}")
+        for label, snapshot in status["accounts"].items():
+            print(f"Account {label}: {snapshot}")
+        audit = status["audit"]
+        print(
+            f"Audit writer: {audit['written']} written, {audit['dropped']} dropped, "
+            f"queue {audit['queue_depth']}/{audit['max_queue']}"
+        )
+        print(f"Breaches since start: {status['breaches']}")
+        enforcement = status["enforcement"]
+        print(
+            f"Enforcement: {enforcement['started']} started, {enforcement['in_flight']} in flight, "
+            f"{enforcement['coalesced']} coalesced, {enforcement['suppressed']} suppressed, "
+            f"{enforcement['failed']} failed"
+        )
+        advisory = status["advisory"]
+        print(f"Advisory rules: {advisory['queued']} events queued, {advisory['dropped']} dropped")
+        if status["shadow"]:
+            shadow = status["shadow"]
+            print(
+                f"Shadow rules: {shadow['events']} events, {shadow['both']} decisions agree, "
+                f"{shadow['shadow_only']} candidate only, {shadow['live_only']} live only, "
+                f"{shadow['action_differs']} different action ({shadow['queued']} queued, {shadow['dropped']} dropped)"
+            )
+            for name, counts in shadow["rules"].items():
+                print(
+                    f"  {name}: live {counts['live']}, candidate {counts['shadow']} "
+                    f"(+{counts['shadow_only']} / -{counts['live_only']} / ~{counts['action_differs']})"
+                )
+        if status["lane"]:
+            lane_stats = status["lane"]
+            print(
+                f"Enforcement lane: {lane_stats['requests']} orders ({lane_stats['fallbacks']} via the SDK), "
+                f"ping {lane_stats['last_ping_ms']}ms, "
+                f"token expires in {lane_stats['token_expires_in_s']}s ({lane_stats['token_refreshes']} refreshes)"
+            )
+        quotes = status["quotes"]
+        print(
+            f"Quotes: {quotes['received']} received, {quotes['released']} evaluated "
+            f"(conflate_ms={quotes['conflate_ms']:g}, move_ticks={quotes['move_ticks']})"
+        )
+        if status["snapshot"]:
+            state_snapshot = status["snapshot"]
+            print(
+                f"State snapshot: generation {state_snapshot['generation']}, "
+                f"{state_snapshot['bytes']} bytes, {state_snapshot['in_flight']} journaled in flight"
+            )
+        latency = await control.request(socket_path, "metrics")
+        print("Latency:")
+        for line in format_latency(latency):
+            print(f"  {line}")
         return
-    loaded_rules = load_rules_from_config(current_config)
-    print(f"Config loaded: dry_run={current_config['dry_run']}, symbols={current_config.get('symbols', [])}")
-    print(f"Rules enabled in config: {list(current_config['rules'].keys())}")
-    print(f"Rules successfully loaded: {list(loaded_rules.keys())}")
-    if running:
-        print("Daemon is running.")
-    else:
+
+    # No daemon listening: report what a start would load
+    print("Daemon is not running.")
+    try:
+        rules = build_ruleset(load_config(), version=1, strict=False)
+    except (OSError, ValueError) as e:
+        print(f"Failed to load configuration: {e}")
+        return
+    print(f"Config loaded: dry_run={rules.dry_run}, symbols={rules.config.get('symbols', [])}")
+    print(f"Rules enabled in config: {list(rules.config['rules'].keys())}")
+    print(f"Rules successfully loaded: {list(rules.rules)}")
+    for error in rules.errors:
+        print(f"  Failed to load: {error}")
+    for line in rules.dispatcher.describe():
+        print(f"  {line}")
+
+async def reload_daemon(args):
+    passcode = prompt_passcode()
+    if passcode != "admin123":
+        print("Invalid passcode.")
+        return
+    try:
+        result = await control.request(socket_path, "reload")
+    except ConnectionError:
         print("Daemon is not running.")
+        return
+    if result.get("error"):
+        print(f"Reload rejected: {result['error']}")
+        print(f"Still running config version {result['version']}.")
+    elif result["applied"]:
+        print(f"Config version {result['version']} active:")
+        for change in result["changes"]:
+            print(f"  {change}")
+    else:
+        print(f"No changes; config version {result['version']} still active.")
+
+def read_metrics():
+    try:
+        with open(metrics_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+async def metrics_daemon(args):
+    try:
+        snapshot = await control.request(socket_path, "metrics")
+    except ConnectionError:
+        # Last snapshot the daemon dumped before it stopped
+        snapshot = read_metrics()
+        if snapshot is None:
+            print("No metrics available. Is the daemon running?")
+            return
+    print(json.dumps(snapshot, indent=2))
+
+async def breaches_daemon(args):
+    history = any(value is not None for value in (args.account, args.rule, args.since, args.until))
+    if not history:
+        try:
+            breaches = await control.request(socket_path, "breaches", limit=args.limit)
+        except ConnectionError:
+            print("Daemon is not running; searching the audit history.")
+            history = True
+    if history:
+        try:
+            archive_dir = load_config().get("audit", {}).get("archive_dir", str(log_dir / "archive"))
+        except (OSError, ValueError):
+            archive_dir = str(log_dir / "archive")
+        try:
+            since, until = parse_when(args.since), parse_when(args.until, end=True)
+        except ValueError as e:
+            print(f"Invalid date: {e}")
+            return
+        breaches = query_breaches(
+            archive_dir, audit_file, args.account, args.rule, since, until, args.limit
+        )
+    if not breaches:
+        print("No matching breaches." if history else "No breaches since start.")
+    for breach in breaches:
+        print(
+            f"{breach['timestamp']}  {breach['account']}  {breach['rule']}  {breach['contract']}  "
+            f"{breach['action']} ({breach['enforcement']}): {breach['reason']}"
+        )
 
 async def tail_logs(args):
-    # Simple tail -f equivalent for live.log
-    with open(log_dir / "live.log", "r") as f:
-        f.seek(0, 2)  # End of file
-        while True:
-            line = f.read(1024)
-            if line:
-                print(line, end="")
-            await asyncio.sleep(0.1)
+    # Audit records are pushed by the daemon as soon as they are written
+    try:
+        async for record in control.subscribe(socket_path):
+            print(f"{record.get('timestamp', '')} [{record['level']}] {record['message']}")
+    except ConnectionError:
+        print("Daemon is not running.")
+
+def parse_root_values(items):
+    values = {}
+    for item in items:
+        symbol, _, value = item.partition("=")
+        values[symbol] = float(value)
+    return values
+
+async def replay_daemon(args):
+    if not args.file:
+        print("Usage: riskd replay <file> [--config PATH] [--output PATH]")
+        return
+    try:
+        with open(args.config or config_path) as f:
+            config = json.load(f)
+        point_values = parse_root_values(args.point_value)
+        tick_sizes = parse_root_values(args.tick_size)
+        report = await replay.replay(args.file, config, point_values, tick_sizes)
+    except (OSError, ValueError) as e:
+        print(f"Replay failed: {e}")
+        return
+    for line in replay.format_report(report, args.limit):
+        print(line)
+    if args.output:
+        with open(args.output, "w") as f:
+            for breach in report["breaches"]:
+                f.write(json.dumps({"kind": "breach", **breach}, default=str) + "\n")
+            for order in report["orders"]:
+                f.write(json.dumps({"kind": "order", **order}, default=str) + "\n")
+        print(f"Decisions written to {args.output}")
+
+async def loadtest_daemon(args):
+    profile = {
+        key: value
+        for key, value in (
+            ("quotes_per_s", args.quotes_per_s),
+            ("fills_per_s", args.fills_per_s),
+            ("positions_per_s", args.positions_per_s),
+            ("burst_every_s", args.burst_every),
+            ("burst_size", args.burst_size),
+            ("accounts", args.accounts),
+            ("duration_s", args.duration),
+        )
+        if value is not None
+    }
+    try:
+        with open(args.config or config_path) as f:
+            config = json.load(f)
+        storm = loadtest.EventStorm(
+            config, profile, parse_root_values(args.point_value), parse_root_values(args.tick_size)
+        )
+        if args.ramp:
+            reports = await storm.ramp(args.ramp)
+        else:
+            reports = [await storm.run()]
+    except (OSError, ValueError) as e:
+        print(f"Load test failed: {e}")
+        return
+    for report in reports:
+        for line in loadtest.format_load_report(report):
+            print(line)
+        print()
+    if args.ramp:
+        for line in loadtest.format_ramp(reports):
+            print(line)
+    if args.output:
+        with open(args.output, "w") as f:
+            for report in reports:
+                f.write(json.dumps(report, default=str) + "\n")
+        print(f"Reports written to {args.output}")
 
 async def dry_run_daemon(args):
     # Alias for start with dry_run=true
@@ -223,7 +646,27 @@ async def validate_daemon(args):
 
 def main():
     parser = argparse.ArgumentParser(description="Risk Manager Daemon")
-    parser.add_argument("command", choices=["start", "stop", "status", "tail", "dry-run", "validate"])
+    parser.add_argument("command", choices=["start", "stop", "status", "tail", "dry-run", "validate", "metrics", "breaches", "reload", "replay", "loadtest"])
+    parser.add_argument("file", nargs="?", help="Event capture or audit.ndjson to replay")
+    parser.add_argument("--limit", type=int, default=20, help="Number of breaches to show")
+    parser.add_argument("--account", type=int, help="breaches: only this account ID (searches history)")
+    parser.add_argument("--rule", help="breaches: only this rule (searches history)")
+    parser.add_argument("--since", help="breaches: from this date or ISO time (searches history)")
+    parser.add_argument("--until", help="breaches: up to this date (inclusive) or ISO time")
+    parser.add_argument("--config", help="Config to replay against (default: the live config)")
+    parser.add_argument("--output", help="Write replay decisions / load test reports as NDJSON")
+    parser.add_argument("--quotes-per-s", type=int, help="loadtest: quote rate across all symbols (default 20000)")
+    parser.add_argument("--fills-per-s", type=int, help="loadtest: fill rate (default 20)")
+    parser.add_argument("--positions-per-s", type=int, help="loadtest: position update rate (default 10)")
+    parser.add_argument("--burst-every", type=float, help="loadtest: seconds between fill/position bursts (default 5, 0 for none)")
+    parser.add_argument("--burst-size", type=int, help="loadtest: events per burst (default 200)")
+    parser.add_argument("--accounts", type=int, help="loadtest: accounts to spread user events over (default 1)")
+    parser.add_argument("--duration", type=float, help="loadtest: seconds per run (default 30)")
+    parser.add_argument("--ramp", type=int, default=0, help="loadtest: up to N runs, doubling the quote rate each time")
+    parser.add_argument("--point-value", action="append", default=[], metavar="ROOT=VALUE",
+                        help="Dollar value of one point for an instrument root, for P&L rules")
+    parser.add_argument("--tick-size", action="append", default=[], metavar="ROOT=VALUE",
+                        help="Tick size for an instrument root, for quote conflation move_ticks")
     args = parser.parse_args()
     if args.command == "start":
         asyncio.run(start_daemon(args))
@@ -237,6 +680,16 @@ def main():
         asyncio.run(dry_run_daemon(args))
     elif args.command == "validate":
         asyncio.run(validate_daemon(args))
+    elif args.command == "metrics":
+        asyncio.run(metrics_daemon(args))
+    elif args.command == "breaches":
+        asyncio.run(breaches_daemon(args))
+    elif args.command == "reload":
+        asyncio.run(reload_daemon(args))
+    elif args.command == "replay":
+        asyncio.run(replay_daemon(args))
+    elif args.command == "loadtest":
+        asyncio.run(loadtest_daemon(args))
 
 if __name__ == "__main__":
     main()
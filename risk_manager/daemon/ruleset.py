@@ -0,0 +1,209 @@
+"""Validated, immutable rule sets for hot config reload.
+
+A ``RuleSet`` bundles one config version with its loaded rule modules and
+its dispatch table. ``build_ruleset`` does all the expensive work (JSON
+validation, rule imports, each rule's optional ``prepare(config)``) before
+anything is swapped, so a reload runs off the hot path and a bad config is
+rejected whole.
+
+The daemon holds the active rule set in ``RuleEngine.ruleset``. ``handle``
+reads it once per event, so swapping it between events is atomic:
+an event that is mid-enforcement keeps the rule set it started with, and
+no event ever sees half of an old config and half of a new one.
+
+The candidate rules of the ``shadow`` section are built into
+``RuleSet.shadow`` by the same call, so they are validated and swapped
+together with the live ones (see shadow.py).
+"""
+
+import importlib
+import time
+
+from daemon.audit_writer import FSYNC_POLICIES
+from daemon.dispatch import RuleDispatcher
+from daemon.event_log import parse_policies
+from daemon.shadow import shadow_config
+
+
+class ConfigError(ValueError):
+    """The config file cannot be turned into a rule set."""
+
+
+class RuleSet:
+    __slots__ = (
+        "config",
+        "dispatcher",
+        "errors",
+        "loaded_at",
+        "rules",
+        "shadow",
+        "version",
+    )
+
+    def __init__(self, version, config, rules, dispatcher, errors, shadow=None):
+        self.version = version
+        self.config = config
+        self.rules = rules
+        self.dispatcher = dispatcher
+        self.errors = errors  # rule modules skipped at start-up
+        self.loaded_at = time.time()
+        self.shadow = shadow  # candidate RuleSet evaluated in shadow, or None
+
+    @property
+    def dry_run(self):
+        return self.config["dry_run"]
+
+    @property
+    def event_types(self):
+        """Event types the live or the shadow rules declared, in load order."""
+        if self.shadow is None:
+            return self.dispatcher.event_types
+        return list(
+            dict.fromkeys(
+                [*self.dispatcher.event_types, *self.shadow.dispatcher.event_types]
+            )
+        )
+
+
+def _check_symbols(value, where):
+    if not isinstance(value, list) or not all(isinstance(s, str) for s in value):
+        raise ConfigError(f"{where} must be a list of symbol strings")
+
+
+def validate_config(config):
+    """Raise ``ConfigError`` if the config does not match CONFIG.md."""
+    if not isinstance(config, dict):
+        raise ConfigError("config must be a JSON object")
+    if not isinstance(config.get("dry_run"), bool):
+        raise ConfigError("dry_run must be true or false")
+    _check_symbols(config.get("symbols", []), "symbols")
+    accounts = config.get("accounts", [])
+    if not isinstance(accounts, list) or not all(
+        isinstance(a, int | str) and not isinstance(a, bool) for a in accounts
+    ):
+        raise ConfigError("accounts must be a list of account IDs or names")
+
+    audit = config.get("audit", {})
+    if not isinstance(audit, dict):
+        raise ConfigError("audit must be an object")
+    if audit.get("fsync", "interval") not in FSYNC_POLICIES:
+        raise ConfigError(f"audit.fsync must be one of {FSYNC_POLICIES}")
+    rotate_mb = audit.get("rotate_mb", 64)
+    if (
+        not isinstance(rotate_mb, int | float)
+        or isinstance(rotate_mb, bool)
+        or rotate_mb < 0
+    ):
+        raise ConfigError("audit.rotate_mb must be a non-negative number")
+    if not isinstance(audit.get("rotate_daily", True), bool):
+        raise ConfigError("audit.rotate_daily must be true or false")
+    enforcement = config.get("enforcement", {})
+    if not isinstance(enforcement, dict):
+        raise ConfigError("enforcement must be an object")
+    for key in ("settle_timeout_s", "retry_after_s"):
+        value = enforcement.get(key, 0)
+        if not isinstance(value, int | float) or isinstance(value, bool) or value < 0:
+            raise ConfigError(f"enforcement.{key} must be a non-negative number")
+    lane = enforcement.get("lane", {})
+    if not isinstance(lane, dict) or not isinstance(lane.get("enabled", True), bool):
+        raise ConfigError("enforcement.lane must be an object with a boolean enabled")
+    for key in ("ping_interval_s", "refresh_before_s", "rate_limit"):
+        value = lane.get(key, 1)
+        if not isinstance(value, int | float) or isinstance(value, bool) or value <= 0:
+            raise ConfigError(f"enforcement.lane.{key} must be a positive number")
+    quotes = config.get("quotes", {})
+    if not isinstance(quotes, dict):
+        raise ConfigError("quotes must be an object")
+    for key in ("conflate_ms", "move_ticks"):
+        value = quotes.get(key, 0)
+        if not isinstance(value, int | float) or isinstance(value, bool) or value < 0:
+            raise ConfigError(f"quotes.{key} must be a non-negative number")
+    try:
+        parse_policies(config.get("event_logging", {}))
+    except ValueError as e:
+        raise ConfigError(str(e)) from e
+    capture = config.get("capture", {})
+    if not isinstance(capture, dict):
+        raise ConfigError("capture must be an object")
+    if not isinstance(capture.get("enabled", False), bool):
+        raise ConfigError("capture.enabled must be true or false")
+    snapshot = config.get("snapshot", {})
+    if not isinstance(snapshot, dict):
+        raise ConfigError("snapshot must be an object")
+    if not isinstance(snapshot.get("enabled", True), bool):
+        raise ConfigError("snapshot.enabled must be true or false")
+    for key in ("interval_ms", "max_age_s"):
+        value = snapshot.get(key, 1)
+        if not isinstance(value, int | float) or isinstance(value, bool) or value <= 0:
+            raise ConfigError(f"snapshot.{key} must be a positive number")
+    shadow = config.get("shadow", {})
+    if not isinstance(shadow, dict):
+        raise ConfigError("shadow must be an object")
+    if not isinstance(shadow.get("enabled", False), bool):
+        raise ConfigError("shadow.enabled must be true or false")
+    if shadow.get("enabled", False) and not isinstance(shadow.get("rules"), dict):
+        raise ConfigError("shadow.rules must be an object when shadow is enabled")
+    if "symbols" in shadow:
+        _check_symbols(shadow["symbols"], "shadow.symbols")
+
+    rules = config.get("rules")
+    if not isinstance(rules, dict):
+        raise ConfigError("rules must be an object")
+    for name, rule_config in rules.items():
+        if not isinstance(rule_config, dict):
+            raise ConfigError(f"rules.{name} must be an object")
+        if not isinstance(rule_config.get("enabled"), bool):
+            raise ConfigError(f"rules.{name}.enabled must be true or false")
+        if not isinstance(rule_config.get("parameters", {}), dict):
+            raise ConfigError(f"rules.{name}.parameters must be an object")
+        if "symbols" in rule_config:
+            _check_symbols(rule_config["symbols"], f"rules.{name}.symbols")
+
+
+def build_ruleset(config, version, strict=True):
+    """Validate ``config`` and build a ready-to-swap ``RuleSet``.
+
+    With ``strict`` a rule module that fails to import rejects the whole
+    config (used for reloads, so a typo never silently drops a rule). At
+    start-up the daemon passes ``strict=False`` and such rules are skipped
+    and listed in ``RuleSet.errors``, as before.
+    """
+    validate_config(config)
+    shadow = None
+    if config.get("shadow", {}).get("enabled", False):
+        try:
+            shadow = build_ruleset(shadow_config(config), version, strict)
+        except ConfigError as e:
+            raise ConfigError(f"shadow: {e}") from e
+    rules = {}
+    errors = []
+    for name, rule_config in config["rules"].items():
+        if not rule_config["enabled"]:
+            continue
+        try:
+            rules[name] = importlib.import_module(f"rules.{name}")
+        except Exception as e:
+            if strict:
+                raise ConfigError(f"cannot load rule module rules.{name}: {e}") from e
+            errors.append(f"{name}: {e}")
+    try:
+        dispatcher = RuleDispatcher(rules, config)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ConfigError(str(e)) from e
+    return RuleSet(version, config, rules, dispatcher, errors, shadow)
+
+
+def config_diff(old, new, prefix=""):
+    """Flat list of ``"path: old -> new"`` lines between two configs."""
+    changes = []
+    for key in sorted(set(old) | set(new), key=str):
+        path = f"{prefix}{key}"
+        if key not in new:
+            changes.append(f"{path}: removed")
+        elif key not in old:
+            changes.append(f"{path}: added {new[key]!r}")
+        elif isinstance(old[key], dict) and isinstance(new[key], dict):
+            changes.extend(config_diff(old[key], new[key], f"{path}."))
+        elif old[key] != new[key]:
+            changes.append(f"{path}: {old[key]!r} -> {new[key]!r}")
+    return changes
@@ -0,0 +1,182 @@
+"""Shadow evaluation of a candidate rule set on live traffic.
+
+The ``shadow`` config section holds a second ``rules`` object (and
+optionally its own ``symbols``). It is built into a ``RuleSet`` alongside
+the live one, and both are swapped together on reload. The candidate
+never enforces: ``ShadowLane`` only logs what it would have decided and
+how that differs from the live rules.
+
+Nothing is received or parsed twice. The engine applies each event to the
+account model once, evaluates the live rules, and only then queues the
+event for the lane, together with the live decisions (advisory ones
+included). A background task evaluates the candidate rules against the
+same account model, so the live path pays one queue put per event.
+
+Rules also keep private memory in the account (``rule_state`` and
+sliding windows). The candidate gets its own through ``ShadowState``, so
+a candidate with the same rule names neither double-counts fills in the
+live windows nor latches the live sessions. That memory is not part of
+the crash-recovery snapshot.
+
+The lane reads the model as it stands when it gets to an event; during a
+burst that can be a few events ahead of what the live rules saw. Under
+overload the lane drops events rather than slow the feed.
+"""
+
+import asyncio
+import time
+
+from daemon.dispatch import event_contract
+from daemon.windows import WindowStore
+
+BOTH = "both"
+LIVE_ONLY = "live_only"
+SHADOW_ONLY = "shadow_only"
+ACTION_DIFFERS = "action_differs"
+
+
+def shadow_config(config):
+    """The candidate's config: the live one with the shadow rules (and symbols) swapped in."""
+    shadow = config["shadow"]
+    candidate = {key: value for key, value in config.items() if key != "shadow"}
+    candidate["rules"] = shadow["rules"]
+    if "symbols" in shadow:
+        candidate["symbols"] = shadow["symbols"]
+    return candidate
+
+
+class ShadowState:
+    """The account's live model, with the candidate rules' own memory."""
+
+    def __init__(self, state):
+        self._state = state
+        self._rule_state = {}
+        self._windows = {}
+
+    def __getattr__(self, name):
+        return getattr(self._state, name)
+
+    def __len__(self):
+        return len(self._state)
+
+    def rule_state(self, name):
+        state = self._rule_state.get(name)
+        if state is None:
+            state = self._rule_state[name] = {}
+        return state
+
+    def window(self, spec, key=None):
+        store = self._windows.get(spec)
+        if store is None:
+            store = self._windows[spec] = WindowStore(spec)
+        return store.get(key)
+
+
+class ShadowLane:
+    def __init__(self, metrics, logger, audit, max_queue=10000):
+        self.metrics = metrics
+        self.logger = logger
+        self.audit = audit
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._views = {}  # account_id -> ShadowState
+        self.events = 0
+        self.dropped = 0
+        self.errors = 0
+        self.counts = {BOTH: 0, LIVE_ONLY: 0, SHADOW_ONLY: 0, ACTION_DIFFERS: 0}
+        self.per_rule = {}  # rule -> {"live": n, "shadow": n, <difference>: n}
+
+    def offer(self, shadow, event, partition, live, event_time):
+        try:
+            self._queue.put_nowait((shadow, event, partition, live, event_time))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def run(self):
+        """Evaluate queued events against the candidate rules, until cancelled."""
+        while True:
+            shadow, event, partition, live, event_time = await self._queue.get()
+            self.metrics.record("shadow_lag", time.perf_counter() - event_time)
+            try:
+                self.evaluate(shadow, event, partition, live)
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"Shadow rules failed on {event.type}: {e}")
+
+    def evaluate(self, shadow, event, partition, live):
+        """Run the candidate rules on one event and record how they differ from ``live``.
+
+        ``live`` is the list of ``(rule, action, reason)`` the live rules breached with.
+        """
+        view = self._views.get(partition.account_id)
+        if view is None:
+            view = self._views[partition.account_id] = ShadowState(partition.state)
+        started = time.perf_counter()
+        decisions = []
+        for binding in shadow.dispatcher.rules_for(event):
+            result = binding.evaluate(event, view)
+            if result["status"] == "BREACH":
+                decisions.append((binding.name, result["action"], result["reason"]))
+        self.metrics.record("shadow_eval", time.perf_counter() - started)
+        self.events += 1
+        if decisions or live:
+            self._compare(event, partition, live, decisions)
+
+    def _compare(self, event, partition, live, decisions):
+        live_by_rule = {name: (action, reason) for name, action, reason in live}
+        shadow_by_rule = {name: (action, reason) for name, action, reason in decisions}
+        for name in sorted(live_by_rule.keys() | shadow_by_rule.keys()):
+            counts = self.per_rule.get(name)
+            if counts is None:
+                counts = self.per_rule[name] = {
+                    "live": 0,
+                    "shadow": 0,
+                    LIVE_ONLY: 0,
+                    SHADOW_ONLY: 0,
+                    ACTION_DIFFERS: 0,
+                }
+            live_decision = live_by_rule.get(name)
+            shadow_decision = shadow_by_rule.get(name)
+            if live_decision is not None:
+                counts["live"] += 1
+            if shadow_decision is not None:
+                counts["shadow"] += 1
+                self.logger.info(
+                    f"SHADOW BREACH: {shadow_decision[1]} (Rule: {name}, account {partition.account_id}, "
+                    f"would {shadow_decision[0]})"
+                )
+            if live_decision is None:
+                outcome = SHADOW_ONLY
+            elif shadow_decision is None:
+                outcome = LIVE_ONLY
+            elif live_decision[0] != shadow_decision[0]:
+                outcome = ACTION_DIFFERS
+            else:
+                self.counts[BOTH] += 1
+                continue
+            self.counts[outcome] += 1
+            counts[outcome] += 1
+            action, reason = shadow_decision or live_decision
+            self.audit(
+                f"Shadow rules differ on account {partition.label}: {name} {outcome.replace('_', ' ')} "
+                f"(live: {live_decision[0] if live_decision else 'no breach'}, "
+                f"candidate: {shadow_decision[0] if shadow_decision else 'no breach'}). {reason}",
+                fields={
+                    "kind": "shadow",
+                    "account": partition.account_id,
+                    "rule": name,
+                    "contract": event_contract(event),
+                    "action": action,
+                    "reason": reason,
+                    "difference": outcome,
+                },
+            )
+
+    def stats(self):
+        return {
+            "events": self.events,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "errors": self.errors,
+            **self.counts,
+            "rules": self.per_rule,
+        }
@@ -0,0 +1,298 @@
+"""Crash-recovery snapshot of the account models and enforcement journal.
+
+After a crash or deploy, a REST seed gives back positions and open orders,
+but not what the daemon learned from the event stream: realized P&L and
+fees (the daily loss limit's baseline), session high-water marks and
+latches, sliding-window counts, recent breaches, and which enforcements
+were in flight. Without them a restarted daemon under-enforces until the
+state is rebuilt.
+
+``StateSnapshot`` keeps that state in a memory-mapped file:
+
+* **Incremental.** Every ``interval_ms`` only accounts whose persisted
+  state changed (``AccountState.unsaved``) are re-encoded; the rest reuse
+  their last encoding. Quotes only move marks and unrealized P&L, so they
+  mark an account unsaved only when they move a P&L session's high-water
+  mark or reset it.
+* **Separate enforcement journal.** Actions in flight are journaled, as
+  soon as they start or end, in a small file of their own next to the
+  snapshot (``<path>.journal``). Writing it encodes just the journal,
+  never the account payload.
+* **Crash-safe without fsync.** Each file holds two halves, each a header
+  (generation, length, CRC-32) plus a payload. A write goes to the older
+  half, so a torn write leaves the other intact. Pages written through
+  the map survive a process crash; the kernel flushes them to disk in
+  the background, and ``close`` syncs them on a clean stop.
+
+On start the daemon loads the newest valid half (if younger than
+``max_age_s``), restores it after each account's one bulk REST seed, and
+reports any difference between the saved and the broker's positions.
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+
+MAGIC = b"RSNP"
+VERSION = 1
+# magic, version, generation, saved_at (epoch), payload length, CRC-32 of payload
+HEADER = struct.Struct("<4sHQdII")
+DEFAULT_INTERVAL_MS = 250
+DEFAULT_MAX_AGE_S = 3600.0
+INITIAL_CAPACITY = 256 * 1024
+JOURNAL_CAPACITY = 16 * 1024
+
+
+class MappedHalves:
+    """A memory-mapped file of two halves, each a header plus a payload.
+
+    ``write`` goes to the half not holding the newest generation, and
+    ``load`` returns the newest half whose CRC checks out.
+    """
+
+    def __init__(self, path, capacity):
+        self.path = path
+        self.capacity = capacity
+        self._file = None
+        self._map = None
+        self._generation = 0
+        self.writes = 0
+        self.last_bytes = 0
+
+    def load(self):
+        """``(saved_at, payload)`` of the newest valid half, or None."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        best = None
+        half = len(data) // 2
+        for offset in (0, half):
+            if len(data) < offset + HEADER.size:
+                continue
+            magic, version, generation, saved_at, length, crc = HEADER.unpack_from(
+                data, offset
+            )
+            payload = data[offset + HEADER.size : offset + HEADER.size + length]
+            if (
+                magic != MAGIC
+                or version != VERSION
+                or len(payload) != length
+                or zlib.crc32(payload) != crc
+            ):
+                continue
+            if best is None or generation > best[0]:
+                best = (generation, saved_at, payload)
+        if best is None:
+            return None
+        generation, saved_at, payload = best
+        self._generation = generation
+        return saved_at, payload
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def is_open(self):
+        return self._map is not None
+
+    def open(self):
+        """Map the file for writing, keeping whatever valid half it already has."""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file = os.fdopen(fd, "r+b")
+        size = os.fstat(fd).st_size
+        if size < 2 * (HEADER.size + self.capacity):
+            self._file.truncate(2 * (HEADER.size + self.capacity))
+        self._map = mmap.mmap(fd, 0)
+
+    def write(self, payload):
+        half = len(self._map) // 2
+        if HEADER.size + len(payload) > half:
+            self._grow(2 * (HEADER.size + len(payload)))
+            half = len(self._map) // 2
+        self._generation += 1
+        # Even generations go to the first half, odd to the second
+        offset = 0 if self._generation % 2 == 0 else half
+        self._map[offset + HEADER.size : offset + HEADER.size + len(payload)] = payload
+        self._map[offset : offset + HEADER.size] = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self._generation,
+            time.time(),
+            len(payload),
+            zlib.crc32(payload),
+        )
+        self.writes += 1
+        self.last_bytes = len(payload)
+
+    def _grow(self, half_size):
+        self._map.close()
+        self._file.truncate(2 * half_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        # The second half moved; make sure the next write does not land on
+        # the first half if that holds the only valid copy
+        if self._generation % 2 == 1:
+            self._generation += 1
+
+    def close(self):
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._map = None
+
+
+class StateSnapshot:
+    def __init__(
+        self, path, interval_ms=DEFAULT_INTERVAL_MS, max_age_s=DEFAULT_MAX_AGE_S
+    ):
+        self.path = path
+        self.interval = interval_ms / 1000
+        self.max_age = max_age_s
+        self._halves = MappedHalves(path, INITIAL_CAPACITY)
+        self._journal_halves = MappedHalves(f"{path}.journal", JOURNAL_CAPACITY)
+        self._encoded = {}  # account_id -> last encoding of its AccountState
+        self._journal = {}  # "account|contract|action" -> {"reason", "started"}
+
+    # -- reading ----------------------------------------------------------
+
+    def load(self):
+        """Newest valid snapshot as a dict, or None if missing, corrupt or too old.
+
+        ``journal`` holds the actions in flight, from the journal file.
+        """
+        loaded = self._halves.load()
+        journal = self._journal_halves.load()
+        if loaded is None:
+            return None
+        saved_at, payload = loaded
+        if time.time() - saved_at > self.max_age:
+            return None
+        saved = json.loads(payload)
+        saved["saved_at"] = saved_at
+        if journal is not None:
+            saved["journal"] = json.loads(journal[1])
+        else:
+            # Missing or torn in both halves; files from before the split carry it inline
+            saved.setdefault("journal", {})
+        return saved
+
+    # -- writing ----------------------------------------------------------
+
+    def open(self):
+        """Map both files for writing, keeping whatever valid halves they have."""
+        self._halves.open()
+        self._journal_halves.open()
+
+    def enforcement_started(self, key, reason):
+        """Journal an action before it is sent, so a crash mid-flight is reported on restart."""
+        self._journal["|".join(map(str, key))] = {
+            "reason": reason,
+            "started": time.time(),
+        }
+        self._write_journal()
+
+    def enforcement_finished(self, key):
+        self._journal.pop("|".join(map(str, key)), None)
+        self._write_journal()
+
+    def _write_journal(self):
+        # Enforcement path: only the (small) journal is encoded
+        if self._journal_halves.is_open:
+            self._journal_halves.write(
+                json.dumps(self._journal, separators=(",", ":")).encode()
+            )
+
+    def unsaved(self, partitions):
+        return any(partition.state.unsaved for partition in partitions)
+
+    def save(self, partitions, breaches):
+        """Re-encode changed accounts and the breach history, then write a new generation."""
+        if not self._halves.is_open:
+            return
+        for partition in partitions:
+            state = partition.state
+            if state.unsaved or partition.account_id not in self._encoded:
+                self._encoded[partition.account_id] = json.dumps(
+                    state.dump(), separators=(",", ":")
+                )
+        accounts = ",".join(
+            f'"{account_id}":{encoded}' for account_id, encoded in self._encoded.items()
+        )
+        breaches = json.dumps(list(breaches), separators=(",", ":"), default=str)
+        self._halves.write(
+            f'{{"accounts":{{{accounts}}},"breaches":{breaches}}}'.encode()
+        )
+
+    async def run(self, partitions, breaches):
+        """Save every ``interval_ms`` while anything changed, until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.unsaved(partitions):
+                self.save(partitions, breaches)
+
+    def close(self, partitions=None, breaches=()):
+        if not self._halves.is_open:
+            return
+        if partitions is not None:
+            self.save(partitions, breaches)
+        self._halves.close()
+        self._journal_halves.close()
+
+    def stats(self):
+        return {
+            "writes": self._halves.writes,
+            "bytes": self._halves.last_bytes,
+            "generation": self._halves.generation,
+            "journal_writes": self._journal_halves.writes,
+            "in_flight": len(self._journal),
+        }
+
+
+def restore_account(partition, saved, logger, audit):
+    """Apply a loaded snapshot to a freshly seeded account and reconcile it.
+
+    Returns the number of positions that differ between the snapshot and the
+    broker. Enforcements that were in flight at the crash are reported with
+    the broker's current position; if it is still over a limit, the next
+    event breaches again.
+    """
+    account = saved["accounts"].get(str(partition.account_id))
+    if account is None:
+        return 0
+    state = partition.state
+    state.restore(account)
+    saved_positions = account["positions"]
+    differences = 0
+    for contract_id in sorted(set(saved_positions) | set(state.open_contracts())):
+        before = saved_positions.get(contract_id, 0)
+        now = state.net_position(contract_id)
+        if before != now:
+            differences += 1
+            audit(
+                f"Recovery on account {partition.label}: {contract_id} was {before} in the snapshot, "
+                f"broker reports {now}",
+                level="WARNING",
+            )
+    for key, entry in saved["journal"].items():
+        account_id, contract_id, action = key.split("|", 2)
+        if account_id != str(partition.account_id):
+            continue
+        audit(
+            f"Recovery on account {partition.label}: {action} of {contract_id} was in flight when the "
+            f"daemon stopped ({entry['reason']}); position now {state.net_position(contract_id)}",
+            level="WARNING",
+        )
+    age = time.time() - saved["saved_at"]
+    logger.info(
+        f"Restored account {partition.label} from snapshot ({age:.1f}s old, "
+        f"{differences} position difference(s) after REST reconcile)"
+    )
+    return differences
@@ -0,0 +1,265 @@
+"""Supervise several accounts from one daemon process.
+
+One ``TradingSuite`` carries the shared pieces: a single authenticated HTTP
+client, the market-data connection and the instrument contexts for every
+configured symbol. Each supervised account gets an ``AccountPartition``:
+
+* its own user-hub connection. The suite's connection is reused for the
+  account the client authenticated as; any other account gets a
+  ``ProjectXRealtimeClient`` built from the shared session token.
+* its own ``AccountState`` and per-rule state. Rules therefore never see
+  another account's positions, orders or counters.
+* its own ``EnforcementExecutor`` bound to that account. With an
+  enforcement lane, every account's orders go through the lane.
+
+User-hub payloads (``position_update``, ``order_update``,
+``trade_execution``) go straight from each partition's connection to its
+state and rules. ``translate`` turns them into the same
+``POSITION_*``/``ORDER_*`` events the SDK managers emit. The rules then see
+identical payloads for every account, whether or not the SDK has managers
+for it. Market data arrives once on the suite's EventBus and is fanned out
+to every partition.
+"""
+
+from collections import OrderedDict
+from dataclasses import asdict
+
+from daemon.account_state import (
+    ORDER_EVENT_TYPES,
+    ORDER_UPDATE,
+    POSITION_EVENT_TYPES,
+    TRADE_EXECUTION,
+    AccountState,
+    unwrap_payload,
+)
+from daemon.enforcement import AccountOrders, EnforcementExecutor
+
+from project_x_py import EventType
+from project_x_py.event_bus import Event
+from project_x_py.models import Order
+from project_x_py.realtime import ProjectXRealtimeClient
+
+POSITION_UPDATE = "position_update"
+USER_HUB_FEEDS = (POSITION_UPDATE, ORDER_UPDATE, TRADE_EXECUTION)
+# Produced per account by translate(), never taken from the shared EventBus
+USER_EVENT_TYPES = (*POSITION_EVENT_TYPES, *ORDER_EVENT_TYPES)
+
+# Terminal gateway order statuses and the SDK events they map to
+ORDER_STATUS_EVENTS = {
+    2: EventType.ORDER_FILLED,
+    3: EventType.ORDER_CANCELLED,
+    4: EventType.ORDER_EXPIRED,
+    5: EventType.ORDER_REJECTED,
+}
+# Enough order IDs to recognise repeated status updates
+STATUS_MEMORY = 4096
+
+
+class AccountPartition:
+    def __init__(
+        self, account_id, name, realtime, orders, state, executor, shared_connection
+    ):
+        self.account_id = account_id
+        self.name = name
+        self.realtime = realtime
+        self.orders = orders
+        self.state = state
+        self.executor = executor
+        self.shared_connection = shared_connection
+        self._order_status = OrderedDict()
+
+    @property
+    def label(self):
+        return f"{self.name} ({self.account_id})" if self.name else str(self.account_id)
+
+    def translate(self, feed, raw):
+        """Turn one user-hub payload into the events rules consume."""
+        data = unwrap_payload(raw)
+        if not data:
+            return []
+        account_id = data.get("accountId")
+        if account_id is not None and account_id != self.account_id:
+            return []  # never let another account's update into this partition
+        source = f"UserHub:{self.account_id}"
+
+        if feed == POSITION_UPDATE:
+            contract_id = data.get("contractId")
+            if not contract_id:
+                return []
+            if not data.get("size"):
+                event_type = EventType.POSITION_CLOSED
+            elif self.state.position(contract_id) is None:
+                event_type = EventType.POSITION_OPENED
+            else:
+                event_type = EventType.POSITION_UPDATED
+            return [Event(event_type, data, source=source)]
+
+        if feed == ORDER_UPDATE:
+            events = [Event(ORDER_UPDATE, data, source=source)]
+            order_id = data.get("id")
+            status = data.get("status")
+            old_status = self._order_status.pop(order_id, None)
+            self._order_status[order_id] = status
+            if len(self._order_status) > STATUS_MEMORY:
+                self._order_status.popitem(last=False)
+            event_type = ORDER_STATUS_EVENTS.get(status)
+            if event_type is not None and old_status != status:
+                try:
+                    order = Order(**data)
+                except TypeError:
+                    return events
+                events.append(
+                    Event(
+                        event_type,
+                        {
+                            "order": order,
+                            "order_id": order_id,
+                            "old_status": old_status,
+                            "new_status": status,
+                        },
+                        source=source,
+                    )
+                )
+            return events
+
+        return [Event(feed, data, source=source)]
+
+
+class Supervisor:
+    def __init__(self, suite, logger, audit, metrics, capture=None, lane=None):
+        self.suite = suite
+        self.logger = logger
+        self.audit = audit
+        self.metrics = metrics
+        self.capture = capture
+        self.lane = lane  # EnforcementLane, or None to use the SDK's client
+        self.partitions = {}
+
+    def __iter__(self):
+        return iter(self.partitions.values())
+
+    def __len__(self):
+        return len(self.partitions)
+
+    def get(self, account_id):
+        return self.partitions.get(account_id)
+
+    async def resolve_accounts(self, wanted):
+        """Map configured account IDs or names to ``(id, name)`` pairs.
+
+        An empty list supervises the account the client authenticated as.
+        """
+        client = self.suite.client
+        if not wanted:
+            info = client.account_info
+            return [(info.id, info.name)]
+        available = await client.list_accounts()
+        by_id = {account.id: account for account in available}
+        by_name = {account.name.upper(): account for account in available}
+        resolved = []
+        for entry in wanted:
+            account = (
+                by_id.get(entry)
+                if isinstance(entry, int)
+                else by_name.get(str(entry).upper())
+            )
+            if account is None:
+                raise ValueError(f"Account {entry!r} is not available to this login")
+            resolved.append((account.id, account.name))
+        return resolved
+
+    async def add_account(self, account_id, name, handler):
+        """Connect, seed and wire one account. ``handler(partition, feed, data)``."""
+        suite = self.suite
+        client = suite.client
+        first = next(iter(suite.values()))
+        shared = (
+            client.account_info is not None and client.account_info.id == account_id
+        )
+        if shared:
+            realtime = suite.realtime
+            orders = first.orders
+        else:
+            realtime = ProjectXRealtimeClient(
+                jwt_token=client.session_token,
+                account_id=str(account_id),
+                config=client.config,
+            )
+            if not await realtime.connect():
+                raise ConnectionError(
+                    f"User hub connection failed for account {account_id}"
+                )
+            await realtime.subscribe_user_updates()
+            orders = AccountOrders(client, first.orders, account_id)
+        if self.lane is not None:
+            orders = AccountOrders(client, first.orders, account_id, self.lane)
+
+        state = AccountState(account_id)
+        contract_ids = {}
+        for symbol, context in suite.items():
+            info = context.instrument_info
+            state.set_point_value(symbol, info.tickValue / info.tickSize)
+            contract_ids[symbol] = info.id
+        # One bulk REST query per account; events keep it current afterwards
+        positions = await client.search_open_positions(account_id=account_id)
+        open_orders = await first.orders.search_open_orders(account_id=account_id)
+        state.seed(positions, open_orders)
+        if self.capture is not None:
+            # Replay starts each account from the same snapshot
+            self.capture.record(
+                account_id,
+                "seed",
+                {
+                    "positions": [asdict(p) for p in positions],
+                    "orders": [asdict(o) for o in open_orders],
+                },
+            )
+        executor = EnforcementExecutor(
+            orders,
+            state,
+            account_id,
+            self.logger,
+            self.audit,
+            self.metrics,
+            contract_ids,
+        )
+        partition = AccountPartition(
+            account_id, name, realtime, orders, state, executor, shared
+        )
+        self.partitions[account_id] = partition
+
+        for feed in USER_HUB_FEEDS:
+            await realtime.add_callback(feed, _forwarder(handler, partition, feed))
+        self.logger.info(f"Supervising account {partition.label}: {state.snapshot()}")
+        return partition
+
+    async def refresh_tokens(self):
+        """Hand a refreshed session token to the per-account connections."""
+        token = self.suite.client.session_token
+        for partition in self:
+            if (
+                not partition.shared_connection
+                and partition.realtime.jwt_token != token
+            ):
+                await partition.realtime.update_jwt_token(token)
+                self.logger.info(
+                    f"Refreshed user-hub token for account {partition.label}"
+                )
+
+    async def close(self):
+        for partition in self:
+            if not partition.shared_connection:
+                try:
+                    await partition.realtime.disconnect()
+                except Exception as e:
+                    self.logger.error(
+                        f"Disconnect failed for account {partition.label}: {e}"
+                    )
+
+
+def _forwarder(handler, partition, feed):
+    async def forward(data):
+        await handler(partition, feed, data)
+
+    forward.__name__ = f"forward_{feed}_{partition.account_id}"
+    return forward
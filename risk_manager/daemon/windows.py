@@ -0,0 +1,173 @@
+"""Bucketed sliding-window counters for rate-style rules.
+
+A rule declares the windows it needs in a module-level ``WINDOWS`` dict;
+the rule's config may override them under ``"windows"`` (see CONFIG.md):
+
+    WINDOWS = {"trades": {"seconds": 60, "buckets": 60}}
+
+and asks the account model for the window of a key (usually a contract ID,
+``None`` for the whole account) while checking an event:
+
+    window = state.window(config["windows"]["trades"], contract_id)
+    if window.add(state.clock()) > limit: ...
+
+A window keeps ``buckets`` fixed-width slots in preallocated arrays, plus a
+running count and sum. ``add`` and ``total`` only clear the slots that
+expired since the last call, so each call is O(1) amortised and never
+scans events. The price is resolution: an event leaves the window between
+``seconds - seconds / buckets`` and ``seconds`` after it happened.
+"""
+
+from array import array
+from collections import OrderedDict, namedtuple
+
+MAX_BUCKETS = 3600
+DEFAULT_MAX_KEYS = 1024
+
+
+class WindowSpec(namedtuple("WindowSpec", "rule name seconds buckets max_keys")):
+    """Immutable window definition. Equal specs share state across reloads."""
+
+    __slots__ = ()
+
+
+def build_windows(rule, declared, overrides):
+    """Merge a rule's ``WINDOWS`` with its config overrides into ``WindowSpec``s.
+
+    Raises ``ValueError`` for unknown window names or bad values.
+    """
+    if not isinstance(overrides, dict):
+        raise ValueError("windows must be an object")
+    unknown = set(overrides) - set(declared)
+    if unknown:
+        raise ValueError(
+            f"unknown windows {sorted(unknown)}; rule declares {sorted(declared)}"
+        )
+    specs = {}
+    for name, default in declared.items():
+        settings = {**default, **(overrides.get(name) or {})}
+        seconds = settings.get("seconds")
+        buckets = settings.get("buckets", 60)
+        max_keys = settings.get("max_keys", DEFAULT_MAX_KEYS)
+        if (
+            isinstance(seconds, bool)
+            or not isinstance(seconds, int | float)
+            or seconds <= 0
+        ):
+            raise ValueError(f"windows.{name}.seconds must be a positive number")
+        if (
+            isinstance(buckets, bool)
+            or not isinstance(buckets, int)
+            or not 1 <= buckets <= MAX_BUCKETS
+        ):
+            raise ValueError(
+                f"windows.{name}.buckets must be an integer from 1 to {MAX_BUCKETS}"
+            )
+        if isinstance(max_keys, bool) or not isinstance(max_keys, int) or max_keys < 1:
+            raise ValueError(f"windows.{name}.max_keys must be a positive integer")
+        specs[name] = WindowSpec(rule, name, float(seconds), buckets, max_keys)
+    return specs
+
+
+class SlidingWindow:
+    """Count and sum of values added during the last ``seconds``."""
+
+    __slots__ = ("count", "counts", "head", "size", "sum", "sums", "width")
+
+    def __init__(self, seconds, buckets):
+        self.width = seconds / buckets
+        self.size = buckets
+        self.counts = array("q", bytes(8 * buckets))
+        self.sums = array("d", bytes(8 * buckets))
+        self.head = None  # absolute bucket number of the newest slot
+        self.count = 0
+        self.sum = 0.0
+
+    def _advance(self, now):
+        """Expire slots older than the window; return the current bucket number."""
+        index = int(now // self.width)
+        head = self.head
+        if head is None or index - head >= self.size:
+            self.reset()
+            self.head = index
+        elif index > head:
+            counts, sums, size = self.counts, self.sums, self.size
+            for expired in range(head + 1, index + 1):
+                slot = expired % size
+                self.count -= counts[slot]
+                self.sum -= sums[slot]
+                counts[slot] = 0
+                sums[slot] = 0.0
+            if not self.count:
+                self.sum = 0.0  # drop float residue once empty
+            self.head = index
+        # A clock that stepped back counts in the newest slot
+        return self.head
+
+    def add(self, now, value=1.0):
+        """Record one event worth ``value`` at ``now``; return the window count."""
+        slot = self._advance(now) % self.size
+        self.counts[slot] += 1
+        self.sums[slot] += value
+        self.count += 1
+        self.sum += value
+        return self.count
+
+    def total(self, now):
+        """``(count, sum)`` over the window ending at ``now``."""
+        self._advance(now)
+        return self.count, self.sum
+
+    def dump(self):
+        """``[head, [[slot, count, sum], ...]]`` for the non-empty slots."""
+        counts, sums = self.counts, self.sums
+        return [
+            self.head,
+            [[s, counts[s], sums[s]] for s in range(self.size) if counts[s]],
+        ]
+
+    def load(self, head, slots):
+        self.reset()
+        self.head = head
+        for slot, count, value in slots:
+            self.counts[slot] = count
+            self.sums[slot] = value
+            self.count += count
+            self.sum += value
+
+    def reset(self):
+        for slot in range(self.size):
+            self.counts[slot] = 0
+            self.sums[slot] = 0.0
+        self.count = 0
+        self.sum = 0.0
+        self.head = None
+
+
+class WindowStore:
+    """All windows for one spec in one account, keyed by contract (or order, ...).
+
+    At most ``spec.max_keys`` keys are kept; the least recently used one is
+    evicted and its arrays are reused for the next new key.
+    """
+
+    __slots__ = ("spec", "windows")
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.windows = OrderedDict()
+        self.windows[None] = SlidingWindow(spec.seconds, spec.buckets)
+
+    def get(self, key=None):
+        windows = self.windows
+        window = windows.get(key)
+        if window is not None:
+            windows.move_to_end(key)
+            return window
+        if len(windows) >= self.spec.max_keys:
+            _, window = windows.popitem(last=False)
+            window.reset()
+        else:
+            window = SlidingWindow(self.spec.seconds, self.spec.buckets)
+        windows[key] = window
+        return window
@@ -0,0 +1,59 @@
+from daemon.account_state import POSITION_EVENT_TYPES, TRADE_EXECUTION
+from daemon.pnl import parse_session, session_for
+
+from project_x_py import EventType
+
+NAME = "daily_loss_limit"
+
+# Fills move realized P&L and fees; quotes and position changes move unrealized P&L
+EVENT_TYPES = (TRADE_EXECUTION, EventType.QUOTE_UPDATE, *POSITION_EVENT_TYPES)
+
+# Loss limits flatten the account: evaluated first, enforced before other rules run
+TIER = "critical"
+
+
+def prepare(config):
+    parameters = config["parameters"]
+    max_loss = parameters.get("max_loss_usd")
+    if (
+        isinstance(max_loss, bool)
+        or not isinstance(max_loss, int | float)
+        or max_loss <= 0
+    ):
+        raise ValueError(f"max_loss_usd must be a positive number, got {max_loss!r}")
+    enforcement = parameters.get("enforcement", "flatten_all")
+    if enforcement not in ("flatten_all", "flatten"):
+        raise ValueError(
+            f"enforcement must be 'flatten_all' or 'flatten', got {enforcement!r}"
+        )
+    return {
+        **config,
+        "parameters": {
+            **parameters,
+            "max_loss_usd": float(max_loss),
+            "enforcement": enforcement,
+            "include_unrealized": bool(parameters.get("include_unrealized", True)),
+            "session": parse_session(parameters),
+        },
+    }
+
+
+def check(event, config, state):
+    if config.get("enabled", False):
+        parameters = config["parameters"]
+        if parameters["include_unrealized"]:
+            pnl = state.net_pnl
+        else:
+            pnl = state.realized_pnl - state.fees
+        session = session_for(state, NAME, parameters).update(pnl, state.clock())
+        loss = -session.session_pnl(pnl)
+        max_loss = parameters["max_loss_usd"]
+        # Breach once when the limit is hit, then again whenever a position is (re)opened
+        if loss >= max_loss and (not session.latched or len(state)):
+            session.latched = True
+            return {
+                "status": "BREACH",
+                "reason": f"Daily loss ${loss:,.2f} reached limit ${max_loss:,.2f}",
+                "action": parameters["enforcement"],
+            }
+    return {"status": "VALID", "reason": "", "action": ""}
@@ -2,6 +2,19 @@ import json
 from datetime import datetime
 from project_x_py import EventType  # Add this line
 
+# Events this rule consumes; the daemon only dispatches these to check()
+EVENT_TYPES = (EventType.POSITION_UPDATED, EventType.ORDER_FILLED)
+
+# Position size is a hard limit: evaluated first, enforced before other rules run
+TIER = 'critical'
+
+def prepare(config):
+    # Validated once per config load, not on every event
+    max_size = config['parameters'].get('max_contracts', 4)
+    if isinstance(max_size, bool) or not isinstance(max_size, int) or max_size < 0:
+        raise ValueError(f'max_contracts must be a non-negative integer, got {max_size!r}')
+    return {**config, 'parameters': {**config['parameters'], 'max_contracts': max_size}}
+
 def check(event, config):
     if config.get('enabled', False):
         size = 0
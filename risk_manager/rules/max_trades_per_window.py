@@ -0,0 +1,55 @@
+from daemon.account_state import TRADE_EXECUTION
+
+# Every fill from the user hub; voided executions are ignored
+EVENT_TYPES = (TRADE_EXECUTION,)
+
+# Sliding window the fills are counted in; override under "windows" in config
+WINDOWS = {"trades": {"seconds": 60, "buckets": 60}}
+
+
+def prepare(config):
+    max_trades = config["parameters"].get("max_trades", 10)
+    if (
+        isinstance(max_trades, bool)
+        or not isinstance(max_trades, int)
+        or max_trades < 1
+    ):
+        raise ValueError(f"max_trades must be a positive integer, got {max_trades!r}")
+    per = config["parameters"].get("per", "contract")
+    if per not in ("contract", "account"):
+        raise ValueError(f"per must be 'contract' or 'account', got {per!r}")
+    enforcement = config["parameters"].get("enforcement", "flatten")
+    if enforcement not in ("flatten", "flatten_all"):
+        raise ValueError(
+            f"enforcement must be 'flatten' or 'flatten_all', got {enforcement!r}"
+        )
+    return {
+        **config,
+        "parameters": {
+            **config["parameters"],
+            "max_trades": max_trades,
+            "per": per,
+            "enforcement": enforcement,
+        },
+    }
+
+
+def check(event, config, state):
+    data = event.data
+    if not config.get("enabled", False) or data.get("voided"):
+        return {"status": "VALID", "reason": "", "action": ""}
+
+    parameters = config["parameters"]
+    spec = config["windows"]["trades"]
+    contract_id = data.get("contractId")
+    key = contract_id if parameters["per"] == "contract" else None
+    count = state.window(spec, key).add(state.clock())
+    max_trades = parameters["max_trades"]
+    if count > max_trades:
+        scope = contract_id if key else "the account"
+        return {
+            "status": "BREACH",
+            "reason": f"{count} trades on {scope} in {spec.seconds:g}s exceeds max {max_trades}",
+            "action": parameters["enforcement"],
+        }
+    return {"status": "VALID", "reason": "", "action": ""}
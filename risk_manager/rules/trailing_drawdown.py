@@ -0,0 +1,58 @@
+from daemon.account_state import POSITION_EVENT_TYPES, TRADE_EXECUTION
+from daemon.pnl import parse_session, session_for
+
+from project_x_py import EventType
+
+NAME = "trailing_drawdown"
+
+# Fills move realized P&L and fees; quotes and position changes move unrealized P&L
+EVENT_TYPES = (TRADE_EXECUTION, EventType.QUOTE_UPDATE, *POSITION_EVENT_TYPES)
+
+# Loss limits flatten the account: evaluated first, enforced before other rules run
+TIER = "critical"
+
+
+def prepare(config):
+    parameters = config["parameters"]
+    max_drawdown = parameters.get("max_drawdown_usd")
+    if (
+        isinstance(max_drawdown, bool)
+        or not isinstance(max_drawdown, int | float)
+        or max_drawdown <= 0
+    ):
+        raise ValueError(
+            f"max_drawdown_usd must be a positive number, got {max_drawdown!r}"
+        )
+    enforcement = parameters.get("enforcement", "flatten_all")
+    if enforcement not in ("flatten_all", "flatten"):
+        raise ValueError(
+            f"enforcement must be 'flatten_all' or 'flatten', got {enforcement!r}"
+        )
+    return {
+        **config,
+        "parameters": {
+            **parameters,
+            "max_drawdown_usd": float(max_drawdown),
+            "enforcement": enforcement,
+            # The high-water mark trails for the daemon's lifetime unless a reset_time is set
+            "session": parse_session(parameters, default_reset=None),
+        },
+    }
+
+
+def check(event, config, state):
+    if config.get("enabled", False):
+        parameters = config["parameters"]
+        pnl = state.net_pnl
+        session = session_for(state, NAME, parameters).update(pnl, state.clock())
+        drawdown = session.drawdown(pnl)
+        max_drawdown = parameters["max_drawdown_usd"]
+        # Breach once when the limit is hit, then again whenever a position is (re)opened
+        if drawdown >= max_drawdown and (not session.latched or len(state)):
+            session.latched = True
+            return {
+                "status": "BREACH",
+                "reason": f"Drawdown ${drawdown:,.2f} from peak P&L ${session.peak:,.2f} reached limit ${max_drawdown:,.2f}",
+                "action": parameters["enforcement"],
+            }
+    return {"status": "VALID", "reason": "", "action": ""}
@@ -2,12 +2,15 @@
 Data storage and management utilities for the ProjectX SDK.
 
 This module provides efficient data storage solutions including
-memory-mapped files for large datasets and time series storage.
+memory-mapped files for large datasets, time series storage and an
+append-only tick journal.
 """
 
 from project_x_py.data.mmap_storage import MemoryMappedStorage, TimeSeriesStorage
+from project_x_py.data.tick_journal import TickJournal
 
 __all__ = [
     "MemoryMappedStorage",
+    "TickJournal",
     "TimeSeriesStorage",
 ]
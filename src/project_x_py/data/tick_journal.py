@@ -0,0 +1,459 @@
+"""
+Append-only, memory-mapped journal of normalized ticks.
+
+This module records the ticks the realtime data manager processes to columnar
+segment files, so a session can be replayed later: to investigate what the bars
+looked like at a given time, to rebuild bars after a timeframe or session
+configuration change, or to feed a deterministic tick stream to performance
+tests.
+
+Each segment file holds a fixed-size header followed by one preallocated
+column per field (timestamp, price, volume, tick type, trade side), written
+through ``numpy.memmap``. Segments roll over on a configurable time bucket
+(one hour by default) or when full. Appends are buffered in memory and written
+in batches on a single background thread, so the event loop never blocks on
+disk I/O.
+"""
+
+import asyncio
+import contextlib
+import logging
+import re
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = int.from_bytes(b"PXTICKS1", "little")
+_VERSION = 1
+# magic, version, capacity, count, min timestamp, max timestamp, bucket, reserved
+_HEADER_FIELDS = 8
+_HEADER_BYTES = _HEADER_FIELDS * 8
+_COLUMNS: tuple[tuple[str, type[np.generic]], ...] = (
+    ("timestamp", np.int64),  # nanoseconds since the epoch, UTC
+    ("price", np.float64),
+    ("volume", np.int64),
+    ("type", np.int8),
+    ("trade_side", np.int8),
+)
+_TICK_TYPES = ("quote", "trade")
+_TRADE_SIDES = ("unknown", "buy", "sell")
+_SEGMENT_NAME = re.compile(
+    r"^(?P<prefix>.+)-(?P<bucket>\d{8}T\d{6}Z)-(?P<seq>\d{4})\.ticks$"
+)
+
+
+class TickSegment:
+    """
+    One segment file of the tick journal.
+
+    Layout: a header of ``_HEADER_FIELDS`` int64 values, then each column of
+    ``_COLUMNS`` as a contiguous block of ``capacity`` values. The row count in
+    the header is updated after the rows are written, so a reader never sees
+    partially written rows.
+    """
+
+    def __init__(self, path: Path, mode: Literal["r", "r+"] = "r") -> None:
+        """
+        Open an existing segment file.
+
+        Args:
+            path: Segment file path
+            mode: ``"r"`` for read-only or ``"r+"`` to append
+        """
+        self.path = path
+        self._header = np.memmap(
+            path, dtype=np.int64, mode=mode, shape=(_HEADER_FIELDS,)
+        )
+        if int(self._header[0]) != _MAGIC or int(self._header[1]) != _VERSION:
+            raise ValueError(f"Not a tick journal segment: {path}")
+        self.capacity = int(self._header[2])
+        self.columns: dict[str, np.memmap] = {}
+        offset = _HEADER_BYTES
+        for name, dtype in _COLUMNS:
+            self.columns[name] = np.memmap(
+                path, dtype=dtype, mode=mode, offset=offset, shape=(self.capacity,)
+            )
+            offset += np.dtype(dtype).itemsize * self.capacity
+
+    @classmethod
+    def create(cls, path: Path, capacity: int, bucket_ns: int) -> "TickSegment":
+        """Create a preallocated, empty segment file and open it for appending."""
+        row_bytes = sum(np.dtype(dtype).itemsize for _, dtype in _COLUMNS)
+        with path.open("xb") as f:
+            f.truncate(_HEADER_BYTES + row_bytes * capacity)
+        header = np.memmap(path, dtype=np.int64, mode="r+", shape=(_HEADER_FIELDS,))
+        header[:] = [_MAGIC, _VERSION, capacity, 0, 0, 0, bucket_ns, 0]
+        header.flush()
+        del header
+        return cls(path, mode="r+")
+
+    @property
+    def count(self) -> int:
+        """Number of rows written."""
+        return int(self._header[3])
+
+    @property
+    def bucket_ns(self) -> int:
+        """Start of the time bucket this segment was opened for (ns, UTC)."""
+        return int(self._header[6])
+
+    @property
+    def time_range(self) -> tuple[int, int]:
+        """Smallest and largest timestamp in the segment (ns, UTC)."""
+        return int(self._header[4]), int(self._header[5])
+
+    @property
+    def free(self) -> int:
+        """Rows that can still be appended."""
+        return self.capacity - self.count
+
+    def append(self, rows: dict[str, np.ndarray]) -> None:
+        """Append rows (one array per column, at most ``free`` long) and sync."""
+        count = self.count
+        size = len(rows["timestamp"])
+        for name, column in self.columns.items():
+            column[count : count + size] = rows[name]
+            column.flush()
+        timestamps = rows["timestamp"]
+        low, high = int(timestamps.min()), int(timestamps.max())
+        if count:
+            low, high = min(low, self.time_range[0]), max(high, self.time_range[1])
+        self._header[4] = low
+        self._header[5] = high
+        self._header[3] = count + size
+        self._header.flush()
+
+    def rows(
+        self, start_ns: int | None = None, end_ns: int | None = None
+    ) -> dict[str, np.ndarray]:
+        """Copy the written rows with ``start_ns <= timestamp < end_ns``."""
+        count = self.count
+        timestamps = self.columns["timestamp"][:count]
+        mask = np.ones(count, dtype=bool)
+        if start_ns is not None:
+            mask &= timestamps >= start_ns
+        if end_ns is not None:
+            mask &= timestamps < end_ns
+        return {
+            name: np.asarray(column[:count][mask])
+            for name, column in self.columns.items()
+        }
+
+    def close(self) -> None:
+        """Flush and release the memory maps."""
+        for column in self.columns.values():
+            if column.mode != "r":
+                column.flush()
+        self.columns.clear()
+        del self._header
+
+
+class TickJournal:
+    """
+    Append-only tick journal backed by memory-mapped columnar segment files.
+
+    Features:
+        - Batched appends written on a single background thread
+        - Time-based segment rolling (and on a full segment)
+        - Range reads as a Polars DataFrame, from files of any earlier session
+        - Ticks are stored in UTC and returned in the requested timezone
+
+    Example:
+        >>> journal = TickJournal("~/.projectx/ticks", prefix="MNQ")
+        >>> await journal.start()
+        >>> journal.append({"timestamp": now, "price": 21000.25, "volume": 1})
+        >>> await journal.close()
+        >>> frame = journal.load(start, end)
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        prefix: str = "ticks",
+        segment_seconds: int = 3600,
+        segment_capacity: int = 262_144,
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the journal. Nothing is written until the first flush.
+
+        Args:
+            directory: Directory for segment files (created if missing)
+            prefix: File name prefix, e.g. the instrument
+            segment_seconds: Length of the time bucket each segment covers
+            segment_capacity: Rows preallocated per segment file
+            batch_size: Buffered ticks that trigger a background write
+            flush_interval: Seconds between periodic flushes once started
+        """
+        if "-" in prefix or "/" in prefix:
+            raise ValueError(f"Invalid journal prefix: {prefix!r}")
+        if segment_seconds <= 0 or segment_capacity <= 0 or batch_size <= 0:
+            raise ValueError(
+                "segment_seconds, segment_capacity and batch_size must be positive"
+            )
+        self.directory = Path(directory).expanduser()
+        self.prefix = prefix
+        self.segment_ns = segment_seconds * 1_000_000_000
+        self.segment_capacity = segment_capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer: list[tuple[int, float, int, int, int]] = []
+        self._segment: TickSegment | None = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tick-journal"
+        )
+        self._flush_task: asyncio.Task[None] | None = None
+        self._pending: set[asyncio.Future[None]] = set()
+        self._closed = False
+        self.ticks_written = 0
+
+    async def start(self) -> None:
+        """Start the periodic flush task."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._periodic_flush())
+
+    def append(self, tick: dict[str, Any]) -> None:
+        """
+        Buffer a normalized tick. Cheap and non-blocking.
+
+        Once ``batch_size`` ticks are buffered, a write is handed to the journal
+        thread when called from a running event loop.
+
+        Args:
+            tick: Tick dictionary with ``timestamp`` (timezone-aware), ``price``,
+                optional ``volume``, ``type`` and ``trade_side``
+        """
+        if self._closed:
+            return
+        timestamp: datetime = tick["timestamp"]
+        self._buffer.append(
+            (
+                _to_ns(timestamp),
+                float(tick["price"]),
+                int(tick.get("volume", 0) or 0),
+                _code(_TICK_TYPES, tick.get("type"), default=0),
+                _code(_TRADE_SIDES, tick.get("trade_side"), default=0),
+            )
+        )
+        if len(self._buffer) >= self.batch_size:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # No running loop: the ticks wait for flush()
+            future = loop.create_task(self.flush())
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> None:
+        """Write all buffered ticks on the journal thread."""
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._write, batch)
+
+    async def close(self) -> None:
+        """Stop the flush task, write buffered ticks and close the open segment."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close_segment)
+        self._executor.shutdown(wait=True)
+
+    async def read(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        time_zone: str = "UTC",
+    ) -> pl.DataFrame:
+        """
+        Read journaled ticks in ``[start, end)`` without blocking the event loop.
+
+        Buffered ticks are flushed first. Runs on the journal thread, so it sees
+        every write issued before it.
+        """
+        await self.flush()
+        if self._closed:
+            return self.load(start, end, time_zone)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.load, start, end, time_zone
+        )
+
+    def load(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        time_zone: str = "UTC",
+    ) -> pl.DataFrame:
+        """
+        Read journaled ticks in ``[start, end)`` from the segment files.
+
+        Usable without a running journal (e.g. on another session's directory).
+
+        Args:
+            start: Inclusive start, or None for the beginning of the journal
+            end: Exclusive end, or None for the end of the journal
+            time_zone: Timezone of the returned timestamps
+
+        Returns:
+            pl.DataFrame: Columns timestamp, price, volume, type and trade_side,
+                sorted by timestamp (stable, so arrival order is kept for ties)
+        """
+        start_ns = _to_ns(start) if start is not None else None
+        end_ns = _to_ns(end) if end is not None else None
+        parts: dict[str, list[np.ndarray]] = {name: [] for name, _ in _COLUMNS}
+        for segment in self._segments(start_ns, end_ns):
+            try:
+                for name, values in segment.rows(start_ns, end_ns).items():
+                    parts[name].append(values)
+            finally:
+                segment.close()
+
+        columns = {
+            name: np.concatenate(values) if values else np.empty(0, dtype=dtype)
+            for (name, dtype), values in zip(_COLUMNS, parts.values(), strict=True)
+        }
+        return (
+            pl.DataFrame(
+                {
+                    "timestamp": pl.Series(columns["timestamp"])
+                    .cast(pl.Datetime("ns", "UTC"))
+                    .cast(pl.Datetime("us", "UTC")),
+                    "price": columns["price"],
+                    "volume": columns["volume"],
+                    "type": pl.Series(columns["type"]).cast(pl.Int64),
+                    "trade_side": pl.Series(columns["trade_side"]).cast(pl.Int64),
+                }
+            )
+            .with_columns(
+                pl.col("timestamp").dt.convert_time_zone(time_zone),
+                pl.col("type").replace_strict(
+                    list(range(len(_TICK_TYPES))), list(_TICK_TYPES), default=None
+                ),
+                pl.col("trade_side").replace_strict(
+                    list(range(len(_TRADE_SIDES))), list(_TRADE_SIDES), default=None
+                ),
+            )
+            .sort("timestamp", maintain_order=True)
+        )
+
+    def segment_paths(self) -> list[Path]:
+        """Segment files of this journal, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        paths = []
+        for path in self.directory.iterdir():
+            match = _SEGMENT_NAME.match(path.name)
+            if match and match["prefix"] == self.prefix:
+                paths.append(path)
+        return sorted(paths)
+
+    def _segments(
+        self, start_ns: int | None, end_ns: int | None
+    ) -> Iterator[TickSegment]:
+        """Open the segments that may hold ticks in ``[start_ns, end_ns)``."""
+        for path in self.segment_paths():
+            try:
+                segment = TickSegment(path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable tick journal segment {path}: {e}")
+                continue
+            low, high = segment.time_range
+            if (
+                segment.count == 0
+                or (start_ns is not None and high < start_ns)
+                or (end_ns is not None and low >= end_ns)
+            ):
+                segment.close()
+                continue
+            yield segment
+
+    async def _periodic_flush(self) -> None:
+        """Flush buffered ticks every ``flush_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Tick journal flush failed: {e}")
+
+    def _write(self, batch: list[tuple[int, float, int, int, int]]) -> None:
+        """Write a batch to the segment files. Runs on the journal thread."""
+        records = np.array(
+            batch,
+            dtype=[(name, dtype) for name, dtype in _COLUMNS],
+        )
+        buckets = records["timestamp"] // self.segment_ns * self.segment_ns
+        position = 0
+        while position < len(records):
+            bucket = int(buckets[position])
+            segment = self._segment
+            # Roll over on a later time bucket; late ticks stay in the open segment
+            if segment is None or segment.free == 0 or bucket > segment.bucket_ns:
+                if segment is not None:
+                    bucket = max(bucket, segment.bucket_ns)
+                segment = self._open_segment(bucket)
+            later = np.flatnonzero(buckets[position:] > segment.bucket_ns)
+            run_end = position + int(later[0]) if len(later) else len(records)
+            run_end = min(run_end, position + segment.free)
+            run = records[position:run_end]
+            segment.append({name: run[name] for name, _ in _COLUMNS})
+            position = run_end
+        self.ticks_written += len(records)
+
+    def _open_segment(self, bucket_ns: int) -> TickSegment:
+        """Close the open segment and create the next one for ``bucket_ns``."""
+        self._close_segment()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromtimestamp(bucket_ns / 1e9, UTC).strftime("%Y%m%dT%H%M%SZ")
+        sequence = 0
+        while True:
+            path = self.directory / f"{self.prefix}-{stamp}-{sequence:04d}.ticks"
+            try:
+                self._segment = TickSegment.create(
+                    path, self.segment_capacity, bucket_ns
+                )
+                return self._segment
+            except FileExistsError:
+                sequence += 1
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+
+def _to_ns(timestamp: datetime) -> int:
+    """Nanoseconds since the epoch for a timezone-aware (or UTC naive) datetime."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC)
+    delta = timestamp - datetime(1970, 1, 1, tzinfo=UTC)
+    seconds = delta.days * 86_400 + delta.seconds
+    return seconds * 1_000_000_000 + delta.microseconds * 1000
+
+
+def _code(values: tuple[str, ...], value: Any, default: int) -> int:
+    try:
+        return values.index(value)
+    except ValueError:
+        return default
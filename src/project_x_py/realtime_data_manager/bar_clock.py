@@ -0,0 +1,95 @@
+"""
+Precomputed bar boundaries for single-pass multi-timeframe aggregation.
+
+Author: @TexasCoding
+Date: 2025-10-18
+
+Overview:
+    Every tick used to compute a bar time for every timeframe: a DST check,
+    a timezone normalization and a ``datetime.replace``. Nearly all ticks
+    land in the bar the previous tick opened, so that work is repeated for
+    nothing. A ``BarClock`` remembers, per timeframe, the current bar time
+    and the instant (epoch seconds) at which the next bar starts. A tick
+    whose epoch falls inside ``[start, end)`` reuses the cached bar time with
+    two float comparisons; only a tick that crosses a boundary (or arrives
+    out of order) pays for the full calculation.
+
+    The window mirrors ``_calculate_bar_time`` exactly: bars are floored
+    within the minute (seconds) or within the hour (minutes), so the next
+    boundary is ``start + interval`` capped at the top of that minute or
+    hour. Timeframes whose interval does not divide 60, and ``4hr`` (which
+    ``_calculate_bar_time`` floors to the hour), therefore get the same bar
+    times as before. Bar times computed inside a DST transition period are
+    never cached, so the DST rules in ``DSTHandlingMixin`` still apply tick
+    by tick there.
+
+Example Usage:
+    ```python
+    clock = BarClock(interval=5, unit=2)
+    epoch = timestamp.timestamp()
+
+    bar_time = clock.lookup(epoch)
+    if bar_time is None:
+        bar_time = manager.handle_dst_bar_time(timestamp, 5, 2)
+        clock.set(bar_time)
+    ```
+
+See Also:
+    - `realtime_data_manager.data_processing.DataProcessingMixin`
+    - `realtime_data_manager.dst_handling.DSTHandlingMixin`
+"""
+
+from datetime import datetime
+
+
+class BarClock:
+    """Current bar time and next boundary of one timeframe."""
+
+    __slots__ = ("bar_time", "end", "interval", "start", "unit")
+
+    def __init__(self, interval: int, unit: int) -> None:
+        self.interval = interval
+        self.unit = unit
+        self.bar_time: datetime | None = None
+        # Empty window until the first bar time is set
+        self.start = 0.0
+        self.end = 0.0
+
+    def matches(self, interval: int, unit: int) -> bool:
+        """Whether this clock was built for the given timeframe settings."""
+        return self.interval == interval and self.unit == unit
+
+    def lookup(self, epoch: float) -> datetime | None:
+        """The cached bar time if ``epoch`` falls in the current bar, else None."""
+        if self.start <= epoch < self.end:
+            return self.bar_time
+        return None
+
+    def set(self, bar_time: datetime, cacheable: bool = True) -> None:
+        """
+        Make ``bar_time`` the current bar.
+
+        Args:
+            bar_time: Timezone-aware start of the bar
+            cacheable: False to keep the window empty, so the next tick
+                recomputes its bar time (used during DST transitions)
+        """
+        self.bar_time = bar_time
+        self.start = bar_time.timestamp()
+        self.end = self.next_boundary(bar_time) if cacheable else self.start
+
+    def next_boundary(self, bar_time: datetime) -> float:
+        """
+        Epoch seconds at which the bar after ``bar_time`` starts.
+
+        Raises:
+            ValueError: For units ``_calculate_bar_time`` does not support
+        """
+        start = bar_time.timestamp()
+        if self.unit == 1:  # Seconds, floored within the minute
+            top = bar_time.replace(second=0, microsecond=0).timestamp() + 60
+            return min(start + self.interval, top)
+        if self.unit == 2:  # Minutes, floored within the hour
+            top = bar_time.replace(minute=0, second=0, microsecond=0).timestamp()
+            return min(start + self.interval * 60, top + 3600)
+        raise ValueError(f"Unsupported time unit: {self.unit}")
@@ -0,0 +1,143 @@
+"""
+Fetch-once-and-resample planning for the historical bootstrap.
+
+Author: @TexasCoding
+Date: 2025-10-18
+
+Overview:
+    ``RealtimeDataManager.initialize()`` used to request history once per
+    timeframe, although every request covers the same instrument and date
+    range. The finest timeframe holds everything the coarser ones need, so
+    it is fetched once (in parallel chunks when it exceeds the per-request
+    bar limit) and the others are resampled from it locally.
+
+    A timeframe is derived only when the result matches the server's bars:
+    its length is a whole multiple of the fetched bars and divides an hour,
+    so its windows start on the same clock boundaries (``:00``, ``:05``,
+    ...) in any whole-hour time zone. ``4hr`` bars, whose alignment is set
+    by the server, and day, week and month bars, which follow the trading
+    session and can be longer than the fetched window, are fetched directly.
+
+Key Features:
+    - One history request for all derivable timeframes
+    - Chunked, concurrent fetch of the base timeframe for long windows
+    - Resampling with ``group_by_dynamic``; a partial first bar is dropped
+
+Example Usage:
+    ```python
+    base, derived, direct = plan_bootstrap(manager.timeframes)
+    bars = await client.get_bars("MNQ", interval=1, unit=2, days=5)
+    five_minute = resample_bars(bars, bar_seconds(manager.timeframes["5min"]))
+    ```
+
+See Also:
+    - `realtime_data_manager.core.RealtimeDataManager`
+"""
+
+from datetime import datetime, timedelta
+from typing import Any
+
+import polars as pl
+
+# Bars the history endpoint returns per request
+MAX_BARS_PER_REQUEST = 20000
+
+_UNIT_SECONDS = {1: 1, 2: 60}  # Seconds, minutes
+
+
+def bar_seconds(tf_config: dict[str, Any]) -> int | None:
+    """Length of a timeframe's bars in seconds, or None for day and longer units."""
+    unit_seconds = _UNIT_SECONDS.get(tf_config["unit"])
+    if unit_seconds is None:
+        return None
+    return int(tf_config["interval"]) * unit_seconds
+
+
+def plan_bootstrap(
+    timeframes: dict[str, dict[str, Any]],
+) -> tuple[str | None, list[str], list[str]]:
+    """
+    Split timeframes into the one to fetch, those to derive from it, and the rest.
+
+    Args:
+        timeframes: Timeframe configs keyed by timeframe (``interval`` and ``unit``)
+
+    Returns:
+        tuple: (base timeframe or None, timeframes derived from the base,
+            timeframes fetched directly)
+    """
+    lengths = {tf: bar_seconds(config) for tf, config in timeframes.items()}
+    intraday = {tf: seconds for tf, seconds in lengths.items() if seconds}
+    if not intraday:
+        return None, [], list(timeframes)
+
+    base = min(intraday, key=lambda tf: intraday[tf])
+    base_seconds = intraday[base]
+    derived: list[str] = []
+    direct: list[str] = []
+    for tf, seconds in lengths.items():
+        if tf == base:
+            continue
+        if seconds and seconds % base_seconds == 0 and 3600 % seconds == 0:
+            derived.append(tf)
+        else:
+            direct.append(tf)
+    return base, derived, direct
+
+
+def resample_bars(bars: pl.DataFrame, seconds: int) -> pl.DataFrame:
+    """
+    Aggregate OHLCV bars into bars of ``seconds`` length.
+
+    Windows start on multiples of ``seconds`` (clock-aligned). The first window
+    is dropped when the input does not start at its beginning, as it would
+    only hold part of the bar.
+
+    Args:
+        bars: OHLCV bars sorted by timestamp
+        seconds: Target bar length; a multiple of the input bar length
+
+    Returns:
+        pl.DataFrame: Resampled OHLCV bars with the input's dtypes
+    """
+    if bars.is_empty():
+        return bars
+    resampled = (
+        bars.sort("timestamp")
+        .group_by_dynamic("timestamp", every=f"{seconds}s", closed="left", label="left")
+        .agg(
+            pl.col("open").first(),
+            pl.col("high").max(),
+            pl.col("low").min(),
+            pl.col("close").last(),
+            pl.col("volume").sum(),
+        )
+    )
+    if resampled["timestamp"][0] != bars["timestamp"].min():
+        resampled = resampled.slice(1)
+    return resampled.cast({column: bars.schema[column] for column in resampled.columns})
+
+
+def chunk_ranges(
+    start: datetime, end: datetime, seconds: int, max_bars: int = MAX_BARS_PER_REQUEST
+) -> list[tuple[datetime, datetime]]:
+    """
+    Split ``[start, end)`` into ranges of at most ``max_bars`` bars each.
+
+    Inner boundaries fall on multiples of the bar length, so no request ends
+    inside a bar and the chunks join without partial bars.
+    """
+    span = timedelta(seconds=seconds * max_bars)
+    if end - start <= span:
+        return [(start, end)]
+    ranges = []
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = chunk_start + span
+        # Round the boundary down to a bar boundary
+        chunk_end -= timedelta(seconds=chunk_end.timestamp() % seconds)
+        if chunk_end <= chunk_start or chunk_end >= end:
+            chunk_end = end
+        ranges.append((chunk_start, chunk_end))
+        chunk_start = chunk_end
+    return ranges
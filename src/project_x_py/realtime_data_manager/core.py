@@ -107,6 +107,7 @@ See Also:
     - `realtime_data_manager.callbacks.CallbackMixin`
     - `realtime_data_manager.data_access.DataAccessMixin`
     - `realtime_data_manager.data_processing.DataProcessingMixin`
+    - `realtime_data_manager.journal.TickJournalMixin`
     - `realtime_data_manager.memory_management.MemoryManagementMixin`
     - `realtime_data_manager.validation.ValidationMixin`
 """
@@ -115,7 +116,7 @@ import asyncio
 import contextlib
 import time
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
@@ -128,6 +129,14 @@ from project_x_py.exceptions import (
     ProjectXInstrumentError,
 )
 from project_x_py.models import Instrument
+from project_x_py.realtime_data_manager.bar_buffer import BarStore
+from project_x_py.realtime_data_manager.bootstrap import (
+    MAX_BARS_PER_REQUEST,
+    bar_seconds,
+    chunk_ranges,
+    plan_bootstrap,
+    resample_bars,
+)
 from project_x_py.realtime_data_manager.callbacks import CallbackMixin
 from project_x_py.realtime_data_manager.data_access import DataAccessMixin
 from project_x_py.realtime_data_manager.data_processing import DataProcessingMixin
@@ -136,6 +145,7 @@ from project_x_py.realtime_data_manager.dst_handling import DSTHandlingMixin
 from project_x_py.realtime_data_manager.dynamic_resource_limits import (
     DynamicResourceMixin,
 )
+from project_x_py.realtime_data_manager.journal import TickJournalMixin
 from project_x_py.realtime_data_manager.memory_management import MemoryManagementMixin
 from project_x_py.realtime_data_manager.mmap_overflow import MMapOverflowMixin
 from project_x_py.realtime_data_manager.validation import (
@@ -183,6 +193,7 @@ class RealtimeDataManager(
     MemoryManagementMixin,
     DynamicResourceMixin,
     MMapOverflowMixin,
+    TickJournalMixin,
     CallbackMixin,
     DataAccessMixin,
     LazyDataFrameMixin,
@@ -421,8 +432,8 @@ class RealtimeDataManager(
         # Initialize timeframes needed by mixins
         self.timeframes: dict[str, dict[str, Any]] = {}
 
-        # Initialize data storage
-        self.data: dict[str, pl.DataFrame] = {}
+        # Initialize data storage (dict-compatible, array-backed; see bar_buffer.py)
+        self.data = BarStore()
 
         # Apply defaults which sets max_bars_per_timeframe etc.
         self._apply_config_defaults()
@@ -580,6 +591,9 @@ class RealtimeDataManager(
         # Background bar timer task for low-volume periods
         self._bar_timer_task: asyncio.Task[None] | None = None
 
+        # Optional journal of processed ticks for replay
+        self._init_tick_journal()
+
         # Initialize dynamic resource management
         self._enable_dynamic_limits = (
             config.get("enable_dynamic_limits", True) if config else True
@@ -766,6 +780,11 @@ class RealtimeDataManager(
         into memory for each timeframe. This provides a baseline of data before real-time
         updates begin.
 
+        History is fetched once, for the finest timeframe, and the coarser timeframes
+        are resampled from it locally (see ``bootstrap.py``). Only timeframes that
+        cannot be derived with the server's alignment (``4hr``, day, week, month) are
+        requested separately, concurrently with the base fetch.
+
         Args:
             initial_days: Number of days of historical data to load (default: 1).
                 Higher values provide more historical context but consume more memory.
@@ -860,12 +879,10 @@ class RealtimeDataManager(
             # Handle both Lock and AsyncRWLock types
             if isinstance(self.data_lock, AsyncRWLock):
                 async with self.data_lock.write_lock():
-                    for tf_key, tf_config in self.timeframes.items():
-                        await self._load_timeframe_data(tf_key, tf_config, initial_days)
+                    await self._load_all_timeframes(initial_days)
             else:
                 async with self.data_lock:
-                    for tf_key, tf_config in self.timeframes.items():
-                        await self._load_timeframe_data(tf_key, tf_config, initial_days)
+                    await self._load_all_timeframes(initial_days)
 
         # Update statistics for successful initialization
         await self.set_status("initialized")
@@ -892,10 +909,46 @@ class RealtimeDataManager(
         )
         return True
 
-    async def _load_timeframe_data(
-        self, tf_key: str, tf_config: dict[str, Any], initial_days: int
-    ) -> None:
-        """Load data for a specific timeframe."""
+    async def _load_all_timeframes(self, initial_days: int) -> None:
+        """
+        Load history for every timeframe with as few requests as possible.
+
+        The finest timeframe is fetched once and the timeframes derivable from it are
+        resampled locally; the others are fetched directly, concurrently with it.
+        """
+        base, derived, direct = plan_bootstrap(self.timeframes)
+
+        direct_loads = [
+            self._load_timeframe_data(tf_key, self.timeframes[tf_key], initial_days)
+            for tf_key in direct
+        ]
+        if base is None:
+            await asyncio.gather(*direct_loads)
+            return
+
+        base_bars, *_ = await asyncio.gather(
+            self._fetch_bars(self.timeframes[base], initial_days), *direct_loads
+        )
+        self._store_timeframe_data(base, base_bars)
+        for tf_key in derived:
+            seconds = bar_seconds(self.timeframes[tf_key])
+            assert seconds is not None
+            self._store_timeframe_data(
+                tf_key,
+                resample_bars(base_bars, seconds) if base_bars is not None else None,
+            )
+        if derived:
+            self.logger.debug(
+                f"Derived {derived} from {base} history",
+                extra={"timeframe": base, "derived": derived},
+            )
+
+    async def _fetch_bars(
+        self, tf_config: dict[str, Any], initial_days: int
+    ) -> pl.DataFrame | None:
+        """
+        Fetch history for one timeframe, in concurrent chunks past the request limit.
+        """
         if self.project_x is None:
             raise ProjectXError(
                 format_error_message(
@@ -903,13 +956,50 @@ class RealtimeDataManager(
                     reason="ProjectX client not initialized",
                 )
             )
-        bars = await self.project_x.get_bars(
-            self.instrument,  # Use base symbol, not contract ID
-            interval=tf_config["interval"],
-            unit=tf_config["unit"],
-            days=initial_days,
+        seconds = bar_seconds(tf_config)
+        if seconds is None or initial_days * 86400 <= seconds * MAX_BARS_PER_REQUEST:
+            return await self.project_x.get_bars(
+                self.instrument,  # Use base symbol, not contract ID
+                interval=tf_config["interval"],
+                unit=tf_config["unit"],
+                days=initial_days,
+            )
+
+        end = datetime.now(self.timezone)
+        ranges = chunk_ranges(end - timedelta(days=initial_days), end, seconds)
+        chunks = await asyncio.gather(
+            *(
+                self.project_x.get_bars(
+                    self.instrument,
+                    interval=tf_config["interval"],
+                    unit=tf_config["unit"],
+                    start_time=chunk_start,
+                    end_time=chunk_end,
+                )
+                for chunk_start, chunk_end in ranges
+            )
         )
+        frames = [
+            chunk for chunk in chunks if chunk is not None and not chunk.is_empty()
+        ]
+        if not frames:
+            return None
+        # Adjacent chunks may both return the bar on their shared boundary
+        return (
+            pl.concat(frames, how="vertical_relaxed")
+            .unique(subset="timestamp", keep="last", maintain_order=True)
+            .sort("timestamp")
+        )
+
+    async def _load_timeframe_data(
+        self, tf_key: str, tf_config: dict[str, Any], initial_days: int
+    ) -> None:
+        """Load data for a specific timeframe."""
+        bars = await self._fetch_bars(tf_config, initial_days)
+        self._store_timeframe_data(tf_key, bars)
 
+    def _store_timeframe_data(self, tf_key: str, bars: pl.DataFrame | None) -> None:
+        """Store loaded history for a timeframe and warn if it ends long ago."""
         if bars is not None and not bars.is_empty():
             self.data[tf_key] = bars
             # Store the last bar time for proper sync with real-time data
@@ -1076,6 +1166,9 @@ class RealtimeDataManager(
             # Start bar timer task for low-volume periods
             self._start_bar_timer_task()
 
+            # Start periodic tick journal writes if enabled
+            await self._start_tick_journal()
+
             # Start dynamic resource monitoring if enabled
             if self._enable_dynamic_limits:
                 self.start_resource_monitoring()
@@ -1102,6 +1195,7 @@ class RealtimeDataManager(
             # Cancel background tasks first
             await self.stop_cleanup_task()
             await self._stop_bar_timer_task()
+            await self._flush_tick_journal()
 
             # Stop dynamic resource monitoring if enabled
             if self._enable_dynamic_limits:
@@ -1134,6 +1228,7 @@ class RealtimeDataManager(
             >>> await manager.cleanup()
         """
         await self.stop_realtime_feed()
+        await self._close_tick_journal()
 
         # Cleanup bounded statistics if enabled
         if self.use_bounded_statistics:
@@ -1256,14 +1351,12 @@ class RealtimeDataManager(
                         if tf_key not in self.data:
                             continue
 
-                        current_data = self.data[tf_key]
-                        if current_data.height == 0:
+                        bars = self.data.buffer(tf_key)
+                        if bars is None or bars.forming is None:
                             continue
 
                         # Get the last bar time
-                        last_bar_time = (
-                            current_data.select(pl.col("timestamp")).tail(1).item()
-                        )
+                        last_bar_time = bars.forming.timestamp
 
                         try:
                             # Calculate what the current bar time should be
@@ -1279,9 +1372,7 @@ class RealtimeDataManager(
                         # If we're missing bars, create empty ones
                         if expected_bar_time > last_bar_time:
                             # Get the last close price to use for empty bars
-                            last_close = (
-                                current_data.select(pl.col("close")).tail(1).item()
-                            )
+                            last_close = bars.forming.close
 
                             # Import here to avoid circular import
                             from project_x_py.order_manager.utils import (
@@ -1294,19 +1385,7 @@ class RealtimeDataManager(
                             )
 
                             # Create empty bar with last close as OHLC, volume=0
-                            # Using DataFrame constructor is efficient for single rows
-                            new_bar = pl.DataFrame(
-                                {
-                                    "timestamp": [expected_bar_time],
-                                    "open": [aligned_close],
-                                    "high": [aligned_close],
-                                    "low": [aligned_close],
-                                    "close": [aligned_close],
-                                    "volume": [0],  # Zero volume for empty bars
-                                }
-                            )
-
-                            self.data[tf_key] = pl.concat([current_data, new_bar])
+                            new_bar = bars.open_bar(expected_bar_time, aligned_close, 0)
                             self.last_bar_times[tf_key] = expected_bar_time
 
                             self.logger.debug(
@@ -1319,7 +1398,7 @@ class RealtimeDataManager(
                                 {
                                     "timeframe": tf_key,
                                     "bar_time": expected_bar_time,
-                                    "data": new_bar.to_dicts()[0],
+                                    "data": new_bar.to_dict(),
                                 }
                             )
             else:
@@ -1329,14 +1408,12 @@ class RealtimeDataManager(
                         if tf_key not in self.data:
                             continue
 
-                        current_data = self.data[tf_key]
-                        if current_data.height == 0:
+                        bars = self.data.buffer(tf_key)
+                        if bars is None or bars.forming is None:
                             continue
 
                         # Get the last bar time
-                        last_bar_time = (
-                            current_data.select(pl.col("timestamp")).tail(1).item()
-                        )
+                        last_bar_time = bars.forming.timestamp
 
                         try:
                             # Calculate what the current bar time should be
@@ -1352,9 +1429,7 @@ class RealtimeDataManager(
                         # If we're missing bars, create empty ones
                         if expected_bar_time > last_bar_time:
                             # Get the last close price to use for empty bars
-                            last_close = (
-                                current_data.select(pl.col("close")).tail(1).item()
-                            )
+                            last_close = bars.forming.close
 
                             # Import here to avoid circular import
                             from project_x_py.order_manager.utils import (
@@ -1367,19 +1442,7 @@ class RealtimeDataManager(
                             )
 
                             # Create empty bar with last close as OHLC, volume=0
-                            # Using DataFrame constructor is efficient for single rows
-                            new_bar = pl.DataFrame(
-                                {
-                                    "timestamp": [expected_bar_time],
-                                    "open": [aligned_close],
-                                    "high": [aligned_close],
-                                    "low": [aligned_close],
-                                    "close": [aligned_close],
-                                    "volume": [0],  # Zero volume for empty bars
-                                }
-                            )
-
-                            self.data[tf_key] = pl.concat([current_data, new_bar])
+                            new_bar = bars.open_bar(expected_bar_time, aligned_close, 0)
                             self.last_bar_times[tf_key] = expected_bar_time
 
                             self.logger.debug(
@@ -1392,7 +1455,7 @@ class RealtimeDataManager(
                                 {
                                     "timeframe": tf_key,
                                     "bar_time": expected_bar_time,
-                                    "data": new_bar.to_dicts()[0],
+                                    "data": new_bar.to_dict(),
                                 }
                             )
 
@@ -1407,16 +1470,16 @@ class RealtimeDataManager(
             self.logger.error(f"Error checking/creating empty bars: {e}")
             # Don't re-raise - bar timer should continue even if one check fails
 
-    async def track_tick_processed(self) -> None:
-        """Track a tick being processed."""
+    async def track_tick_processed(self, count: int = 1) -> None:
+        """Track ticks being processed (``count`` for a batch)."""
         # Use bounded statistics if enabled, otherwise use base statistics
         if self.use_bounded_statistics:
-            await self.increment_bounded("ticks_processed", 1)
+            await self.increment_bounded("ticks_processed", count)
         else:
-            await self.increment("ticks_processed", 1)
+            await self.increment("ticks_processed", count)
 
         # Update legacy stats for backward compatibility
-        self.memory_stats["ticks_processed"] += 1
+        self.memory_stats["ticks_processed"] += count
 
     async def track_quote_processed(self) -> None:
         """Track a quote being processed."""
@@ -118,11 +118,12 @@ class DataAccessMixin:
 
     # Type stubs - these attributes are expected to be provided by the class using this mixin
     if TYPE_CHECKING:
+        from project_x_py.realtime_data_manager.bar_buffer import BarStore
         from project_x_py.utils.lock_optimization import AsyncRWLock
 
         data_lock: "asyncio.Lock | AsyncRWLock"
         data_rw_lock: "AsyncRWLock"
-        data: dict[str, pl.DataFrame]
+        data: "BarStore"
         current_tick_data: list[dict[str, Any]] | deque[dict[str, Any]]
         tick_size: float
         timezone: "BaseTzInfo"
@@ -410,12 +410,13 @@ class LazyDataFrameMixin:
 
     # Type hints for mypy - these attributes are provided by the main class
     if TYPE_CHECKING:
+        from project_x_py.realtime_data_manager.bar_buffer import BarStore
         from project_x_py.utils.lock_optimization import AsyncRWLock
 
         logger: logging.Logger
         data_lock: Lock
         data_rw_lock: AsyncRWLock
-        data: dict[str, pl.DataFrame]
+        data: "BarStore"
         timezone: Any
 
         # Optional attributes from other mixins
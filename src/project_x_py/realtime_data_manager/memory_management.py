@@ -106,6 +106,8 @@ import polars as pl
 if TYPE_CHECKING:
     from asyncio import Lock
 
+    from project_x_py.realtime_data_manager.bar_buffer import BarStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -142,7 +144,7 @@ class MemoryManagementMixin(TaskManagerMixin):
         cleanup_interval: float
         data_lock: Lock
         timeframes: dict[str, dict[str, Any]]
-        data: dict[str, pl.DataFrame]
+        data: "BarStore"
         max_bars_per_timeframe: int
         current_tick_data: list[dict[str, Any]] | deque[dict[str, Any]]
         tick_buffer_size: int
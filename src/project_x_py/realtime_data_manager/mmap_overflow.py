@@ -19,6 +19,7 @@ from project_x_py.utils import ProjectXLogger
 if TYPE_CHECKING:
     from asyncio import Lock
 
+    from project_x_py.realtime_data_manager.bar_buffer import BarStore
     from project_x_py.utils.lock_optimization import AsyncRWLock
 
 logger = ProjectXLogger.get_logger(__name__)
@@ -34,7 +35,7 @@ class MMapOverflowMixin:
 
     # Type hints for attributes provided by the main class
     if TYPE_CHECKING:
-        data: dict[str, pl.DataFrame]
+        data: "BarStore"
         max_bars_per_timeframe: int
         memory_stats: dict[str, Any]
         instrument: str
@@ -175,6 +175,11 @@ class DataManagerConfig(TypedDict):
     enable_dynamic_limits: NotRequired[bool]
     resource_config: NotRequired[dict[str, Any]]
 
+    # Tick journal for replay
+    enable_tick_journal: NotRequired[bool]
+    tick_journal_path: NotRequired[str]
+    tick_journal_segment_minutes: NotRequired[int]
+
 
 class OrderbookConfig(TypedDict):
     """Configuration for OrderBook component."""
@@ -119,6 +119,7 @@ if TYPE_CHECKING:
     )
     from project_x_py.order_manager import OrderManager
     from project_x_py.realtime import ProjectXRealtimeClient
+    from project_x_py.realtime_data_manager.bar_buffer import BarStore
     from project_x_py.utils.async_rate_limiter import RateLimiter
 
 
@@ -496,7 +497,7 @@ class RealtimeDataManagerProtocol(Protocol):
     timeframes: dict[str, dict[str, Any]]
 
     # Data storage
-    data: dict[str, pl.DataFrame]
+    data: "BarStore"
     current_tick_data: Any  # Can be list or deque
     last_bar_times: dict[str, datetime.datetime]
 
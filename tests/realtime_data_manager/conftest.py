@@ -5,15 +5,20 @@ Provides common mocks and fixtures used across multiple test files.
 Follows the proven testing patterns from other successful modules.
 """
 
+import asyncio
+from collections import deque
 from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import polars as pl
 import pytest
+import pytz
 
 from project_x_py.event_bus import EventBus
 from project_x_py.models import Instrument
+from project_x_py.realtime_data_manager.data_processing import DataProcessingMixin
+from project_x_py.realtime_data_manager.journal import TickJournalMixin
 from project_x_py.types.config_types import DataManagerConfig
 
 
@@ -200,6 +205,65 @@ async def running_manager(initialized_manager):
         pass  # Ignore cleanup errors in tests
 
 
+class CountingLock:
+    """asyncio.Lock that counts acquisitions."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self.acquisitions = 0
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        self.acquisitions += 1
+
+    async def __aexit__(self, *exc):
+        self._lock.release()
+
+
+class StubDataManager(DataProcessingMixin, TickJournalMixin):
+    """
+    Tick processing and journal mixins over plain attributes, without the
+    client, feed or other mixins of RealtimeDataManager. Callbacks are recorded
+    in ``callbacks`` and ``data_lock`` counts its acquisitions.
+    """
+
+    def __init__(self, timeframes, tz=None, config=None):
+        super().__init__()
+        self.config = config or {}
+        self.instrument = "MNQ"
+        self.tick_size = 0.25
+        self.timezone = tz or pytz.timezone("America/Chicago")
+        self.logger = Mock()
+        self.data_lock = CountingLock()
+        self.current_tick_data = deque(maxlen=10000)
+        self.timeframes = timeframes
+        self.data = {tf: pl.DataFrame() for tf in timeframes}
+        self.last_bar_times = {}
+        self.memory_stats = {"ticks_processed": 0}
+        self.is_running = True
+        self._min_update_interval = 0
+        self.callbacks = []
+        self._init_tick_journal()
+
+    def _parse_and_validate_trade_payload(self, data):
+        return data
+
+    def _symbol_matches_instrument(self, symbol):
+        return True
+
+    async def _trigger_callbacks(self, event_type, data):
+        self.callbacks.append((event_type, data))
+
+    async def _cleanup_old_data(self):
+        pass
+
+
+@pytest.fixture
+def make_manager():
+    """Factory for StubDataManager: make_manager(timeframes, tz=None, config=None)."""
+    return StubDataManager
+
+
 # Assertion helpers for common test patterns
 def assert_valid_ohlcv_data(dataframe):
     """Assert that DataFrame contains valid OHLCV data structure."""
@@ -0,0 +1,261 @@
+"""
+Tests for realtime_data_manager.bar_buffer.
+
+Test Coverage Goals:
+- Loading a history frame and reading it back unchanged
+- O(1) forming-bar updates and bar closes into the column buffers
+- Frames handed out are never changed by later ticks
+- Checkpoint and restore for the atomic update path
+- Timestamp dtypes (time zone, naive, time unit) and extra columns
+- Dict compatibility of BarStore
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import polars as pl
+import pytest
+
+from project_x_py.realtime_data_manager.bar_buffer import BarBuffer, BarStore
+
+START = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def bars(n, start=START):
+    return pl.DataFrame(
+        {
+            "timestamp": [start + timedelta(minutes=i) for i in range(n)],
+            "open": [100.0 + i for i in range(n)],
+            "high": [101.0 + i for i in range(n)],
+            "low": [99.0 + i for i in range(n)],
+            "close": [100.5 + i for i in range(n)],
+            "volume": [10 * (i + 1) for i in range(n)],
+        }
+    )
+
+
+class TestBarBuffer:
+    def test_history_reads_back_unchanged(self):
+        history = bars(5)
+        buffer = BarBuffer(history)
+
+        assert buffer.height == 5
+        assert buffer.frame().equals(history)
+        assert buffer.last_time == START + timedelta(minutes=4)
+
+    def test_update_forming_changes_only_last_bar(self):
+        buffer = BarBuffer(bars(3))
+
+        buffer.update_forming(110.0, 5)
+        buffer.update_forming(95.0, 2)
+        buffer.update_forming(100.25, 1)
+
+        df = buffer.frame()
+        assert df.height == 3
+        assert df.head(2).equals(bars(3).head(2))
+        last = df.row(2, named=True)
+        assert last["open"] == 102.0
+        assert last["high"] == 110.0
+        assert last["low"] == 95.0
+        assert last["close"] == 100.25
+        assert last["volume"] == 30 + 8
+
+    def test_open_bar_appends_forming_bar(self):
+        buffer = BarBuffer(bars(2))
+        new_time = START + timedelta(minutes=2)
+
+        new_bar = buffer.open_bar(new_time, 105.0, 3)
+        buffer.update_forming(106.0, 4)
+
+        assert new_bar.to_dict() == {
+            "timestamp": new_time,
+            "open": 105.0,
+            "high": 106.0,
+            "low": 105.0,
+            "close": 106.0,
+            "volume": 7,
+        }
+        df = buffer.frame()
+        assert df.height == 3
+        assert df["timestamp"].to_list() == [
+            START + timedelta(minutes=i) for i in range(3)
+        ]
+        assert df["close"].to_list() == [100.5, 101.5, 106.0]
+        assert df.schema == bars(1).schema
+
+    def test_many_bars_grow_column_buffers(self):
+        buffer = BarBuffer(capacity=4)
+        for i in range(50):
+            buffer.open_bar(START + timedelta(minutes=i), 100.0 + i, i)
+
+        df = buffer.frame()
+        assert df.height == 50
+        assert df["open"].to_list() == [100.0 + i for i in range(50)]
+        assert df["volume"].to_list() == list(range(50))
+
+    def test_handed_out_frames_are_not_changed_by_later_ticks(self):
+        buffer = BarBuffer(bars(2))
+        buffer.open_bar(START + timedelta(minutes=2), 105.0, 1)
+        before = buffer.frame()
+        snapshot = before.clone()
+
+        buffer.update_forming(120.0, 9)
+        for i in range(3, 2000):
+            buffer.open_bar(START + timedelta(minutes=i), 90.0, 1)
+
+        assert before.equals(snapshot)
+        assert buffer.frame().height == 2000
+
+    def test_frame_is_cached_until_change(self):
+        buffer = BarBuffer(bars(3))
+
+        assert buffer.frame() is buffer.frame()
+        first = buffer.frame()
+        buffer.update_forming(101.0, 1)
+        assert buffer.frame() is not first
+
+    def test_checkpoint_and_restore(self):
+        buffer = BarBuffer(bars(3))
+        original = buffer.frame().clone()
+        checkpoint = buffer.checkpoint()
+
+        buffer.update_forming(150.0, 100)
+        buffer.open_bar(START + timedelta(minutes=3), 151.0, 1)
+        viewed = buffer.frame().clone()
+        handed_out = buffer.frame()
+        buffer.restore(checkpoint)
+
+        assert buffer.frame().equals(original)
+        # A later bar reuses the slot, but the frame handed out before is untouched
+        buffer.open_bar(START + timedelta(minutes=3), 90.0, 1)
+        assert handed_out.equals(viewed)
+
+    def test_empty_buffer_infers_dtype_from_first_bar(self):
+        buffer = BarBuffer(pl.DataFrame())
+        assert buffer.is_empty()
+        assert buffer.frame().is_empty()
+
+        buffer.open_bar(START, 100.0, 0)
+
+        expected = pl.DataFrame(
+            {
+                "timestamp": [START],
+                "open": [100.0],
+                "high": [100.0],
+                "low": [100.0],
+                "close": [100.0],
+                "volume": [0],
+            }
+        )
+        assert buffer.frame().equals(expected)
+
+    @pytest.mark.parametrize(
+        "dtype",
+        [
+            pl.Datetime("us", "America/Chicago"),
+            pl.Datetime("ns", "UTC"),
+            pl.Datetime("ms", "UTC"),
+            pl.Datetime("us"),
+        ],
+    )
+    def test_timestamp_dtypes_are_preserved(self, dtype):
+        history = (
+            bars(2)
+            .with_columns(
+                pl.col("timestamp").dt.replace_time_zone(None)
+                if dtype.time_zone is None
+                else pl.col("timestamp").dt.convert_time_zone(dtype.time_zone)
+            )
+            .with_columns(pl.col("timestamp").cast(dtype))
+        )
+        buffer = BarBuffer(history)
+        next_time = START + timedelta(minutes=2)
+        if dtype.time_zone is None:
+            next_time = next_time.replace(tzinfo=None)
+
+        buffer.open_bar(next_time, 1.0, 1)
+        buffer.open_bar(next_time + timedelta(minutes=1), 2.0, 1)
+
+        df = buffer.frame()
+        assert df.schema["timestamp"] == dtype
+        expected = history["timestamp"].to_list() + [
+            next_time,
+            next_time + timedelta(minutes=1),
+        ]
+        assert df["timestamp"].to_list() == expected
+
+    def test_extra_columns_are_kept(self):
+        history = bars(2).with_columns(pl.lit("x").alias("tag"))
+        buffer = BarBuffer(history)
+
+        buffer.update_forming(120.0, 1)
+        buffer.open_bar(START + timedelta(minutes=2), 121.0, 1)
+
+        df = buffer.frame()
+        assert df.columns == history.columns
+        assert df["tag"].to_list() == ["x", "x", None]
+        assert df["high"].to_list()[1] == 120.0
+
+    def test_restore_undoes_folding_extra_columns(self):
+        history = bars(3).with_columns(pl.lit("x").alias("tag"))
+        buffer = BarBuffer(history)
+        checkpoint = buffer.checkpoint()
+
+        # The first bar close folds the loaded last row into the history
+        buffer.open_bar(START + timedelta(minutes=3), 121.0, 1)
+        buffer.restore(checkpoint)
+
+        assert buffer.frame().equals(history)
+        buffer.open_bar(START + timedelta(minutes=3), 122.0, 1)
+        df = buffer.frame()
+        assert df.height == 4
+        assert df["timestamp"].is_unique().all()
+        assert df["tag"].to_list() == ["x", "x", "x", None]
+
+    def test_frame_without_ohlcv_columns_is_read_only(self):
+        frame = pl.DataFrame({"timestamp": [START], "close": [1.0]})
+        buffer = BarBuffer(frame)
+
+        assert buffer.frame().equals(frame)
+        with pytest.raises(ValueError):
+            buffer.open_bar(START + timedelta(minutes=1), 1.0, 1)
+
+
+class TestBarStore:
+    def test_behaves_like_a_dict_of_frames(self):
+        store = BarStore({"1min": bars(3)})
+        store["5min"] = bars(2)
+
+        assert "1min" in store
+        assert set(store) == {"1min", "5min"}
+        assert len(store) == 2
+        assert store["5min"].equals(bars(2))
+        assert store.get("missing") is None
+        assert {tf: df.height for tf, df in store.items()} == {"1min": 3, "5min": 2}
+
+        del store["1min"]
+        assert "1min" not in store
+        store.clear()
+        assert len(store) == 0
+
+    def test_assignment_replaces_buffer(self):
+        store = BarStore({"1min": bars(3)})
+        store.buffer("1min").open_bar(START + timedelta(minutes=3), 1.0, 1)
+
+        store["1min"] = store["1min"].tail(2)
+
+        assert store["1min"].height == 2
+        assert store.buffer("1min").last_time == START + timedelta(minutes=3)
+
+    def test_manager_data_assignment_uses_store(self):
+        from project_x_py.realtime_data_manager.data_processing import (
+            DataProcessingMixin,
+        )
+
+        class Manager(DataProcessingMixin):
+            pass
+
+        manager = Manager()
+        manager.data = {"1min": bars(2)}
+
+        assert isinstance(manager.data, BarStore)
+        assert manager.data["1min"].equals(bars(2))
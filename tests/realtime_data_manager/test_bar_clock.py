@@ -0,0 +1,160 @@
+"""
+Tests for single-pass multi-timeframe tick aggregation.
+
+Test Coverage Goals:
+- BarClock windows give the same bar times as _calculate_bar_time
+- Bar times are only recalculated when a tick crosses a boundary
+- One data-lock acquisition per tick for all timeframes
+- A failing timeframe is rolled back without affecting the others
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock, patch
+
+import polars as pl
+import pytest
+import pytz
+
+from project_x_py.realtime_data_manager.bar_clock import BarClock
+from project_x_py.realtime_data_manager.data_processing import DataProcessingMixin
+
+TIMEFRAMES = {
+    "1sec": {"interval": 1, "unit": 1},
+    "15sec": {"interval": 15, "unit": 1},
+    "1min": {"interval": 1, "unit": 2},
+    "5min": {"interval": 5, "unit": 2},
+    "7min": {"interval": 7, "unit": 2},
+    "1hr": {"interval": 60, "unit": 2},
+    "4hr": {"interval": 240, "unit": 2},
+}
+
+
+def ticks(start, count, step):
+    return [
+        {"timestamp": start + i * step, "price": 100.0 + (i % 7) * 0.25, "volume": 1}
+        for i in range(count)
+    ]
+
+
+class TestBarClock:
+    @pytest.mark.parametrize("tf", list(TIMEFRAMES))
+    def test_window_matches_calculate_bar_time(self, tf, make_manager):
+        manager = make_manager(TIMEFRAMES)
+        interval = TIMEFRAMES[tf]["interval"]
+        unit = TIMEFRAMES[tf]["unit"]
+        clock = BarClock(interval, unit)
+        start = manager.timezone.localize(datetime(2025, 3, 4, 8, 58, 1))
+
+        for i in range(3000):
+            timestamp = start + timedelta(seconds=i * 1.7)
+            expected = manager._calculate_bar_time(timestamp, interval, unit)
+            cached = clock.lookup(timestamp.timestamp())
+            if cached is None:
+                clock.set(expected)
+            else:
+                assert cached == expected, timestamp
+
+    def test_uncacheable_window_is_empty(self):
+        clock = BarClock(1, 2)
+        bar_time = datetime(2025, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+        clock.set(bar_time, cacheable=False)
+
+        assert clock.lookup(bar_time.timestamp()) is None
+
+    def test_unsupported_unit(self):
+        clock = BarClock(1, 4)
+        with pytest.raises(ValueError):
+            clock.set(datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+
+class TestSinglePassAggregation:
+    @pytest.mark.asyncio
+    async def test_same_bars_as_per_timeframe_updates(self, make_manager):
+        single_pass = make_manager(TIMEFRAMES)
+        per_timeframe = make_manager(TIMEFRAMES)
+        start = datetime(2025, 3, 4, 14, 58, 30, tzinfo=timezone.utc)
+
+        for tick in ticks(start, 2000, timedelta(seconds=2.3)):
+            await single_pass._process_tick_data(tick)
+            # The legacy per-timeframe update is the reference
+            for tf in TIMEFRAMES:
+                await per_timeframe._update_timeframe_data(
+                    tf, tick["timestamp"], tick["price"], tick["volume"]
+                )
+
+        for tf in TIMEFRAMES:
+            assert single_pass.data[tf].equals(per_timeframe.data[tf]), tf
+        assert single_pass.last_bar_times == per_timeframe.last_bar_times
+
+    @pytest.mark.asyncio
+    async def test_one_lock_per_tick(self, make_manager):
+        manager = make_manager(TIMEFRAMES)
+        start = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+
+        for tick in ticks(start, 50, timedelta(seconds=1)):
+            await manager._process_tick_data(tick)
+
+        assert manager.data_lock.acquisitions == 50
+        assert len(manager.current_tick_data) == 50
+
+    @pytest.mark.asyncio
+    async def test_bar_time_recalculated_only_on_boundaries(self, make_manager):
+        manager = make_manager({"1min": {"interval": 1, "unit": 2}})
+        start = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+
+        with patch.object(
+            manager, "_bar_time_for", wraps=manager._bar_time_for
+        ) as bar_time_for:
+            # 5 minutes of ticks every 2 seconds
+            for tick in ticks(start, 150, timedelta(seconds=2)):
+                await manager._process_tick_data(tick)
+
+        assert bar_time_for.call_count == 5
+        assert manager.data["1min"].height == 5
+
+    @pytest.mark.asyncio
+    async def test_dst_adjusted_bar_times_are_not_cached(self, make_manager):
+        manager = make_manager({"1min": {"interval": 1, "unit": 2}})
+        manager.handle_dst_bar_time = Mock(
+            side_effect=lambda ts, interval, unit: (
+                manager._calculate_bar_time(ts, interval, unit) - timedelta(minutes=1)
+            )
+        )
+        start = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+
+        for tick in ticks(start, 10, timedelta(seconds=1)):
+            await manager._process_tick_data(tick)
+
+        assert manager.handle_dst_bar_time.call_count == 10
+
+    @pytest.mark.asyncio
+    async def test_failed_timeframe_is_rolled_back(self, make_manager):
+        manager = make_manager(
+            {"1min": {"interval": 1, "unit": 2}, "5min": {"interval": 5, "unit": 2}}
+        )
+        manager._handle_partial_failures = Mock(wraps=manager._handle_partial_failures)
+        start = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+        await manager._process_tick_data(ticks(start, 1, timedelta(0))[0])
+        before = manager.data["1min"].clone()
+
+        original = manager._apply_bar
+
+        async def failing(tf_key, bars, *args):
+            if tf_key == "1min":
+                bars.open_bar(start + timedelta(minutes=1), 1.0, 1)
+                raise RuntimeError("boom")
+            return await original(tf_key, bars, *args)
+
+        manager._apply_bar = failing
+        tick = {"timestamp": start + timedelta(minutes=1), "price": 101.0, "volume": 5}
+        await manager._process_tick_data(tick)
+
+        assert manager.data["1min"].equals(before)
+        assert manager.last_bar_times["1min"] == start
+        assert manager.data["5min"]["volume"].to_list() == [6]
+        failed, successful = manager._handle_partial_failures.call_args[0]
+        assert [tf for tf, _ in failed] == ["1min"]
+        assert successful == ["5min"]
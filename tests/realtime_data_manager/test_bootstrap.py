@@ -0,0 +1,194 @@
+"""
+Tests for the fetch-once-and-resample historical bootstrap.
+
+Test Coverage Goals:
+- Which timeframes are derived from the finest one and which are fetched
+- Resampled bars match clock-aligned server bars; partial first bars dropped
+- Chunked fetches for windows past the per-request bar limit
+- initialize() makes one request for all derivable timeframes
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import polars as pl
+import pytest
+import pytz
+
+from project_x_py.client.base import ProjectXBase
+from project_x_py.models import Instrument
+from project_x_py.realtime import ProjectXRealtimeClient
+from project_x_py.realtime_data_manager import RealtimeDataManager
+from project_x_py.realtime_data_manager.bootstrap import (
+    chunk_ranges,
+    plan_bootstrap,
+    resample_bars,
+)
+
+CHICAGO = pytz.timezone("America/Chicago")
+
+
+def minute_bars(start, count, step=timedelta(minutes=1)):
+    return pl.DataFrame(
+        {
+            "timestamp": [start + i * step for i in range(count)],
+            "open": [100.0 + i for i in range(count)],
+            "high": [100.5 + i + (i % 3) for i in range(count)],
+            "low": [99.5 + i - (i % 2) for i in range(count)],
+            "close": [100.25 + i for i in range(count)],
+            "volume": [10 + i for i in range(count)],
+        }
+    ).with_columns(pl.col("timestamp").dt.convert_time_zone("America/Chicago"))
+
+
+def timeframes(*keys):
+    table = {
+        "15sec": {"interval": 15, "unit": 1},
+        "1min": {"interval": 1, "unit": 2},
+        "5min": {"interval": 5, "unit": 2},
+        "7min": {"interval": 7, "unit": 2},
+        "15min": {"interval": 15, "unit": 2},
+        "1hr": {"interval": 60, "unit": 2},
+        "4hr": {"interval": 240, "unit": 2},
+        "1day": {"interval": 1, "unit": 4},
+    }
+    return {key: table[key] for key in keys}
+
+
+class TestPlanBootstrap:
+    def test_finest_timeframe_is_fetched(self):
+        base, derived, direct = plan_bootstrap(
+            timeframes("5min", "15sec", "1min", "1hr", "4hr", "1day")
+        )
+
+        assert base == "15sec"
+        assert derived == ["5min", "1min", "1hr"]
+        assert direct == ["4hr", "1day"]
+
+    def test_non_multiples_are_fetched(self):
+        base, derived, direct = plan_bootstrap(timeframes("5min", "7min", "15min"))
+
+        assert base == "5min"
+        assert derived == ["15min"]
+        assert direct == ["7min"]
+
+    def test_only_daily(self):
+        assert plan_bootstrap(timeframes("1day")) == (None, [], ["1day"])
+
+
+class TestResampleBars:
+    def test_matches_clock_aligned_bars(self):
+        start = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+        bars = minute_bars(start, 60)
+
+        five = resample_bars(bars, 300)
+
+        assert five.height == 12
+        assert five.schema == bars.schema
+        first = five.row(0, named=True)
+        assert first["timestamp"] == start
+        assert first["open"] == 100.0
+        assert first["high"] == bars.head(5)["high"].max()
+        assert first["low"] == bars.head(5)["low"].min()
+        assert first["close"] == bars["close"][4]
+        assert first["volume"] == bars.head(5)["volume"].sum()
+        minutes = [ts.minute for ts in five["timestamp"]]
+        assert minutes == list(range(0, 60, 5))
+
+    def test_partial_first_bar_is_dropped(self):
+        start = datetime(2025, 3, 4, 15, 3, tzinfo=timezone.utc)
+        bars = minute_bars(start, 12)
+
+        five = resample_bars(bars, 300)
+
+        assert five["timestamp"][0] == start + timedelta(minutes=2)
+        assert five.height == 2
+
+    def test_gaps_produce_no_empty_bars(self):
+        start = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+        bars = pl.concat(
+            [minute_bars(start, 5), minute_bars(start + timedelta(hours=1), 5)]
+        )
+
+        assert resample_bars(bars, 300).height == 2
+
+
+class TestChunkRanges:
+    def test_short_window_is_one_request(self):
+        end = datetime(2025, 3, 4, 15, 0, 7, tzinfo=timezone.utc)
+        start = end - timedelta(days=1)
+
+        assert chunk_ranges(start, end, 60) == [(start, end)]
+
+    def test_long_window_splits_on_bar_boundaries(self):
+        end = datetime(2025, 3, 4, 15, 0, 7, tzinfo=timezone.utc)
+        start = end - timedelta(days=2)
+
+        ranges = chunk_ranges(start, end, 1, max_bars=20000)
+
+        assert ranges[0][0] == start
+        assert ranges[-1][1] == end
+        for (_, a_end), (b_start, _) in zip(ranges, ranges[1:], strict=False):
+            assert a_end == b_start
+            assert a_end.microsecond == 0
+        assert all(b - a <= timedelta(seconds=20000) for a, b in ranges)
+        assert len(ranges) == 9
+
+
+def make_manager(tfs, get_bars):
+    project_x = AsyncMock(spec=ProjectXBase)
+    project_x.get_instrument.return_value = Instrument(
+        id="CON.F.US.MNQ.H25",
+        name="MNQ",
+        description="Micro E-mini Nasdaq-100",
+        tickSize=0.25,
+        tickValue=0.5,
+        activeContract=True,
+        symbolId="F.US.MNQ",
+    )
+    project_x.get_bars.side_effect = get_bars
+    manager = RealtimeDataManager(
+        "MNQ", project_x, Mock(spec=ProjectXRealtimeClient), timeframes=tfs
+    )
+    return manager, project_x
+
+
+class TestInitializeBootstrap:
+    @pytest.mark.asyncio
+    async def test_one_request_for_derivable_timeframes(self):
+        start = datetime(2025, 3, 4, 14, 0, tzinfo=timezone.utc)
+        base = minute_bars(start, 120)
+        daily = minute_bars(start, 2, step=timedelta(days=1))
+
+        async def get_bars(symbol, interval, unit, days, **kwargs):
+            return daily if unit == 4 else base
+
+        manager, project_x = make_manager(
+            ["1min", "5min", "15min", "1hr", "1day"], get_bars
+        )
+        assert await manager.initialize(initial_days=1)
+
+        requested = [call.kwargs["unit"] for call in project_x.get_bars.call_args_list]
+        assert sorted(requested) == [2, 4]
+        assert manager.data["1min"].equals(base)
+        assert manager.data["5min"].height == 24
+        assert manager.data["15min"].height == 8
+        assert manager.data["1hr"].height == 2
+        assert manager.data["1day"].equals(daily)
+        assert manager.last_bar_times["15min"] == start + timedelta(minutes=105)
+
+    @pytest.mark.asyncio
+    async def test_long_windows_are_fetched_in_chunks(self):
+        async def get_bars(symbol, interval, unit, start_time, end_time, **kwargs):
+            first = start_time + timedelta(seconds=(-start_time.timestamp()) % 15)
+            count = int((end_time - first).total_seconds() // 15) + 1
+            return minute_bars(first, count, step=timedelta(seconds=15))
+
+        manager, project_x = make_manager(["15sec", "1min"], get_bars)
+        assert await manager.initialize(initial_days=4)
+
+        assert project_x.get_bars.call_count == 2
+        bars = manager.data["15sec"]
+        assert bars["timestamp"].is_unique().all()
+        assert bars["timestamp"].is_sorted()
+        assert manager.data["1min"].height > 0
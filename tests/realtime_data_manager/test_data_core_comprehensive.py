@@ -239,8 +239,8 @@ class TestRealtimeDataManagerInitialize:
         assert all(tf in manager.data for tf in ["1min", "5min", "15min"])
         assert all(len(manager.data[tf]) == 1 for tf in ["1min", "5min", "15min"])
 
-        # Should have called get_bars for each timeframe
-        assert project_x.get_bars.call_count == 3
+        # Should fetch the finest timeframe once and derive the others from it
+        project_x.get_bars.assert_called_once_with("ES", interval=1, unit=2, days=10)
 
     @pytest.mark.asyncio
     async def test_initialize_instrument_not_found(self):
@@ -432,7 +432,7 @@ class TestDataProcessingMixinTickProcessing:
     async def test_process_tick_data_not_running_ignored(self, processor):
         """Test tick processing ignored when manager not running."""
         processor.is_running = False
-        processor._update_timeframe_data_atomic = AsyncMock()
+        processor._apply_bar = AsyncMock()
 
         tick = {
             "timestamp": datetime.now(timezone.utc),
@@ -443,7 +443,7 @@ class TestDataProcessingMixinTickProcessing:
         await processor._process_tick_data(tick)
 
         # Should not process any timeframes
-        processor._update_timeframe_data_atomic.assert_not_called()
+        processor._apply_bar.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_tick_data_rate_limiting(self, processor):
@@ -506,9 +506,7 @@ class TestDataProcessingMixinTickProcessing:
     @pytest.mark.asyncio
     async def test_process_tick_data_error_handling(self, processor):
         """Test error handling in tick processing."""
-        processor._update_timeframe_data_atomic = AsyncMock(
-            side_effect=Exception("Update error")
-        )
+        processor._apply_bar = AsyncMock(side_effect=Exception("Update error"))
         processor.track_error = AsyncMock()
         processor.record_timing = AsyncMock()
 
@@ -699,20 +697,6 @@ class TestDataProcessingMixinPerformanceAndSafety:
         proc.data["1min"] = pl.DataFrame()
         return proc
 
-    @pytest.mark.asyncio
-    async def test_fine_grained_locking_per_timeframe(self, processor):
-        """Test that each timeframe has its own lock."""
-        # Get locks for different timeframes
-        lock1 = processor._get_timeframe_lock("1min")
-        lock2 = processor._get_timeframe_lock("5min")
-        lock3 = processor._get_timeframe_lock("1min")  # Same as lock1
-
-        # Different timeframes should have different locks
-        assert lock1 is not lock2
-
-        # Same timeframe should return same lock
-        assert lock1 is lock3
-
     @pytest.mark.asyncio
     async def test_concurrent_timeframe_processing(self, processor):
         """Test concurrent processing of different timeframes."""
@@ -721,8 +705,8 @@ class TestDataProcessingMixinPerformanceAndSafety:
             processor.data[tf] = pl.DataFrame()
             processor.timeframes[tf] = {"interval": 1, "unit": 2}
 
-        # Mock atomic update to track concurrent calls
-        processor._update_timeframe_data_atomic = AsyncMock()
+        # Mock the per-timeframe step to track calls
+        processor._apply_bar = AsyncMock(return_value=None)
 
         tick = {
             "timestamp": datetime.now(timezone.utc),
@@ -732,8 +716,8 @@ class TestDataProcessingMixinPerformanceAndSafety:
 
         await processor._process_tick_data(tick)
 
-        # Should call atomic update for each timeframe
-        assert processor._update_timeframe_data_atomic.call_count == 3
+        # Should update each timeframe once, in a single pass
+        assert processor._apply_bar.call_count == 3
 
     @pytest.mark.asyncio
     async def test_memory_stats_tracking(self, processor):
@@ -382,7 +382,7 @@ class TestDataProcessingEdgeCases:
         )
 
         # Mock timeframe update to fail for one timeframe
-        original_update = manager._update_timeframe_data_atomic
+        original_update = manager._apply_bar
 
         async def failing_update(tf_key, *args, **kwargs):
             if tf_key == "1min":
@@ -390,9 +390,7 @@ class TestDataProcessingEdgeCases:
             return await original_update(tf_key, *args, **kwargs)
 
         with (
-            patch.object(
-                manager, "_update_timeframe_data_atomic", side_effect=failing_update
-            ),
+            patch.object(manager, "_apply_bar", side_effect=failing_update),
             patch.object(manager, "_handle_partial_failures") as mock_handle_failures,
         ):
             tick = {
@@ -462,10 +462,10 @@ class TestTickProcessingAndBarConstruction:
         with (
             patch.object(
                 manager,
-                "_update_timeframe_data",
+                "_apply_bar",
                 side_effect=Exception("Update failed"),
             ),
-            patch.object(manager, "_rollback_transaction") as mock_rollback,
+            patch.object(manager, "_restore_timeframe") as mock_rollback,
             patch.object(manager, "logger"),
         ):
             await manager._process_tick_data(tick)
@@ -491,9 +491,7 @@ class TestTickProcessingAndBarConstruction:
             return None
 
         with (
-            patch.object(
-                manager, "_update_timeframe_data_atomic", side_effect=mock_update_atomic
-            ),
+            patch.object(manager, "_apply_bar", side_effect=mock_update_atomic),
             patch.object(manager, "_handle_partial_failures") as mock_handle_failures,
             patch.object(manager, "_cleanup_old_data"),
         ):
@@ -0,0 +1,268 @@
+"""
+Tests for vectorized bulk tick ingestion (DataProcessingMixin.process_ticks).
+
+Test Coverage Goals:
+- A batch gives the same bars as the same ticks fed one by one
+- Batches merge with the forming bar and ignore ticks for closed bars
+- New bar events, session filtering and price alignment
+- One data-lock acquisition per batch; DST batches fall back to single ticks
+"""
+
+import asyncio
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import polars as pl
+import pytest
+import pytz
+
+from project_x_py.realtime_data_manager.data_processing import DataProcessingMixin
+
+CHICAGO = pytz.timezone("America/Chicago")
+
+TIMEFRAMES = {
+    "5sec": {"interval": 5, "unit": 1},
+    "1min": {"interval": 1, "unit": 2},
+    "5min": {"interval": 5, "unit": 2},
+    "7min": {"interval": 7, "unit": 2},
+    "1hr": {"interval": 60, "unit": 2},
+}
+
+
+def random_ticks(start, count, seed=7):
+    rng = random.Random(seed)
+    ticks = []
+    timestamp = start
+    price = 20000.0
+    for _ in range(count):
+        timestamp += timedelta(milliseconds=rng.randint(50, 4000))
+        price += rng.choice([-0.25, 0.0, 0.25, 0.13])
+        ticks.append(
+            {"timestamp": timestamp, "price": price, "volume": rng.randint(0, 5)}
+        )
+    return ticks
+
+
+async def one_by_one(manager, ticks):
+    for tick in ticks:
+        await manager._process_tick_data(tick)
+
+
+class TestProcessTicks:
+    @pytest.mark.asyncio
+    async def test_same_bars_as_single_ticks(self, make_manager):
+        start = CHICAGO.localize(datetime(2025, 3, 4, 9, 55))
+        ticks = random_ticks(start, 3000)
+        batched = make_manager(TIMEFRAMES)
+        single = make_manager(TIMEFRAMES)
+
+        assert await batched.process_ticks(ticks) == 3000
+        await one_by_one(single, ticks)
+
+        for tf in TIMEFRAMES:
+            assert batched.data[tf].equals(single.data[tf]), tf
+        assert batched.last_bar_times == single.last_bar_times
+        assert batched.memory_stats["ticks_processed"] == 3000
+        assert len(batched.current_tick_data) == 3000
+
+    @pytest.mark.asyncio
+    async def test_batches_merge_with_forming_bar(self, make_manager):
+        start = CHICAGO.localize(datetime(2025, 3, 4, 9, 55))
+        ticks = random_ticks(start, 2000, seed=11)
+        batched = make_manager(TIMEFRAMES)
+        single = make_manager(TIMEFRAMES)
+
+        # Split mid-bar, and feed some ticks one by one in between
+        await batched.process_ticks(ticks[:777])
+        await one_by_one(batched, ticks[777:800])
+        await batched.process_ticks(ticks[800:])
+        await one_by_one(single, ticks)
+
+        for tf in TIMEFRAMES:
+            assert batched.data[tf].equals(single.data[tf]), tf
+
+    @pytest.mark.asyncio
+    async def test_utc_manager_and_history(self, make_manager):
+        start = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+        history = pl.DataFrame(
+            {
+                "timestamp": [start - timedelta(minutes=1), start],
+                "open": [1.0, 2.0],
+                "high": [1.0, 2.0],
+                "low": [1.0, 2.0],
+                "close": [1.0, 2.0],
+                "volume": [1, 1],
+            }
+        )
+        ticks = random_ticks(start, 500, seed=3)
+        batched = make_manager({"1min": TIMEFRAMES["1min"]}, tz=timezone.utc)
+        single = make_manager({"1min": TIMEFRAMES["1min"]}, tz=timezone.utc)
+        batched.data = {"1min": history}
+        single.data = {"1min": history}
+
+        await batched.process_ticks(ticks)
+        await one_by_one(single, ticks)
+
+        assert batched.data["1min"].equals(single.data["1min"])
+
+    @pytest.mark.asyncio
+    async def test_ticks_for_closed_bars_are_ignored(self, make_manager):
+        manager = make_manager({"1min": TIMEFRAMES["1min"]})
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+        await manager.process_ticks(
+            [{"timestamp": start + timedelta(minutes=5), "price": 10.0}]
+        )
+
+        await manager.process_ticks(
+            [
+                {"timestamp": start, "price": 99.0, "volume": 9},
+                {"timestamp": start + timedelta(minutes=5, seconds=1), "price": 11.0},
+            ]
+        )
+
+        df = manager.data["1min"]
+        assert df.height == 1
+        assert df.row(0, named=True)["high"] == 11.0
+        assert df.row(0, named=True)["volume"] == 0
+
+    @pytest.mark.asyncio
+    async def test_late_ticks_in_batch_are_ignored(self, make_manager):
+        manager = make_manager({"1min": TIMEFRAMES["1min"]})
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+
+        await manager.process_ticks(
+            [
+                {"timestamp": start, "price": 10.0, "volume": 1},
+                {"timestamp": start + timedelta(minutes=2), "price": 12.0, "volume": 1},
+                {"timestamp": start + timedelta(minutes=1), "price": 99.0, "volume": 9},
+                {"timestamp": start + timedelta(seconds=30), "price": 1.0, "volume": 9},
+                {"timestamp": start + timedelta(minutes=2), "price": 13.0, "volume": 1},
+            ]
+        )
+
+        df = manager.data["1min"]
+        assert df["timestamp"].to_list() == [start, start + timedelta(minutes=2)]
+        assert df["close"].to_list() == [10.0, 13.0]
+        assert df["volume"].to_list() == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_unsorted_batch_same_bars_as_single_ticks(self, make_manager):
+        start = CHICAGO.localize(datetime(2025, 3, 4, 9, 55))
+        ticks = random_ticks(start, 1000, seed=5)
+        # Swap neighbours, some across bar boundaries
+        for i in range(0, len(ticks) - 1, 7):
+            ticks[i], ticks[i + 1] = ticks[i + 1], ticks[i]
+        batched = make_manager(TIMEFRAMES)
+        single = make_manager(TIMEFRAMES)
+
+        await batched.process_ticks(ticks)
+        await one_by_one(single, ticks)
+
+        for tf in TIMEFRAMES:
+            assert batched.data[tf].equals(single.data[tf]), tf
+        assert batched.last_bar_times == single.last_bar_times
+
+    @pytest.mark.asyncio
+    async def test_new_bar_events(self, make_manager):
+        manager = make_manager({"1min": TIMEFRAMES["1min"]})
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+        await manager.process_ticks([{"timestamp": start, "price": 10.0, "volume": 1}])
+        await asyncio.sleep(0)
+        manager.callbacks.clear()
+
+        await manager.process_ticks(
+            [
+                {
+                    "timestamp": start + timedelta(seconds=30),
+                    "price": 10.5,
+                    "volume": 1,
+                },
+                {"timestamp": start + timedelta(minutes=1), "price": 11.0, "volume": 2},
+                {
+                    "timestamp": start + timedelta(minutes=1, seconds=5),
+                    "price": 12.0,
+                    "volume": 3,
+                },
+                {"timestamp": start + timedelta(minutes=2), "price": 9.0, "volume": 4},
+            ]
+        )
+        await asyncio.sleep(0)
+
+        new_bars = [data for kind, data in manager.callbacks if kind == "new_bar"]
+        assert [event["bar_time"] for event in new_bars] == [
+            start + timedelta(minutes=1),
+            start + timedelta(minutes=2),
+        ]
+        assert new_bars[0]["data"]["high"] == 12.0
+        assert new_bars[0]["data"]["volume"] == 5
+        updates = [data for kind, data in manager.callbacks if kind == "data_update"]
+        assert len(updates) == 1
+        assert updates[0]["price"] == 9.0
+
+    @pytest.mark.asyncio
+    async def test_prices_aligned_to_tick_size(self, make_manager):
+        manager = make_manager({"1min": TIMEFRAMES["1min"]})
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+
+        await manager.process_ticks(
+            [
+                {"timestamp": start, "price": 100.13},
+                {"timestamp": start + timedelta(seconds=1), "price": 100.37},
+            ]
+        )
+
+        row = manager.data["1min"].row(0, named=True)
+        assert (row["open"], row["high"], row["close"]) == (100.25, 100.25, 100.25)
+
+    @pytest.mark.asyncio
+    async def test_session_filter_drops_ticks(self, make_manager):
+        manager = make_manager({"1min": TIMEFRAMES["1min"]})
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+        manager.session_config = Mock(session_type="RTH")
+        manager.session_filter = Mock()
+        manager.session_filter.is_in_session.side_effect = (
+            lambda ts, _session, _instrument: ts.second == 0
+        )
+        manager.instrument = "MNQ"
+
+        processed = await manager.process_ticks(
+            [
+                {"timestamp": start, "price": 10.0, "volume": 1},
+                {"timestamp": start + timedelta(seconds=1), "price": 50.0, "volume": 1},
+            ]
+        )
+
+        assert processed == 1
+        assert manager.data["1min"]["high"].to_list() == [10.0]
+
+    @pytest.mark.asyncio
+    async def test_one_lock_per_batch(self, make_manager):
+        manager = make_manager(TIMEFRAMES)
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+
+        await manager.process_ticks(random_ticks(start, 1000))
+
+        assert manager.data_lock.acquisitions == 1
+
+    @pytest.mark.asyncio
+    async def test_dst_batches_use_single_tick_path(self, make_manager):
+        manager = make_manager({"1min": TIMEFRAMES["1min"]})
+        manager.is_dst_transition_period = Mock(return_value=True)
+        manager._update_all_timeframes = Mock(wraps=manager._update_all_timeframes)
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+
+        await manager.process_ticks(random_ticks(start, 20))
+
+        assert manager._update_all_timeframes.call_count == 20
+        assert manager.data["1min"].height >= 1
+
+    @pytest.mark.asyncio
+    async def test_not_running_or_empty(self, make_manager):
+        manager = make_manager(TIMEFRAMES)
+        assert await manager.process_ticks([]) == 0
+        manager.is_running = False
+        start = CHICAGO.localize(datetime(2025, 3, 4, 10, 0))
+        assert await manager.process_ticks(random_ticks(start, 5)) == 0
+        assert manager.data["1min"].is_empty()
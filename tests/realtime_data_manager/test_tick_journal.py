@@ -0,0 +1,246 @@
+"""
+Tests for the tick journal and tick replay.
+
+Test Coverage Goals:
+- Ticks round-trip through memory-mapped segments with type, side and timezone
+- Segments roll over per time bucket and when full; late ticks are kept
+- Appends are buffered and written in batches; close() writes the rest
+- Quote and trade handlers journal their ticks when enabled
+- Replay rebuilds the same bars, tick by tick or vectorized, with the feed stopped
+"""
+
+import asyncio
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+import polars as pl
+import pytest
+import pytz
+
+from project_x_py.data import TickJournal
+from project_x_py.realtime_data_manager.data_processing import DataProcessingMixin
+from project_x_py.realtime_data_manager.journal import TickJournalMixin
+
+CHICAGO = pytz.timezone("America/Chicago")
+START = datetime(2025, 3, 4, 15, 0, tzinfo=timezone.utc)
+
+TIMEFRAMES = {
+    "5sec": {"interval": 5, "unit": 1},
+    "1min": {"interval": 1, "unit": 2},
+    "5min": {"interval": 5, "unit": 2},
+}
+
+
+def make_ticks(start, count, step=timedelta(milliseconds=700), seed=5):
+    rng = random.Random(seed)
+    price = 20000.0
+    ticks = []
+    for i in range(count):
+        price += rng.choice([-0.25, 0.0, 0.25])
+        ticks.append(
+            {
+                "timestamp": start + i * step,
+                "price": price,
+                "volume": rng.randint(0, 5),
+                "type": "trade" if i % 3 else "quote",
+                "trade_side": ("unknown", "buy", "sell")[i % 3],
+            }
+        )
+    return ticks
+
+
+class TestTickJournal:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        journal = TickJournal(tmp_path, prefix="MNQ")
+        ticks = make_ticks(START, 100)
+        for tick in ticks:
+            journal.append(tick)
+        await journal.close()
+
+        frame = journal.load(time_zone="America/Chicago")
+
+        assert frame.height == 100
+        assert frame["timestamp"].dtype == pl.Datetime("us", "America/Chicago")
+        assert frame["timestamp"][0] == START
+        assert frame["price"].to_list() == [tick["price"] for tick in ticks]
+        assert frame["volume"].to_list() == [tick["volume"] for tick in ticks]
+        assert frame["type"].to_list()[:3] == ["quote", "trade", "trade"]
+        assert frame["trade_side"].to_list()[:3] == ["unknown", "buy", "sell"]
+
+    @pytest.mark.asyncio
+    async def test_range_read(self, tmp_path):
+        journal = TickJournal(tmp_path, prefix="MNQ")
+        for tick in make_ticks(START, 600, step=timedelta(seconds=1)):
+            journal.append(tick)
+
+        frame = await journal.read(
+            START + timedelta(seconds=100), START + timedelta(seconds=200)
+        )
+        await journal.close()
+
+        assert frame.height == 100
+        assert frame["timestamp"][0] == START + timedelta(seconds=100)
+        assert frame["timestamp"][-1] == START + timedelta(seconds=199)
+
+    @pytest.mark.asyncio
+    async def test_segments_roll_by_time_and_capacity(self, tmp_path):
+        journal = TickJournal(
+            tmp_path, prefix="MNQ", segment_seconds=60, segment_capacity=50
+        )
+        ticks = make_ticks(START, 150, step=timedelta(seconds=1))
+        # A late tick for the first minute arrives after the second minute started
+        ticks.insert(100, {"timestamp": START + timedelta(seconds=59), "price": 1.0})
+        for tick in ticks:
+            journal.append(tick)
+        await journal.close()
+
+        names = [path.name for path in journal.segment_paths()]
+        assert names == [
+            "MNQ-20250304T150000Z-0000.ticks",
+            "MNQ-20250304T150000Z-0001.ticks",
+            "MNQ-20250304T150100Z-0000.ticks",
+            "MNQ-20250304T150100Z-0001.ticks",
+            "MNQ-20250304T150200Z-0000.ticks",
+        ]
+        frame = journal.load()
+        assert frame.height == 151
+        assert frame["timestamp"].is_sorted()
+        assert journal.load(end=START + timedelta(minutes=1)).height == 61
+
+    @pytest.mark.asyncio
+    async def test_appends_are_batched(self, tmp_path):
+        journal = TickJournal(tmp_path, prefix="MNQ", batch_size=10)
+        await journal.start()
+        for tick in make_ticks(START, 9):
+            journal.append(tick)
+        await asyncio.sleep(0.05)
+        assert journal.ticks_written == 0
+
+        journal.append(make_ticks(START, 10)[-1])
+        for _ in range(100):
+            if journal.ticks_written:
+                break
+            await asyncio.sleep(0.01)
+        assert journal.ticks_written == 10
+
+        journal.append(make_ticks(START, 11)[-1])
+        await journal.close()
+        assert journal.ticks_written == 11
+        journal.append(make_ticks(START, 12)[-1])
+        assert journal.load().height == 11
+
+    def test_full_batch_without_loop_waits_for_flush(self, tmp_path):
+        journal = TickJournal(tmp_path, prefix="MNQ", batch_size=10)
+        for tick in make_ticks(START, 25):
+            journal.append(tick)
+
+        assert journal.ticks_written == 0
+        asyncio.run(journal.close())
+        assert journal.load().height == 25
+
+    @pytest.mark.asyncio
+    async def test_new_session_keeps_earlier_segments(self, tmp_path):
+        for seed in (1, 2):
+            journal = TickJournal(tmp_path, prefix="MNQ")
+            for tick in make_ticks(START, 10, seed=seed):
+                journal.append(tick)
+            await journal.close()
+
+        assert len(journal.segment_paths()) == 2
+        assert TickJournal(tmp_path, prefix="MNQ").load().height == 20
+        assert TickJournal(tmp_path, prefix="ES").load().is_empty()
+
+    def test_invalid_prefix(self, tmp_path):
+        with pytest.raises(ValueError):
+            TickJournal(tmp_path, prefix="MNQ-H25")
+
+
+class TestManagerJournal:
+    @pytest.mark.asyncio
+    async def test_trade_handler_journals_ticks(self, tmp_path, make_manager):
+        manager = make_manager(
+            TIMEFRAMES,
+            config={"enable_tick_journal": True, "tick_journal_path": str(tmp_path)},
+        )
+
+        await manager._on_trade_update(
+            {
+                "data": {
+                    "symbolId": "F.US.MNQ",
+                    "price": 20000.25,
+                    "volume": 3,
+                    "type": 0,
+                }
+            }
+        )
+        await manager._close_tick_journal()
+
+        frame = manager.tick_journal.load()
+        assert frame.height == 1
+        row = frame.row(0, named=True)
+        assert (row["price"], row["volume"], row["type"], row["trade_side"]) == (
+            20000.25,
+            3,
+            "trade",
+            "buy",
+        )
+
+    def test_disabled_by_default(self, make_manager):
+        manager = make_manager(TIMEFRAMES)
+
+        assert manager.tick_journal is None
+        manager._journal_tick(make_ticks(START, 1)[0])
+
+    @pytest.mark.asyncio
+    async def test_replay_without_journal(self, make_manager):
+        with pytest.raises(ValueError):
+            await make_manager(TIMEFRAMES).replay_ticks()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("vectorized", [True, False])
+    async def test_replay_rebuilds_bars(self, tmp_path, vectorized, make_manager):
+        live = make_manager(
+            TIMEFRAMES,
+            config={"enable_tick_journal": True, "tick_journal_path": str(tmp_path)},
+        )
+        # Live ticks are stamped in the manager's timezone
+        ticks = make_ticks(START.astimezone(CHICAGO), 2000)
+        for tick in ticks:
+            live._journal_tick(tick)
+            await live._process_tick_data(tick)
+        await live._close_tick_journal()
+
+        rebuilt = make_manager(TIMEFRAMES)
+        rebuilt.is_running = False
+        rebuilt._min_update_interval = 10.0
+        replayed = await rebuilt.replay_ticks(
+            vectorized=vectorized,
+            batch_size=300,
+            journal=TickJournal(tmp_path, prefix="MNQ"),
+        )
+
+        assert replayed == 2000
+        for tf in TIMEFRAMES:
+            assert rebuilt.data[tf].equals(live.data[tf]), tf
+        assert rebuilt.memory_stats["ticks_processed"] == 2000
+
+    @pytest.mark.asyncio
+    async def test_replay_range(self, tmp_path, make_manager):
+        manager = make_manager(
+            TIMEFRAMES,
+            config={"enable_tick_journal": True, "tick_journal_path": str(tmp_path)},
+        )
+        for tick in make_ticks(START, 600, step=timedelta(seconds=1)):
+            manager._journal_tick(tick)
+
+        replayed = await manager.replay_ticks(
+            START + timedelta(minutes=2), START + timedelta(minutes=4)
+        )
+        await manager._close_tick_journal()
+
+        assert replayed == 120
+        assert manager.data["1min"].height == 2
+        assert manager.data["1min"]["timestamp"][0] == START + timedelta(minutes=2)
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the risk daemon (risk_manager/daemon) test suite.
+
+The daemon imports its modules as ``daemon.*`` and ``rules.*`` from the
+risk_manager directory, the way risk_daemon.py puts it on ``sys.path``.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+RISK_MANAGER = Path(__file__).resolve().parents[2] / "risk_manager"
+if str(RISK_MANAGER) not in sys.path:
+    sys.path.insert(0, str(RISK_MANAGER))
+
+
+class FakeClock:
+    """Manually advanced clock, for code that takes a ``clock`` callable."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
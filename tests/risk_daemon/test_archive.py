@@ -0,0 +1,141 @@
+"""
+Tests for the Parquet audit archive and breach queries.
+
+Test Coverage Goals:
+- Rotated segments compact into one Parquet file per day and are deleted
+- query_breaches merges the archive with pending and active NDJSON segments
+- Filters on account, rule and time; the day partition prunes whole days
+- Torn lines and non-breach records are ignored
+"""
+
+import json
+from datetime import datetime
+
+from daemon.archive import compact, parse_when, pending_segments, query_breaches
+
+
+def breach(timestamp, account=1, rule="max_contracts", enforcement="done"):
+    return {
+        "timestamp": timestamp,
+        "level": "WARNING",
+        "message": f"Breach outcome on account {account}",
+        "kind": "breach",
+        "account": account,
+        "rule": rule,
+        "contract": "CON.F.US.MNQ.Z25",
+        "action": "flatten",
+        "enforcement": enforcement,
+        "reason": "too many contracts",
+    }
+
+
+def write_segment(path, records, torn=False):
+    text = "".join(json.dumps(record) + "\n" for record in records)
+    if torn:
+        text += '{"timestamp": "2025-10-18T'
+    path.write_text(text)
+    return path
+
+
+def timestamps(rows):
+    return [row["timestamp"] for row in rows]
+
+
+class TestArchive:
+    def test_compact_splits_by_day(self, tmp_path):
+        archive = tmp_path / "archive"
+        segment = write_segment(
+            tmp_path / "audit-20251018-000000.ndjson",
+            [
+                breach("2025-10-17T23:59:00"),
+                {"timestamp": "2025-10-17T23:59:30", "level": "INFO", "message": "x"},
+                breach("2025-10-18T00:00:01"),
+            ],
+        )
+
+        compact(segment, archive)
+
+        assert not segment.exists()
+        assert sorted(
+            p.relative_to(archive).as_posix() for p in archive.rglob("*")
+        ) == [
+            "day=2025-10-17",
+            "day=2025-10-17/audit-20251018-000000.parquet",
+            "day=2025-10-18",
+            "day=2025-10-18/audit-20251018-000000.parquet",
+        ]
+
+    def test_query_merges_parquet_and_ndjson(self, tmp_path):
+        archive = tmp_path / "archive"
+        audit = tmp_path / "audit.ndjson"
+        compact(
+            write_segment(
+                tmp_path / "audit-20251017-000000.ndjson",
+                [breach("2025-10-16T10:00:00"), breach("2025-10-17T10:00:00")],
+            ),
+            archive,
+        )
+        # Rotated, not yet compacted
+        write_segment(
+            tmp_path / "audit-20251018-000000.ndjson",
+            [breach("2025-10-18T09:00:00", account=2)],
+        )
+        write_segment(
+            audit,
+            [
+                breach("2025-10-18T10:00:00", rule="daily_loss_limit"),
+                {"timestamp": "2025-10-18T10:00:01", "message": '"kind": "breach"'},
+            ],
+            torn=True,
+        )
+
+        assert len(pending_segments(audit)) == 1
+        rows = query_breaches(archive, audit)
+        assert timestamps(rows) == [
+            "2025-10-16T10:00:00",
+            "2025-10-17T10:00:00",
+            "2025-10-18T09:00:00",
+            "2025-10-18T10:00:00",
+        ]
+        assert rows[0]["account"] == 1
+        assert rows[0]["enforcement"] == "done"
+
+        assert timestamps(query_breaches(archive, audit, account=2)) == [
+            "2025-10-18T09:00:00"
+        ]
+        assert timestamps(query_breaches(archive, audit, rule="daily_loss_limit")) == [
+            "2025-10-18T10:00:00"
+        ]
+        assert len(query_breaches(archive, audit, limit=2)) == 2
+
+    def test_day_partition_prunes(self, tmp_path):
+        archive = tmp_path / "archive"
+        audit = tmp_path / "audit.ndjson"
+        for day in (15, 16, 17):
+            compact(
+                write_segment(
+                    tmp_path / f"audit-202510{day}-000000.ndjson",
+                    [breach(f"2025-10-{day}T12:00:00")],
+                ),
+                archive,
+            )
+        # Outside the range, so never opened
+        [late] = (archive / "day=2025-10-17").glob("*.parquet")
+        late.write_bytes(b"not parquet")
+
+        rows = query_breaches(
+            archive,
+            audit,
+            since=parse_when("2025-10-15"),
+            until=parse_when("2025-10-16", end=True),
+        )
+
+        assert timestamps(rows) == ["2025-10-15T12:00:00", "2025-10-16T12:00:00"]
+
+    def test_empty(self, tmp_path):
+        assert query_breaches(tmp_path / "archive", tmp_path / "audit.ndjson") == []
+
+    def test_parse_when(self):
+        assert parse_when("2025-10-17", end=True) == datetime(2025, 10, 18)
+        assert parse_when("2025-10-17T09:30") == datetime(2025, 10, 17, 9, 30)
+        assert parse_when(None) is None
@@ -0,0 +1,124 @@
+"""
+Tests for the background group-commit audit writer.
+
+Test Coverage Goals:
+- Records are written as NDJSON with extra fields, in order, on close()
+- Queue full: INFO records are dropped, WARNING/ERROR kept up to a hard limit
+- Rotation on size hands the closed segment to on_rotate
+- I/O errors keep the thread alive, are counted and the batch is retried
+"""
+
+import json
+import threading
+import time
+
+from daemon import audit_writer
+from daemon.audit_writer import AuditWriter
+
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestAuditWriter:
+    def test_writes_records_in_order(self, tmp_path):
+        path = tmp_path / "audit.ndjson"
+        writer = AuditWriter(path, flush_interval_ms=10)
+
+        writer.write("first")
+        writer.write("breach", level="WARNING", fields={"kind": "breach", "rule": "x"})
+        writer.close()
+
+        records = read_records(path)
+        assert [r["message"] for r in records] == ["first", "breach"]
+        assert records[1]["level"] == "WARNING"
+        assert records[1]["rule"] == "x"
+        assert writer.stats()["written"] == 2
+        assert writer.write("after close") is False
+
+    def test_full_queue_drops_info_and_caps_warnings(self, tmp_path):
+        writer = AuditWriter(tmp_path / "audit.ndjson", max_queue=2, batch_size=100)
+        # Hold the queue: the writer thread waits on the condition it cannot take
+        with writer._cond:
+            writer._thread = threading.current_thread()
+            assert writer.write("a")
+            assert writer.write("b")
+            assert writer.write("info over the bound") is False
+            assert writer.write("w1", level="WARNING")
+            assert writer.write("e1", level="ERROR")
+            assert writer.write("w2", level="WARNING") is False
+        stats = writer.stats()
+        assert stats["dropped"] == 1
+        assert stats["dropped_critical"] == 1
+        assert stats["queue_depth"] == 4
+        writer._closed = True
+
+    def test_rotation_on_size(self, tmp_path):
+        path = tmp_path / "audit.ndjson"
+        rotated = []
+        writer = AuditWriter(path, flush_interval_ms=5, batch_size=1)
+        writer.set_rotation(max_bytes=1, on_rotate=rotated.append)
+
+        writer.write("one")
+        writer.close()
+        writer = AuditWriter(path, flush_interval_ms=5, batch_size=1)
+        writer.set_rotation(max_bytes=1, on_rotate=rotated.append)
+        writer.write("two")
+        writer.close()
+
+        assert len(rotated) == 1
+        assert rotated[0].name.startswith("audit-")
+        assert [r["message"] for r in read_records(rotated[0])] == ["one"]
+        assert [r["message"] for r in read_records(path)] == ["two"]
+
+    def test_io_error_is_retried(self, tmp_path, monkeypatch):
+        path = tmp_path / "audit.ndjson"
+        writer = AuditWriter(path, flush_interval_ms=5, retry_interval_s=0.01)
+        real_open = open
+        failures = [2]
+
+        def flaky_open(file, mode="r", *args, **kwargs):
+            if file == path and "a" in mode and failures[0]:
+                failures[0] -= 1
+                raise OSError(28, "No space left on device")
+            return real_open(file, mode, *args, **kwargs)
+
+        monkeypatch.setattr(audit_writer, "open", flaky_open, raising=False)
+        writer.write("kept", level="WARNING")
+        deadline = time.monotonic() + 5
+        while not writer.stats()["written"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+
+        stats = writer.stats()
+        assert stats["write_errors"] == 2
+        assert "No space left" in stats["last_error"]
+        assert stats["lost"] == 0
+        assert [r["message"] for r in read_records(path)] == ["kept"]
+
+    def test_torn_record_is_terminated(self, tmp_path):
+        path = tmp_path / "audit.ndjson"
+        path.write_text('{"message": "whole"}\n{"message": "cut')
+        writer = AuditWriter(path, flush_interval_ms=5)
+
+        writer.write("next")
+        writer.close()
+
+        lines = path.read_text().splitlines()
+        assert lines[1] == '{"message": "cut'
+        assert json.loads(lines[2])["message"] == "next"
+
+    def test_close_gives_up_when_disk_keeps_failing(self, tmp_path, monkeypatch):
+        writer = AuditWriter(tmp_path / "audit.ndjson", retry_interval_s=0.01)
+
+        def failing_open(*args, **kwargs):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(audit_writer, "open", failing_open, raising=False)
+        writer.write("a", level="ERROR")
+        writer.write("b")
+        writer.close()
+
+        stats = writer.stats()
+        assert stats["lost"] == 2
+        assert stats["write_errors"] >= 1
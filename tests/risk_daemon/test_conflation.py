@@ -0,0 +1,85 @@
+"""
+Tests for quote conflation.
+
+Test Coverage Goals:
+- The first quote for a symbol is released immediately
+- Moves under move_ticks are merged and released once per interval by due()
+- Moves of at least move_ticks are released immediately
+- conflate_ms 0 releases every quote
+
+Released snapshots are event-bus Events, which need a running loop.
+"""
+
+import pytest
+from daemon.conflation import QuoteConflator
+
+
+def quote(price):
+    return {"symbol": "F.US.MNQ", "bid": price - 0.25, "ask": price, "last": price}
+
+
+def make_conflator(**kwargs):
+    conflator = QuoteConflator(**kwargs)
+    conflator.set_tick_size("MNQ", 0.25)
+    return conflator
+
+
+class TestQuoteConflator:
+    @pytest.mark.asyncio
+    async def test_first_quote_is_released(self):
+        conflator = make_conflator()
+
+        event, arrived = conflator.offer("MNQ", quote(20000.0), 1.5)
+
+        assert event.data["last"] == 20000.0
+        assert event.data["conflated"] == 1
+        assert arrived == 1.5
+
+    @pytest.mark.asyncio
+    async def test_small_moves_are_merged_until_due(self):
+        conflator = make_conflator(conflate_ms=50, move_ticks=4)
+        conflator.offer("MNQ", quote(20000.0), 0.0)
+
+        assert conflator.offer("MNQ", quote(20000.25), 1.0) is None
+        assert conflator.offer("MNQ", quote(20000.5), 2.0) is None
+        [(event, arrived)] = conflator.due(10.0)
+
+        assert event.data["last"] == 20000.5
+        assert event.data["conflated"] == 2
+        assert arrived == 2.0
+        # Nothing changed since, and the next tick is one interval away
+        assert conflator.due(10.01) == []
+        conflator.offer("MNQ", quote(20000.25), 3.0)
+        assert conflator.due(10.01) == []
+        assert len(conflator.due(10.05)) == 1
+
+    @pytest.mark.asyncio
+    async def test_move_ticks_releases_immediately(self):
+        conflator = make_conflator(move_ticks=4)
+        conflator.offer("MNQ", quote(20000.0), 0.0)
+
+        assert conflator.offer("MNQ", quote(20000.75), 0.0) is None
+        event, _ = conflator.offer("MNQ", quote(20001.0), 0.0)
+
+        assert event.data["last"] == 20001.0
+        assert conflator.due(10.0) == []
+        # The next move is measured from the last released price
+        assert conflator.offer("MNQ", quote(20000.25), 0.0) is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_tick_size_waits_for_due(self):
+        conflator = QuoteConflator()
+        conflator.offer("ES", quote(5000.0), 0.0)
+
+        assert conflator.offer("ES", quote(5100.0), 0.0) is None
+        assert len(conflator.due(1.0)) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_releases_every_quote(self):
+        conflator = make_conflator()
+        conflator.configure({"conflate_ms": 0})
+
+        releases = [conflator.offer("MNQ", quote(20000.0), 0.0) for _ in range(3)]
+
+        assert all(release is not None for release in releases)
+        assert conflator.stats()["ratio"] == 1.0
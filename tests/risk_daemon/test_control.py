@@ -0,0 +1,102 @@
+"""
+Tests for the control socket.
+
+Test Coverage Goals:
+- Commands answer over one JSON line; async handlers are awaited
+- Invalid requests, unknown commands and failing handlers return errors
+- tail streams committed audit records; a slow subscriber loses records
+  and is told how many, without blocking the publisher
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from daemon import control
+from daemon.control import ControlServer
+
+
+async def status_command(request):
+    return {"pid": 1, "echo": request.get("value")}
+
+
+def failing_command(request):
+    raise ValueError("broken")
+
+
+@pytest.fixture
+async def server(tmp_path):
+    server = ControlServer(
+        tmp_path / "riskd.sock",
+        {"status": status_command, "fail": failing_command},
+        Mock(),
+        Mock(),
+    )
+    await server.start()
+    yield server
+    await server.close()
+
+
+async def raw_request(path, line):
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(line)
+    await writer.drain()
+    response = await reader.readline()
+    writer.close()
+    return response
+
+
+class TestControlServer:
+    @pytest.mark.asyncio
+    async def test_command(self, server):
+        result = await control.request(server.path, "status", value=3)
+
+        assert result == {"pid": 1, "echo": 3}
+        assert await control.is_listening(server.path)
+
+    @pytest.mark.asyncio
+    async def test_protocol_errors(self, server):
+        assert b"invalid request" in await raw_request(server.path, b"not json\n")
+        assert b"invalid request" in await raw_request(server.path, b'{"x": 1}\n')
+        with pytest.raises(RuntimeError, match="unknown command: nope"):
+            await control.request(server.path, "nope")
+        with pytest.raises(RuntimeError, match="broken"):
+            await control.request(server.path, "fail")
+
+    @pytest.mark.asyncio
+    async def test_second_server_refused(self, server):
+        with pytest.raises(RuntimeError, match="already listening"):
+            await ControlServer(server.path, {}, Mock(), Mock()).start()
+
+    @pytest.mark.asyncio
+    async def test_not_running(self, tmp_path):
+        with pytest.raises(ConnectionError):
+            await control.request(tmp_path / "missing.sock", "status")
+
+    @pytest.mark.asyncio
+    async def test_slow_tail_subscriber_drops_records(self, server, monkeypatch):
+        monkeypatch.setattr(control, "SUBSCRIBER_QUEUE", 5)
+        stream = control.subscribe(server.path)
+        first = asyncio.ensure_future(stream.__anext__())
+        for _ in range(100):
+            if server._subscribers:
+                break
+            await asyncio.sleep(0.01)
+
+        # One batch larger than the subscriber's queue, published at once
+        server._publish([{"message": str(n)} for n in range(12)])
+        received = [await asyncio.wait_for(first, 1.0)]
+        for _ in range(5):
+            received.append(await asyncio.wait_for(stream.__anext__(), 1.0))
+        await stream.aclose()
+
+        assert received[0] == {
+            "level": "WARNING",
+            "message": "7 audit records skipped (reader too slow)",
+        }
+        assert [r["message"] for r in received[1:]] == ["0", "1", "2", "3", "4"]
+        for _ in range(100):
+            if not server._subscribers:
+                break
+            await asyncio.sleep(0.01)
+        assert not server._subscribers
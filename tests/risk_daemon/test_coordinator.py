@@ -0,0 +1,109 @@
+"""
+Tests for the enforcement coordinator.
+
+Test Coverage Goals:
+- A breach while the same action is in flight is coalesced
+- A completed action is suppressed while the state is unchanged, until
+  settle_timeout_s passes or the state changes
+- A failed action may retry on unchanged state after retry_after_s
+- The fingerprint is taken after the broker answered
+"""
+
+import asyncio
+
+import pytest
+from daemon.coordinator import EnforcementCoordinator
+
+KEY = (1, "CON.F.US.MNQ.Z25", "flatten")
+
+
+def make_coordinator(clock, **kwargs):
+    coordinator = EnforcementCoordinator(**kwargs)
+    coordinator.clock = clock
+    return coordinator
+
+
+async def sent():
+    return "order"
+
+
+class TestEnforcementCoordinator:
+    @pytest.mark.asyncio
+    async def test_coalesced_while_in_flight(self, clock):
+        coordinator = make_coordinator(clock)
+        release = asyncio.Event()
+
+        async def stalled():
+            await release.wait()
+            return "order"
+
+        first = asyncio.create_task(coordinator.run(KEY, lambda: 2, stalled))
+        await asyncio.sleep(0)
+        assert coordinator.in_flight() == [(KEY, 0.0)]
+        assert await coordinator.run(KEY, lambda: 2, sent) == ("coalesced", None)
+        # Another contract is independent
+        other = (1, "CON.F.US.ES.Z25", "flatten")
+        assert await coordinator.run(other, lambda: 1, sent) == ("done", "order")
+
+        release.set()
+        assert await first == ("done", "order")
+        assert coordinator.stats() == {
+            "started": 2,
+            "coalesced": 1,
+            "suppressed": 0,
+            "failed": 0,
+            "in_flight": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_suppressed_until_state_changes_or_timeout(self, clock):
+        coordinator = make_coordinator(clock, settle_timeout_s=5.0)
+        fingerprint = [(2, 0)]
+
+        assert (await coordinator.run(KEY, lambda: fingerprint[0], sent))[0] == "done"
+        clock.advance(1.0)
+        assert await coordinator.run(KEY, lambda: fingerprint[0], sent) == (
+            "suppressed",
+            None,
+        )
+
+        fingerprint[0] = (0, 0)
+        assert (await coordinator.run(KEY, lambda: fingerprint[0], sent))[0] == "done"
+
+        clock.advance(5.0)
+        assert (await coordinator.run(KEY, lambda: fingerprint[0], sent))[0] == "done"
+        assert coordinator.stats()["suppressed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_retries_after_retry_after(self, clock):
+        coordinator = make_coordinator(clock, retry_after_s=1.0, settle_timeout_s=5.0)
+
+        async def rejected():
+            raise RuntimeError("rejected")
+
+        with pytest.raises(RuntimeError):
+            await coordinator.run(KEY, lambda: 2, rejected)
+        clock.advance(0.5)
+        assert (await coordinator.run(KEY, lambda: 2, sent))[0] == "suppressed"
+        clock.advance(0.5)
+        assert (await coordinator.run(KEY, lambda: 2, sent))[0] == "done"
+        assert coordinator.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fingerprint_taken_after_ack(self, clock):
+        coordinator = make_coordinator(clock)
+        position = [2]
+
+        async def flatten():
+            # The position update confirming the flatten lands before the ack
+            position[0] = 0
+            return "order"
+
+        await coordinator.run(KEY, lambda: position[0], flatten)
+
+        # Flat now, as when the action finished: nothing to send again
+        assert (await coordinator.run(KEY, lambda: position[0], sent))[
+            0
+        ] == "suppressed"
+        position[0] = 1
+        assert (await coordinator.run(KEY, lambda: position[0], sent))[0] == "done"
@@ -0,0 +1,165 @@
+"""
+Tests for the event-type dispatch table.
+
+Test Coverage Goals:
+- Only rules subscribed to an event type are returned; rules without
+  EVENT_TYPES see every event, after the declared ones
+- Per-rule and global symbol filters; events without a symbol reach all
+- Contract IDs and feed symbols reduce to their instrument root
+- prepare() errors are reported with the rule's name
+- Rules come critical tier first, then standard, then advisory, in load
+  order within a tier; the config may override a rule's TIER
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from daemon.dispatch import (
+    RuleDispatcher,
+    event_contract,
+    event_symbol,
+    symbol_from_contract,
+)
+
+from project_x_py import EventType
+
+
+def rule(event_types=None, tier=None, prepare=None):
+    module = SimpleNamespace(check=lambda event, config: {"status": "VALID"})
+    if event_types is not None:
+        module.EVENT_TYPES = event_types
+    if tier is not None:
+        module.TIER = tier
+    if prepare is not None:
+        module.prepare = prepare
+    return module
+
+
+def event(event_type, data=None):
+    return SimpleNamespace(type=event_type, data=data or {})
+
+
+def names(bindings):
+    return [binding.name for binding in bindings]
+
+
+def dispatcher(rules, configs=None, symbols=None):
+    configs = configs or {}
+    config = {"rules": {name: configs.get(name, {}) for name in rules}}
+    if symbols is not None:
+        config["symbols"] = symbols
+    return RuleDispatcher(rules, config)
+
+
+class TestRuleDispatcher:
+    def test_only_subscribed_rules(self):
+        table = dispatcher(
+            {
+                "positions": rule((EventType.POSITION_UPDATED,)),
+                "quotes": rule((EventType.QUOTE_UPDATE,)),
+                "everything": rule(),
+            }
+        )
+
+        assert names(table.rules_for(event(EventType.POSITION_UPDATED))) == [
+            "positions",
+            "everything",
+        ]
+        assert names(table.rules_for(event(EventType.ORDER_FILLED))) == ["everything"]
+        assert table.event_types == [EventType.POSITION_UPDATED, EventType.QUOTE_UPDATE]
+
+    def test_symbol_filter(self):
+        table = dispatcher(
+            {
+                "mnq_only": rule((EventType.POSITION_UPDATED,)),
+                "global": rule((EventType.POSITION_UPDATED,)),
+                "wildcard": rule(),
+            },
+            configs={"mnq_only": {"symbols": ["MNQ"]}},
+            symbols=["MNQ", "ES"],
+        )
+
+        es = event(EventType.POSITION_UPDATED, {"contractId": "CON.F.US.ES.Z25"})
+        mnq = event(EventType.POSITION_UPDATED, {"contractId": "CON.F.US.MNQ.Z25"})
+        nq = event(EventType.ORDER_FILLED, {"symbol": "F.US.NQ"})
+        unknown = event(EventType.POSITION_UPDATED)
+
+        assert names(table.rules_for(es)) == ["global", "wildcard"]
+        assert names(table.rules_for(mnq)) == ["mnq_only", "global", "wildcard"]
+        assert names(table.rules_for(nq)) == []
+        assert names(table.rules_for(unknown)) == ["mnq_only", "global", "wildcard"]
+
+    def test_no_symbols_means_all(self):
+        table = dispatcher({"any": rule((EventType.QUOTE_UPDATE,))})
+
+        quote = event(EventType.QUOTE_UPDATE, {"symbol": "F.US.CL"})
+
+        assert names(table.rules_for(quote)) == ["any"]
+
+    def test_prepare_errors_name_the_rule(self):
+        def prepare(config):
+            raise ValueError("max must be positive")
+
+        with pytest.raises(ValueError, match="rules.bad: max must be positive"):
+            dispatcher({"bad": rule(prepare=prepare)})
+
+
+class TestTiers:
+    def test_tier_order(self):
+        table = dispatcher(
+            {
+                "advisory": rule((EventType.POSITION_UPDATED,), tier="advisory"),
+                "standard_1": rule((EventType.POSITION_UPDATED,)),
+                "critical": rule((EventType.POSITION_UPDATED,), tier="critical"),
+                "standard_2": rule((EventType.POSITION_UPDATED,)),
+                "wildcard_critical": rule(tier="critical"),
+            }
+        )
+
+        assert names(table.rules_for(event(EventType.POSITION_UPDATED))) == [
+            "critical",
+            "wildcard_critical",
+            "standard_1",
+            "standard_2",
+            "advisory",
+        ]
+
+    def test_config_overrides_tier(self):
+        table = dispatcher(
+            {
+                "first": rule((EventType.QUOTE_UPDATE,), tier="critical"),
+                "second": rule((EventType.QUOTE_UPDATE,)),
+            },
+            configs={"first": {"tier": "advisory"}, "second": {"tier": "critical"}},
+        )
+
+        bindings = table.rules_for(event(EventType.QUOTE_UPDATE))
+        assert [(b.name, b.tier) for b in bindings] == [
+            ("second", "critical"),
+            ("first", "advisory"),
+        ]
+        assert table.describe() == [
+            "quote_update -> second [critical], first [advisory]"
+        ]
+
+    def test_unknown_tier(self):
+        with pytest.raises(ValueError, match="tier must be one of"):
+            dispatcher({"bad": rule(tier="urgent")})
+
+
+class TestEventSymbols:
+    @pytest.mark.parametrize(
+        ("identifier", "root"),
+        [("CON.F.US.MNQ.Z25", "MNQ"), ("F.US.MNQ", "MNQ"), ("MNQ", "MNQ")],
+    )
+    def test_symbol_from_contract(self, identifier, root):
+        assert symbol_from_contract(identifier) == root
+
+    def test_order_payloads(self):
+        order = SimpleNamespace(contractId="CON.F.US.ES.Z25")
+
+        filled = event(EventType.ORDER_FILLED, {"order": order})
+
+        assert event_contract(filled) == "CON.F.US.ES.Z25"
+        assert event_symbol(filled) == "ES"
+        assert event_symbol(event(EventType.ORDER_FILLED, [])) is None
@@ -0,0 +1,155 @@
+"""
+Tests for the fast-path enforcement executor.
+
+Test Coverage Goals:
+- Flatten sends the closing market order and cancels the contract's orders
+- A failed order is raised only after the cancels have finished
+- A resolved contract without a cached size falls back to REST close_position
+- The side comes from the signed net size; a position without a known direction
+  falls back to REST instead of guessing
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from daemon.account_state import AccountState
+from daemon.enforcement import EnforcementExecutor
+from daemon.metrics import DaemonMetrics
+
+from project_x_py import EventType
+from project_x_py.exceptions import ProjectXOrderError
+from project_x_py.models import OrderPlaceResponse
+from project_x_py.types import OrderSide, PositionType
+
+CONTRACT = "CON.F.US.MNQ.Z25"
+
+
+class FakeState:
+    def __init__(self, positions, orders=None):
+        self.positions = positions
+        self.orders = orders or {}
+
+    def resolve(self, identifier):
+        return identifier if identifier in self.positions else None
+
+    def position(self, contract_id):
+        return self.positions.get(contract_id)
+
+    def open_orders(self, contract_id):
+        return self.orders.get(contract_id, {})
+
+
+class FakeOrders:
+    def __init__(self, fail_submit=False, cancel_delay=0.0):
+        self.fail_submit = fail_submit
+        self.cancel_delay = cancel_delay
+        self.placed = []
+        self.cancelled = []
+        self.closed = []
+
+    async def place_market_order(self, contract_id, side, size, account_id=None):
+        if self.fail_submit:
+            raise ProjectXOrderError("rejected")
+        self.placed.append((contract_id, side, size, account_id))
+        return OrderPlaceResponse(
+            orderId=7, success=True, errorCode=0, errorMessage=None
+        )
+
+    async def cancel_order(self, order_id, account_id=None):
+        await asyncio.sleep(self.cancel_delay)
+        self.cancelled.append(order_id)
+        return True
+
+    async def close_position(self, contract_id, account_id=None):
+        self.closed.append((contract_id, account_id))
+        return OrderPlaceResponse(
+            orderId=9, success=True, errorCode=0, errorMessage=None
+        )
+
+
+def make_executor(state, orders):
+    return EnforcementExecutor(
+        orders, state, 1, Mock(), Mock(), DaemonMetrics(), {"MNQ": CONTRACT}
+    )
+
+
+def long_position(size=2):
+    return {
+        CONTRACT: {
+            "account_id": 1,
+            "type": PositionType.LONG,
+            "size": size,
+            "net": size,
+        }
+    }
+
+
+def position_event(fields):
+    data = {"contractId": CONTRACT, "accountId": 1, "averagePrice": 20000.0, **fields}
+    return SimpleNamespace(type=EventType.POSITION_UPDATED, data=data)
+
+
+class TestEnforcementExecutor:
+    @pytest.mark.asyncio
+    async def test_flatten_places_order_and_cancels(self):
+        orders = FakeOrders()
+        state = FakeState(long_position(), {CONTRACT: {11: {}, 12: {}}})
+        executor = make_executor(state, orders)
+
+        response = await executor.flatten(CONTRACT, "test", 0.0, 0.0)
+
+        assert response.orderId == 7
+        assert orders.placed == [(CONTRACT, OrderSide.SELL, 2, 1)]
+        assert sorted(orders.cancelled) == [11, 12]
+
+    @pytest.mark.asyncio
+    async def test_failed_order_waits_for_cancels(self):
+        orders = FakeOrders(fail_submit=True, cancel_delay=0.01)
+        state = FakeState(long_position(), {CONTRACT: {11: {}}})
+        executor = make_executor(state, orders)
+
+        with pytest.raises(ProjectXOrderError):
+            await executor.flatten(CONTRACT, "test", 0.0, 0.0)
+
+        assert orders.cancelled == [11]
+        assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("position", [None, {"account_id": 1, "size": 0}])
+    async def test_missing_size_falls_back_to_rest(self, position):
+        orders = FakeOrders()
+        state = FakeState({CONTRACT: position})
+        executor = make_executor(state, orders)
+
+        response = await executor.flatten(CONTRACT, "test", 0.0, 0.0)
+
+        assert response.orderId == 9
+        assert orders.closed == [(CONTRACT, 1)]
+        assert orders.placed == []
+
+    @pytest.mark.asyncio
+    async def test_short_position_is_bought_back(self):
+        orders = FakeOrders()
+        state = AccountState(1)
+        state.apply(position_event({"type": PositionType.SHORT, "size": 3}))
+        executor = make_executor(state, orders)
+
+        await executor.flatten("MNQ", "test", 0.0, 0.0)
+
+        assert orders.placed == [(CONTRACT, OrderSide.BUY, 3, 1)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fields", [{}, {"type": 0}, {"type": 7}])
+    async def test_untyped_position_falls_back_to_rest(self, fields):
+        orders = FakeOrders()
+        state = AccountState(1)
+        state.apply(position_event({**fields, "size": 2}))
+        executor = make_executor(state, orders)
+
+        response = await executor.flatten(CONTRACT, "test", 0.0, 0.0)
+
+        assert response.orderId == 9
+        assert orders.closed == [(CONTRACT, 1)]
+        assert orders.placed == []
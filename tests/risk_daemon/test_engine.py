@@ -0,0 +1,184 @@
+"""
+Tests for the rule engine's event path.
+
+Test Coverage Goals:
+- A breach's enforcement runs in the background, off the event's path
+- A stalled broker on one account does not delay other accounts' events
+- Repeated breaches while enforcement is in flight are coalesced
+- drain() waits for background enforcement
+- Conflated quotes are released on time while enforcement is stalled
+- An action the daemon cannot send is recorded as unsupported, never as done
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from daemon.account_state import AccountState
+from daemon.dispatch import RuleDispatcher
+from daemon.engine import RuleEngine
+from daemon.metrics import DaemonMetrics
+from daemon.supervisor import AccountPartition
+
+from project_x_py import EventType
+from project_x_py.event_bus import Event
+
+STALLED = 1
+HEALTHY = 2
+
+
+class StallingExecutor:
+    """Flattens only once ``release`` is set, like a broker that stopped acking."""
+
+    def __init__(self, release=None):
+        self.release = release
+        self.calls = 0
+
+    async def flatten(self, identifier, reason, event_time, decision_time):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        return "done"
+
+
+def make_engine(breach_accounts, release, action="flatten"):
+    seen = []
+
+    def check(event, config, state):
+        seen.append(state.account_id)
+        if state.account_id in breach_accounts:
+            return {"status": "BREACH", "action": action, "reason": "test"}
+        return {"status": "OK"}
+
+    rule = SimpleNamespace(EVENT_TYPES=(EventType.QUOTE_UPDATE,), check=check)
+    ruleset = SimpleNamespace(
+        dispatcher=RuleDispatcher({"price": rule}, {"rules": {"price": {}}}),
+        shadow=None,
+        dry_run=False,
+    )
+    partitions = [
+        AccountPartition(
+            account_id,
+            None,
+            None,
+            None,
+            AccountState(account_id),
+            StallingExecutor(release if account_id == STALLED else None),
+            True,
+        )
+        for account_id in (STALLED, HEALTHY)
+    ]
+    engine = RuleEngine(
+        ruleset, partitions, DaemonMetrics(), Mock(), Mock(), "MNQ", log_events=False
+    )
+    engine.conflator.set_tick_size("MNQ", 0.25)
+    return engine, partitions, seen
+
+
+def quote(price):
+    return Event(
+        EventType.QUOTE_UPDATE,
+        {"symbol": "F.US.MNQ", "bid": price - 0.25, "ask": price, "last": price},
+    )
+
+
+class TestUnsupportedAction:
+    @pytest.mark.asyncio
+    async def test_unsupported_action_is_not_done_or_settled(self):
+        engine, partitions, _ = make_engine({HEALTHY}, None, action="reduce")
+
+        for price in (20000.0, 20010.0):
+            await engine.on_market(quote(price), 0.0)
+            await engine.drain()
+
+        assert partitions[1].executor.calls == 0
+        assert [b["enforcement"] for b in engine.breaches] == [
+            "unsupported",
+            "unsupported",
+        ]
+        stats = engine.coordinator.stats()
+        assert stats["started"] == stats["suppressed"] == stats["coalesced"] == 0
+
+
+class TestBackgroundEnforcement:
+    @pytest.mark.asyncio
+    async def test_stalled_account_does_not_block_others(self):
+        release = asyncio.Event()
+        engine, partitions, seen = make_engine({STALLED, HEALTHY}, release)
+
+        await asyncio.wait_for(engine.on_market(quote(20000.0), 0.0), 1.0)
+
+        assert seen == [STALLED, HEALTHY]
+        assert partitions[1].executor.calls == 1
+        assert not await engine.drain(timeout=0.01)
+        assert engine.enforcing() == 1
+
+        release.set()
+        assert await engine.drain()
+        assert engine.enforcing() == 0
+        assert [b["enforcement"] for b in engine.breaches] == ["done", "done"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_breach_is_coalesced_while_in_flight(self):
+        release = asyncio.Event()
+        engine, partitions, _ = make_engine({STALLED}, release)
+
+        await asyncio.wait_for(engine.on_market(quote(20000.0), 0.0), 1.0)
+        await asyncio.wait_for(engine.on_market(quote(20010.0), 0.0), 1.0)
+        await asyncio.sleep(0)
+        release.set()
+        await engine.drain()
+
+        assert partitions[0].executor.calls == 1
+        assert engine.coordinator.stats()["coalesced"] == 1
+        assert [b["enforcement"] for b in engine.breaches] == ["done", "coalesced"]
+
+    @pytest.mark.asyncio
+    async def test_failed_enforcement_is_recorded(self):
+        engine, partitions, _ = make_engine({HEALTHY}, None)
+        partitions[1].executor.flatten = Mock(side_effect=RuntimeError("boom"))
+
+        await engine.on_market(quote(20000.0), 0.0)
+        await engine.drain()
+
+        assert [b["enforcement"] for b in engine.breaches] == ["failed"]
+
+    @pytest.mark.asyncio
+    async def test_stalled_enforcement_does_not_delay_due_quotes(self):
+        release = asyncio.Event()
+        engine, partitions, seen = make_engine({STALLED}, release)
+
+        await asyncio.wait_for(engine.on_market(quote(20000.0), 0.0), 1.0)
+        for tick in range(1, 4):
+            # Under move_ticks: merged and released by the conflation tick
+            await asyncio.wait_for(
+                engine.on_market(quote(20000.0 + tick * 0.25), 0.0), 1.0
+            )
+            await asyncio.wait_for(engine.flush_quotes(tick * 1.0), 1.0)
+
+        assert seen == [STALLED, HEALTHY] * 4
+        assert engine.conflator.stats()["released"] == 4
+        assert partitions[0].executor.calls == 1
+        release.set()
+        await engine.drain()
+
+    @pytest.mark.asyncio
+    async def test_run_conflation_releases_while_stalled(self):
+        release = asyncio.Event()
+        engine, _, seen = make_engine({STALLED}, release)
+        engine.conflator.configure({"conflate_ms": 5})
+        worker = asyncio.create_task(engine.run_conflation())
+        try:
+            await asyncio.wait_for(engine.on_market(quote(20000.0), 0.0), 1.0)
+            await asyncio.wait_for(engine.on_market(quote(20000.25), 0.0), 1.0)
+            for _ in range(100):
+                if len(seen) == 4:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            worker.cancel()
+            release.set()
+            await engine.drain()
+
+        assert len(seen) == 4
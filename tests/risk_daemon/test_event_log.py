@@ -0,0 +1,178 @@
+"""
+Tests for the per-event-type logging policy.
+
+Test Coverage Goals:
+- "full" writes every event, "sample" one in ``every``, "off" nothing
+- "summary" writes one line per symbol with the count and the min/max of
+  the type's main value once ``interval_s`` has passed
+- configure() writes pending summaries before swapping the policies
+- parse_policies rejects unknown modes and a bad ``every`` or ``interval_s``
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from daemon.event_log import (
+    DEFAULT_SAMPLE_EVERY,
+    DEFAULT_SUMMARY_INTERVAL_S,
+    EventLog,
+    parse_policies,
+)
+
+from project_x_py import EventType
+
+PARTITION = SimpleNamespace(account_id=1, label="1")
+
+
+def quote(last, symbol="F.US.MNQ"):
+    return SimpleNamespace(
+        type=EventType.QUOTE_UPDATE, data={"symbol": symbol, "last": last}
+    )
+
+
+def make_log(clock, settings):
+    log = EventLog(Mock(), Mock())
+    log.clock = clock
+    log.configure(settings)
+    return log
+
+
+def summaries(log):
+    return [
+        call.args[0]
+        for call in log.logger.info.call_args_list
+        if call.args[0].startswith("Event summary")
+    ]
+
+
+class TestRecord:
+    def test_full_by_default(self, clock):
+        log = make_log(clock, {})
+
+        for last in (1.0, 2.0, 3.0):
+            log.record(quote(last), PARTITION)
+
+        assert log.logger.info.call_count == 3
+        assert log.audit.call_count == 3
+        assert "'last': 3.0" in log.audit.call_args.args[0]
+
+    def test_sample_one_in_every(self, clock):
+        log = make_log(clock, {"quote_update": {"mode": "sample", "every": 4}})
+
+        for last in range(10):
+            log.record(quote(float(last)), PARTITION)
+
+        written = [call.args[0] for call in log.audit.call_args_list]
+        assert len(written) == 2
+        assert "'last': 3.0" in written[0] and "'last': 7.0" in written[1]
+        assert written[0].endswith("(1 in 4)")
+
+    def test_off_and_default(self, clock):
+        log = make_log(clock, {"default": "off", "trade_execution": "full"})
+
+        log.record(quote(1.0), PARTITION)
+        log.record(SimpleNamespace(type="trade_execution", data={}), PARTITION)
+
+        assert log.audit.call_count == 1
+
+    def test_summary_min_max_after_interval(self, clock):
+        log = make_log(clock, {"quote_update": {"mode": "summary", "interval_s": 5}})
+
+        for last in (20001.0, 19999.5, 20003.25):
+            log.record(quote(last), PARTITION)
+            clock.advance(1)
+        log.record(quote(7.0, symbol="F.US.ES"), PARTITION)
+        log.flush()
+        assert summaries(log) == []
+        log.audit.assert_not_called()
+
+        clock.advance(2)
+        log.record(quote(20000.0), PARTITION)
+
+        assert summaries(log) == [
+            "Event summary: quote_update MNQ: 4 events in 5.0s, last 19999.5..20003.2",
+            "Event summary: quote_update ES: 1 events in 5.0s, last 7..7",
+        ]
+        # The next period starts empty
+        log.logger.info.reset_mock()
+        log.flush(force=True)
+        assert summaries(log) == []
+
+    def test_flush_writes_ended_periods(self, clock):
+        log = make_log(clock, {"quote_update": {"mode": "summary", "interval_s": 5}})
+        log.record(quote(1.0), PARTITION)
+
+        clock.advance(4.9)
+        log.flush()
+        assert summaries(log) == []
+
+        clock.advance(0.1)
+        log.flush()
+        assert len(summaries(log)) == 1
+
+    def test_summary_without_value(self, clock):
+        log = make_log(clock, {"default": {"mode": "summary", "interval_s": 5}})
+
+        log.record(SimpleNamespace(type="account_update", data={}), PARTITION)
+        log.flush(force=True)
+
+        assert summaries(log) == ["Event summary: account_update -: 1 events in 0.0s"]
+
+    def test_configure_flushes_pending_summaries(self, clock):
+        log = make_log(clock, {"quote_update": {"mode": "summary", "interval_s": 60}})
+        log.record(quote(1.0), PARTITION)
+        log.record(quote(2.0), PARTITION)
+        clock.advance(3)
+
+        log.configure({"quote_update": "full"})
+
+        assert summaries(log) == [
+            "Event summary: quote_update MNQ: 2 events in 3.0s, last 1..2"
+        ]
+        log.record(quote(3.0), PARTITION)
+        assert log.audit.call_count == 1
+
+
+class TestParsePolicies:
+    def test_defaults(self):
+        assert parse_policies({"quote_update": "sample", "default": "full"}) == {
+            "quote_update": (
+                "sample",
+                DEFAULT_SAMPLE_EVERY,
+                DEFAULT_SUMMARY_INTERVAL_S,
+            ),
+            "default": ("full", DEFAULT_SAMPLE_EVERY, DEFAULT_SUMMARY_INTERVAL_S),
+        }
+        assert parse_policies({"x": {"mode": "summary", "interval_s": 2}}) == {
+            "x": ("summary", DEFAULT_SAMPLE_EVERY, 2.0)
+        }
+
+    @pytest.mark.parametrize(
+        "settings",
+        [
+            [],
+            {"quote_update": "verbose"},
+            {"quote_update": {"every": 5}},
+            {"quote_update": {"mode": "sample", "every": 0}},
+            {"quote_update": {"mode": "sample", "every": 2.5}},
+            {"quote_update": {"mode": "sample", "every": True}},
+            {"quote_update": {"mode": "sample", "every": "10"}},
+            {"quote_update": {"mode": "summary", "interval_s": 0}},
+            {"quote_update": {"mode": "summary", "interval_s": -1.0}},
+            {"quote_update": {"mode": "summary", "interval_s": True}},
+            {"quote_update": {"mode": "summary", "interval_s": "5"}},
+        ],
+    )
+    def test_invalid(self, settings):
+        with pytest.raises(ValueError):
+            parse_policies(settings)
+
+    def test_configure_keeps_policies_on_error(self, clock):
+        log = make_log(clock, {"default": "off"})
+
+        with pytest.raises(ValueError):
+            log.configure({"default": {"mode": "sample", "every": 0}})
+
+        log.record(quote(1.0), PARTITION)
+        log.audit.assert_not_called()
@@ -0,0 +1,211 @@
+"""
+Tests for the enforcement lane.
+
+Test Coverage Goals:
+- A 401 refreshes the token once and retries; a second 401 is an error
+- Requests rejected with the same token share one refresh
+- A 429 is reported with its Retry-After and never retried
+- Rejected orders and non-JSON answers raise LaneError
+- AccountOrders sends through the shared client when the lane is disabled,
+  or down before the request left; never after it may have reached the broker
+- start() survives a lane that cannot connect
+"""
+
+import asyncio
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import pytest
+from daemon.enforcement import AccountOrders
+from daemon.lane import EnforcementLane, LaneError
+
+from project_x_py.types import OrderSide
+
+BASE_URL = "https://gateway.test/api"
+CONTRACT = "CON.F.US.MNQ.Z25"
+
+
+def make_client():
+    client = SimpleNamespace(
+        base_url=BASE_URL, session_token="t1", token_expiry=None, config=None
+    )
+
+    async def authenticate():
+        client.session_token = f"t{int(client.session_token[1:]) + 1}"
+
+    client.authenticate = AsyncMock(side_effect=authenticate)
+    client._make_request = AsyncMock(return_value={"success": True, "orderId": 9})
+    return client
+
+
+def make_lane(*responses):
+    """A lane over a mocked transport answering with ``responses`` in turn.
+
+    Each response is an ``httpx.Response`` or an exception to raise.
+    """
+    sent = []
+    answers = iter(responses)
+
+    def handler(request):
+        sent.append(request)
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    lane = EnforcementLane(make_client(), Mock(), Mock())
+    lane._http = httpx.AsyncClient(
+        base_url=BASE_URL, transport=httpx.MockTransport(handler)
+    )
+    return lane, sent
+
+
+def placed(order_id=7):
+    return httpx.Response(200, json={"success": True, "orderId": order_id})
+
+
+class TestPost:
+    @pytest.mark.asyncio
+    async def test_401_refreshes_once_and_retries(self):
+        lane, sent = make_lane(httpx.Response(401), placed())
+
+        response = await lane.place_market_order(CONTRACT, OrderSide.SELL, 2, 11)
+
+        assert response.orderId == 7
+        assert [request.headers["Authorization"] for request in sent] == [
+            "Bearer t1",
+            "Bearer t2",
+        ]
+        assert sent[1].url.path == "/api/Order/place"
+        lane.client.authenticate.assert_awaited_once()
+        assert (lane.requests, lane.refreshes) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_second_401_is_an_error(self):
+        lane, sent = make_lane(httpx.Response(401), httpx.Response(401))
+
+        with pytest.raises(LaneError, match="HTTP 401"):
+            await lane.cancel_order(5, 11)
+
+        assert len(sent) == 2
+        lane.client.authenticate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_401s_share_one_refresh(self):
+        lane, _ = make_lane()
+        calls = []
+
+        async def answer(request):
+            calls.append(request.headers["Authorization"])
+            # The second request is answered after the first one's refresh
+            await asyncio.sleep(0.01 if len(calls) == 2 else 0)
+            if request.headers["Authorization"] == "Bearer t1":
+                return httpx.Response(401)
+            return placed()
+
+        lane._http = httpx.AsyncClient(
+            base_url=BASE_URL, transport=httpx.MockTransport(answer)
+        )
+
+        await asyncio.gather(
+            lane.place_market_order(CONTRACT, OrderSide.SELL, 1, 11),
+            lane.cancel_order(5, 11),
+        )
+
+        lane.client.authenticate.assert_awaited_once()
+        assert calls.count("Bearer t1") == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limited(self):
+        lane, sent = make_lane(httpx.Response(429, headers={"Retry-After": "3"}))
+
+        with pytest.raises(LaneError, match=r"rate limited \(Retry-After 3s\)"):
+            await lane.place_market_order(CONTRACT, OrderSide.BUY, 1, 11)
+
+        assert len(sent) == 1
+        lane.client.authenticate.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_rejected_and_malformed_answers(self):
+        lane, _ = make_lane(
+            httpx.Response(200, json={"success": False, "errorMessage": "closed"}),
+            httpx.Response(200, text="<html>"),
+            httpx.Response(200, json=[1]),
+        )
+
+        with pytest.raises(LaneError, match="closed"):
+            await lane.place_market_order(CONTRACT, OrderSide.BUY, 1, 11)
+        with pytest.raises(LaneError, match="invalid JSON"):
+            await lane.cancel_order(5, 11)
+        with pytest.raises(LaneError, match="unexpected response"):
+            await lane.ping()
+
+
+class TestFallback:
+    @pytest.mark.asyncio
+    async def test_lane_disabled(self):
+        client = make_client()
+        orders = AccountOrders(client, Mock(), 11)
+
+        response = await orders.place_market_order(CONTRACT, OrderSide.SELL, 3, 12)
+
+        assert response.orderId == 9
+        payload = client._make_request.await_args.kwargs["data"]
+        assert (payload["accountId"], payload["side"], payload["size"]) == (12, 1, 3)
+
+    @pytest.mark.asyncio
+    async def test_lane_down_uses_shared_client(self):
+        lane, _ = make_lane(
+            httpx.ConnectError("refused"), httpx.ConnectTimeout("timed out")
+        )
+        sdk_orders = Mock(cancel_order=AsyncMock(return_value=True))
+        orders = AccountOrders(lane.client, sdk_orders, 11, lane)
+
+        response = await orders.place_market_order(CONTRACT, OrderSide.SELL, 3)
+        assert await orders.cancel_order(5)
+
+        assert response.orderId == 9
+        assert lane.client._make_request.await_args.kwargs["data"]["accountId"] == 11
+        sdk_orders.cancel_order.assert_awaited_once_with(5, 11)
+        assert lane.stats()["fallbacks"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "answer",
+        [
+            httpx.ReadTimeout("no answer"),
+            httpx.Response(429),
+            httpx.Response(500),
+        ],
+    )
+    async def test_no_resend_once_sent(self, answer):
+        lane, _ = make_lane(answer)
+        orders = AccountOrders(lane.client, Mock(), 11, lane)
+
+        with pytest.raises(LaneError):
+            await orders.place_market_order(CONTRACT, OrderSide.SELL, 3)
+
+        lane.client._make_request.assert_not_awaited()
+        assert lane.fallbacks == 0
+
+    @pytest.mark.asyncio
+    async def test_start_without_connection(self, monkeypatch):
+        def refuse(request):
+            raise httpx.ConnectError("refused")
+
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            partial(httpx.AsyncClient, transport=httpx.MockTransport(refuse)),
+        )
+        lane = EnforcementLane(make_client(), Mock(), Mock())
+
+        await lane.start()
+        try:
+            lane.logger.warning.assert_called_once()
+            assert lane.pings == 0
+            assert len(lane._tasks) == 2
+        finally:
+            await lane.close()
@@ -0,0 +1,59 @@
+"""
+Tests for the synthetic load generator.
+
+Test Coverage Goals:
+- A short storm through the real RuleEngine hands every produced event to
+  the engine and reports consistent counts
+- Position updates over the limit reach the stub executor
+- ramp() doubles the quote rate each step; the report formatters accept
+  what run() and ramp() return
+"""
+
+import pytest
+from daemon.loadtest import EventStorm, format_load_report, format_ramp
+
+CONFIG = {
+    "dry_run": True,
+    "symbols": ["MNQ"],
+    "rules": {"max_contracts": {"enabled": True, "parameters": {"max_contracts": 2}}},
+    "event_logging": {"quote_update": "summary"},
+}
+PROFILE = {
+    "quotes_per_s": 500,
+    "fills_per_s": 20,
+    "positions_per_s": 50,
+    "burst_every_s": 0.1,
+    "burst_size": 5,
+    "accounts": 2,
+    "duration_s": 0.3,
+}
+
+
+class TestEventStorm:
+    @pytest.mark.asyncio
+    async def test_small_storm(self):
+        storm = EventStorm(CONFIG, PROFILE)
+
+        report = await storm.run()
+
+        assert report["produced"] > 0
+        assert report["completed"] == report["produced"]
+        assert not report["saturated"]
+        assert report["latency"]["count"] == report["produced"]
+        quotes = report["quotes"]
+        assert 0 < quotes["received"] < report["produced"]
+        assert quotes["released"] <= quotes["received"]
+        assert report["offered_per_s"] == 500 + 20 + 50 + 50
+        assert "rule:max_contracts" in report["stages"]
+        assert report["breaches"] >= report["orders"] > 0
+        assert len(format_load_report(report)) >= 3
+
+    @pytest.mark.asyncio
+    async def test_ramp_doubles_quote_rate(self):
+        storm = EventStorm(CONFIG, {**PROFILE, "duration_s": 0.1, "burst_every_s": 0})
+
+        reports = await storm.ramp(2)
+
+        assert [report["quotes_per_s"] for report in reports] == [500, 1000]
+        assert [report["offered_per_s"] for report in reports] == [570, 1070]
+        assert format_ramp(reports)[-1].startswith("Not saturated")
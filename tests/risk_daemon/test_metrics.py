@@ -0,0 +1,142 @@
+"""
+Tests for the daemon's latency histograms.
+
+Test Coverage Goals:
+- Values below 128us get their own bucket and are reported exactly
+- Bucket boundaries at 128/129 and 255/256; every value falls at or below
+  its bucket's upper bound, within 1/64 of it
+- Percentiles never exceed the largest value recorded
+- An empty histogram summarizes to a count of 0 and is left out of the table
+"""
+
+import json
+
+import pytest
+from daemon.metrics import (
+    BUCKET_COUNT,
+    DaemonMetrics,
+    LatencyHistogram,
+    _index,
+    _upper_bound,
+    format_latency,
+)
+
+
+def micros(value):
+    """Seconds that ``record`` truncates back to exactly ``value`` microseconds."""
+    return (value + 0.5) / 1_000_000
+
+
+class TestBuckets:
+    def test_values_below_128us_are_exact(self):
+        for value in range(128):
+            assert _index(value) == value
+            assert _upper_bound(value) == value
+
+    @pytest.mark.parametrize(
+        ("value", "index", "upper"),
+        [
+            (127, 127, 127),
+            (128, 128, 129),
+            (129, 128, 129),
+            (130, 129, 131),
+            (255, 191, 255),
+            (256, 192, 259),
+            (259, 192, 259),
+            (260, 193, 263),
+        ],
+    )
+    def test_boundaries(self, value, index, upper):
+        assert _index(value) == index
+        assert _upper_bound(index) == upper
+
+    def test_upper_bound_within_relative_error(self):
+        previous = -1
+        for value in [
+            *range(4096),
+            *(2**k + d for k in range(12, 40) for d in (-1, 0, 1)),
+        ]:
+            index = _index(value)
+            assert index >= previous
+            previous = index
+            upper = _upper_bound(index)
+            assert value <= upper <= value + value / 64
+        assert _index(2**62) < BUCKET_COUNT
+
+
+class TestLatencyHistogram:
+    def test_exact_percentiles_below_128us(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(micros(value))
+
+        assert histogram.percentile(1) == 1
+        assert histogram.percentile(50) == 50
+        assert histogram.percentile(99) == 99
+        assert histogram.percentile(100) == 100
+        assert (histogram.min, histogram.max, histogram.count) == (1, 100, 100)
+
+    def test_percentile_capped_at_max(self):
+        histogram = LatencyHistogram()
+        histogram.record(micros(130))
+
+        # 130 shares the 130-131 bucket; the bucket's upper bound was never seen
+        assert histogram.percentile(50) == 130
+        assert histogram.percentile(99.9) == 130
+
+        for value in (1_000, 123_456, 5_000_000):
+            histogram.record(micros(value))
+            assert histogram.percentile(100) == value
+
+    def test_negative_values_count_as_zero(self):
+        histogram = LatencyHistogram()
+        histogram.record(-0.5)
+
+        assert (histogram.count, histogram.min, histogram.max) == (1, 0, 0)
+        assert histogram.percentile(50) == 0
+
+    def test_empty_summary(self):
+        histogram = LatencyHistogram()
+
+        assert histogram.summary() == {"count": 0}
+        assert histogram.percentile(99) == 0
+
+        histogram.record(micros(2_000))
+        histogram.reset()
+        assert histogram.summary() == {"count": 0}
+        assert not any(histogram.counts)
+
+    def test_summary(self):
+        histogram = LatencyHistogram()
+        for value in (1_000, 2_000, 3_000):
+            histogram.record(micros(value))
+
+        assert histogram.summary() == {
+            "count": 3,
+            "mean_ms": 2.0,
+            "min_ms": 1.0,
+            # Above 128us a percentile is its bucket's upper bound: 2000-2015us
+            "p50_ms": 2.015,
+            "p99_ms": 3.0,
+            "p99_9_ms": 3.0,
+            "max_ms": 3.0,
+        }
+
+
+class TestDaemonMetrics:
+    def test_snapshot_and_table(self, tmp_path):
+        metrics = DaemonMetrics()
+        metrics.record("rule_eval", micros(40))
+        metrics.histogram("ack")
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["latency"]["ack"] == {"count": 0}
+        assert snapshot["latency"]["rule_eval"]["max_ms"] == 0.04
+        lines = format_latency(snapshot)
+        assert len(lines) == 2
+        assert lines[1].startswith("rule_eval")
+
+        path = tmp_path / "metrics.json"
+        metrics.dump(path)
+        assert json.loads(path.read_text())["latency"]["ack"] == {"count": 0}
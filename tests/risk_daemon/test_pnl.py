@@ -0,0 +1,151 @@
+"""
+Tests for session P&L tracking and the loss rules built on it.
+
+Test Coverage Goals:
+- A session starts at the first update and resets at reset_time in its
+  timezone, clearing the high-water mark and the latch
+- The loss rules breach once per session, and again only while a position
+  is open
+- Sessions survive dump/load
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import pytest
+from daemon.account_state import AccountState
+from daemon.pnl import PnlSession, parse_session, session_for
+from rules import daily_loss_limit, trailing_drawdown
+
+from project_x_py import EventType
+
+CHICAGO = ZoneInfo("America/Chicago")
+CONTRACT = "CON.F.US.MNQ.Z25"
+
+
+def at(hour, minute=0, day=3):
+    return datetime(2025, 3, day, hour, minute, tzinfo=CHICAGO).timestamp()
+
+
+def trade(pnl):
+    return SimpleNamespace(
+        type="trade_execution",
+        data={"contractId": CONTRACT, "profitAndLoss": pnl, "fees": 0.0},
+    )
+
+
+def make_state(now):
+    state = AccountState(1)
+    state.clock = lambda: now[0]
+    return state
+
+
+class TestPnlSession:
+    def test_reset_at_session_boundary(self):
+        session = PnlSession(*parse_session({"reset_time": "17:00"}))
+
+        session.update(100.0, at(9))
+        session.update(250.0, at(10))
+        session.latched = True
+        assert session.session_pnl(150.0) == 50.0
+        assert session.drawdown(150.0) == 100.0
+
+        # Still the same session a minute before the reset
+        session.update(120.0, at(16, 59))
+        assert session.start == 100.0
+        assert session.latched
+
+        session.update(120.0, at(17, 0))
+        assert (session.start, session.peak, session.latched) == (120.0, 120.0, False)
+        assert session.next_reset == at(17, 0, day=4)
+
+    def test_no_reset_time(self):
+        session = PnlSession(*parse_session({"reset_time": None}))
+
+        session.update(0.0, at(9))
+        session.update(-50.0, at(17, 0, day=10))
+
+        assert session.session_pnl(-50.0) == -50.0
+
+    def test_dump_and_load(self):
+        session = PnlSession(*parse_session({"reset_time": "16:30"}))
+        session.update(10.0, at(9))
+        session.update(40.0, at(10))
+        session.latched = True
+
+        restored = PnlSession.load(session.dump())
+
+        assert restored.dump() == session.dump()
+        assert restored.tz == CHICAGO
+
+    @pytest.mark.parametrize(
+        "parameters", [{"timezone": "Mars/Olympus"}, {"reset_time": "5pm"}]
+    )
+    def test_invalid_schedule(self, parameters):
+        with pytest.raises(ValueError):
+            parse_session(parameters)
+
+    def test_session_rebuilt_when_schedule_changes(self):
+        state = AccountState(1)
+        first = session_for(state, "rule", {"session": parse_session({})})
+
+        assert session_for(state, "rule", {"session": parse_session({})}) is first
+        changed = {"session": parse_session({"reset_time": "18:00"})}
+        assert session_for(state, "rule", changed) is not first
+
+
+class TestLossRules:
+    def test_daily_loss_latches_until_reset(self):
+        now = [at(9)]
+        state = make_state(now)
+        config = daily_loss_limit.prepare(
+            {"enabled": True, "parameters": {"max_loss_usd": 100}}
+        )
+
+        def check(event):
+            state.apply(event)
+            return daily_loss_limit.check(event, config, state)["status"]
+
+        # The session opens at the P&L of its first update
+        assert check(trade(None)) == "VALID"
+        assert check(trade(-60.0)) == "VALID"
+        assert check(trade(-50.0)) == "BREACH"
+        # Latched: flat account, further losses do not breach again
+        assert check(trade(-10.0)) == "VALID"
+
+        # An opened position breaches again while the loss stands
+        position = SimpleNamespace(
+            type=EventType.POSITION_UPDATED,
+            data={"contractId": CONTRACT, "accountId": 1, "type": 1, "size": 1},
+        )
+        assert check(position) == "BREACH"
+
+        # Next session starts from the current P&L
+        now[0] = at(17, 0)
+        assert check(trade(-10.0)) == "VALID"
+
+    def test_trailing_drawdown_from_peak(self):
+        now = [at(9)]
+        state = make_state(now)
+        config = trailing_drawdown.prepare(
+            {"enabled": True, "parameters": {"max_drawdown_usd": 100}}
+        )
+
+        def check(pnl):
+            event = trade(pnl)
+            state.apply(event)
+            return trailing_drawdown.check(event, config, state)["status"]
+
+        assert check(None) == "VALID"
+        assert check(300.0) == "VALID"
+        assert check(-50.0) == "VALID"
+        assert check(50.0) == "VALID"
+        # Peak 300, now 180: drawdown 120
+        assert check(-120.0) == "BREACH"
+        assert check(-20.0) == "VALID"
+
+    @pytest.mark.parametrize("limit", [0, -5, True, "100"])
+    def test_invalid_limits(self, limit):
+        with pytest.raises(ValueError):
+            daily_loss_limit.prepare({"parameters": {"max_loss_usd": limit}})
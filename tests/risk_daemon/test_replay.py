@@ -0,0 +1,180 @@
+"""
+Tests for replaying recorded event streams.
+
+Test Coverage Goals:
+- Audit records written by EventLog parse back into the same events, full
+  and sampled, with their account; quotes are shared by all accounts
+- Audit lines from older daemons (dry-run note, no account) still parse;
+  object reprs and broken lines are skipped and counted
+- Capture records yield seeds, raw user-hub payloads and market events
+- replay() of either input reaches the same breach and flatten order
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from daemon.audit_writer import AuditWriter
+from daemon.capture import EventCapture
+from daemon.event_log import EventLog
+from daemon.replay import UNKNOWN_ACCOUNT, RecordedStream, replay
+
+from project_x_py import EventType
+
+CONTRACT = "CON.F.US.MNQ.Z25"
+PARTITION = SimpleNamespace(account_id=2, label="Eval-2 (2)")
+CONFIG = {
+    "dry_run": True,
+    "symbols": ["MNQ"],
+    "rules": {"max_contracts": {"enabled": True, "parameters": {"max_contracts": 2}}},
+}
+POSITION = {
+    "accountId": 2,
+    "contractId": CONTRACT,
+    "type": 1,  # PositionType.LONG, as the user hub sends it
+    "size": 3,
+    "averagePrice": 20000.25,
+}
+
+
+def write_audit(path, events, settings=None):
+    writer = AuditWriter(path, flush_interval_ms=5)
+    log = EventLog(Mock(), writer.write)
+    log.configure(settings or {})
+    for event in events:
+        log.record(event, PARTITION)
+    writer.close()
+
+
+def quote(last):
+    return SimpleNamespace(
+        type=EventType.QUOTE_UPDATE, data={"symbol": "F.US.MNQ", "last": last}
+    )
+
+
+class TestAuditInput:
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        path = tmp_path / "audit.ndjson"
+        fill = {"contractId": CONTRACT, "price": 20000.5, "profitAndLoss": None}
+        write_audit(
+            path,
+            [
+                SimpleNamespace(type=EventType.POSITION_UPDATED, data=POSITION),
+                SimpleNamespace(type="trade_execution", data=fill),
+                *(quote(20000.0 + i) for i in range(4)),
+            ],
+            {"quote_update": {"mode": "sample", "every": 2}},
+        )
+
+        stream = RecordedStream(path)
+        items = list(stream)
+
+        assert (stream.format, stream.skipped) == ("audit", 0)
+        assert [(account, kind) for _, account, kind, _ in items] == [
+            (2, "event"),
+            (2, "event"),
+            (None, "event"),
+            (None, "event"),
+        ]
+        events = [item[3] for item in items]
+        assert [event.type for event in events] == [
+            EventType.POSITION_UPDATED,
+            "trade_execution",
+            EventType.QUOTE_UPDATE,
+            EventType.QUOTE_UPDATE,
+        ]
+        assert events[0].data == POSITION
+        assert events[1].data == fill
+        assert [event.data["last"] for event in events[2:]] == [20001.0, 20003.0]
+
+    @pytest.mark.asyncio
+    async def test_older_and_unreadable_lines(self, tmp_path):
+        path = tmp_path / "audit.ndjson"
+        records = [
+            # Written before events carried an account, with the dry-run note
+            "Received event: EventType.POSITION_UPDATED. Data: {'size': 1}. "
+            "In dry-run mode, no action taken.",
+            "Received event: order_update on account 7. Data: {'id': 1}. "
+            "In dry-run mode, no action taken. (1 in 10)",
+            "Received event: EventType.ORDER_FILLED on account 7. "
+            "Data: {'order': Order(id=1)}.",
+            "Breach detected: max_contracts",
+        ]
+        path.write_text(
+            "".join(
+                json.dumps({"timestamp": "2025-03-03T09:30:00", "message": message})
+                + "\n"
+                for message in records
+            )
+            + "{not json\n"
+        )
+
+        stream = RecordedStream(path)
+        items = list(stream)
+
+        assert [
+            (account, event.type, event.data) for _, account, _, event in items
+        ] == [
+            (UNKNOWN_ACCOUNT, EventType.POSITION_UPDATED, {"size": 1}),
+            (7, "order_update", {"id": 1}),
+        ]
+        assert (stream.lines, stream.skipped) == (5, 2)
+
+
+class TestCaptureInput:
+    @pytest.mark.asyncio
+    async def test_kinds(self, tmp_path):
+        path = tmp_path / "events.ndjson"
+        capture = EventCapture(path, flush_interval_ms=5)
+        capture.record(2, "seed", {"positions": [], "orders": []})
+        capture.record(2, "position_update", {"action": 1, "data": POSITION})
+        capture.record(None, "quote_update", {"symbol": "F.US.MNQ", "last": 1.0})
+        capture.close()
+
+        stream = RecordedStream(path)
+        items = list(stream)
+
+        assert stream.format == "capture"
+        assert [(account, kind) for _, account, kind, _ in items] == [
+            (2, "seed"),
+            (2, "raw"),
+            (None, "event"),
+        ]
+        assert items[1][3] == ("position_update", {"action": 1, "data": POSITION})
+        assert items[2][3].type == EventType.QUOTE_UPDATE
+
+
+class TestReplay:
+    @pytest.mark.asyncio
+    async def test_capture_and_audit_agree(self, tmp_path):
+        seed = {**POSITION, "id": 1, "creationTimestamp": "", "size": 1}
+        capture_path = tmp_path / "events.ndjson"
+        capture = EventCapture(capture_path, flush_interval_ms=5)
+        capture.record(2, "seed", {"positions": [seed], "orders": []})
+        capture.record(2, "position_update", POSITION)
+        capture.close()
+        audit_path = tmp_path / "audit.ndjson"
+        write_audit(
+            audit_path,
+            [SimpleNamespace(type=EventType.POSITION_UPDATED, data=POSITION)],
+        )
+
+        reports = [
+            await replay(capture_path, CONFIG),
+            await replay(audit_path, CONFIG),
+        ]
+
+        for report in reports:
+            assert (report["events"], report["skipped"], report["accounts"]) == (
+                1,
+                0,
+                1,
+            )
+            assert [breach["rule"] for breach in report["breaches"]] == [
+                "max_contracts"
+            ]
+            (order,) = report["orders"]
+            assert (order["account"], order["contract"]) == (2, CONTRACT)
+            assert (order["side"], order["size"]) == ("SELL", 3)
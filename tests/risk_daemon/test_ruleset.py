@@ -0,0 +1,156 @@
+"""
+Tests for validated rule sets and hot reload.
+
+Test Coverage Goals:
+- A valid config builds a RuleSet with its rules and dispatch table
+- Invalid configs, bad rule parameters and missing rule modules are
+  rejected whole, leaving the active rule set in place
+- Start-up (strict=False) skips rules that fail to import
+- An event mid-enforcement keeps the rule set it started with
+- config_diff lists changes by path
+"""
+
+import asyncio
+import copy
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from daemon.account_state import AccountState
+from daemon.engine import RuleEngine
+from daemon.metrics import DaemonMetrics
+from daemon.ruleset import ConfigError, build_ruleset, config_diff
+from daemon.supervisor import AccountPartition
+
+from project_x_py import EventType
+
+CONFIG = {
+    "dry_run": False,
+    "symbols": ["MNQ"],
+    "rules": {
+        "max_contracts": {"enabled": True, "parameters": {"max_contracts": 2}},
+        "daily_loss_limit": {"enabled": False, "parameters": {}},
+    },
+}
+
+
+def config_with(**changes):
+    config = copy.deepcopy(CONFIG)
+    for path, value in changes.items():
+        *parents, key = path.split("__")
+        target = config
+        for parent in parents:
+            target = target[parent]
+        target[key] = value
+    return config
+
+
+def reload(engine, config):
+    """Swap in a new rule set the way risk_daemon.reload_config does."""
+    current = engine.ruleset
+    try:
+        engine.ruleset = build_ruleset(config, current.version + 1)
+    except ValueError:
+        return False
+    return True
+
+
+class TestBuildRuleset:
+    def test_valid_config(self):
+        ruleset = build_ruleset(CONFIG, version=1)
+
+        assert list(ruleset.rules) == ["max_contracts"]
+        assert ruleset.event_types == [
+            EventType.POSITION_UPDATED,
+            EventType.ORDER_FILLED,
+        ]
+        assert not ruleset.dry_run
+        assert ruleset.shadow is None
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            config_with(dry_run="no"),
+            config_with(symbols="MNQ"),
+            config_with(audit={"fsync": "always"}),
+            config_with(quotes={"conflate_ms": -1}),
+            config_with(rules__max_contracts={"parameters": {}}),
+            config_with(rules__max_contracts__parameters={"max_contracts": -1}),
+            config_with(rules__no_such_rule={"enabled": True}),
+            config_with(shadow={"enabled": True}),
+        ],
+    )
+    def test_rejected_reload_keeps_the_old_set(self, config):
+        engine = SimpleNamespace(ruleset=build_ruleset(CONFIG, version=1))
+        before = engine.ruleset
+
+        assert not reload(engine, config)
+        assert engine.ruleset is before
+        assert engine.ruleset.version == 1
+
+    def test_accepted_reload(self):
+        engine = SimpleNamespace(ruleset=build_ruleset(CONFIG, version=1))
+
+        changed = config_with(rules__max_contracts__parameters={"max_contracts": 5})
+        assert reload(engine, changed)
+
+        assert engine.ruleset.version == 2
+        [binding] = engine.ruleset.dispatcher.bindings
+        assert binding.config["parameters"]["max_contracts"] == 5
+
+    def test_start_up_skips_missing_rules(self):
+        config = config_with(rules__no_such_rule={"enabled": True})
+
+        with pytest.raises(ConfigError, match="rules.no_such_rule"):
+            build_ruleset(config, version=1)
+        ruleset = build_ruleset(config, version=1, strict=False)
+        assert list(ruleset.rules) == ["max_contracts"]
+        assert ruleset.errors[0].startswith("no_such_rule:")
+
+    def test_config_diff(self):
+        new = config_with(
+            dry_run=True, rules__max_contracts__parameters={"max_contracts": 3}
+        )
+        del new["symbols"]
+
+        assert config_diff(CONFIG, new) == [
+            "dry_run: False -> True",
+            "rules.max_contracts.parameters.max_contracts: 2 -> 3",
+            "symbols: removed",
+        ]
+
+
+class TestSwapDuringEnforcement:
+    @pytest.mark.asyncio
+    async def test_event_keeps_its_rule_set(self):
+        release = asyncio.Event()
+
+        class Executor:
+            async def flatten(self, identifier, reason, event_time, decision_time):
+                await release.wait()
+                return "done"
+
+        state = AccountState(1)
+        partition = AccountPartition(1, None, None, None, state, Executor(), True)
+        engine = RuleEngine(
+            build_ruleset(CONFIG, version=1),
+            [partition],
+            DaemonMetrics(),
+            Mock(),
+            Mock(),
+            "MNQ",
+            log_events=False,
+        )
+        position = SimpleNamespace(
+            type=EventType.POSITION_UPDATED,
+            data={"contractId": "CON.F.US.MNQ.Z25", "type": 1, "size": 3},
+        )
+
+        await engine.handle(position, partition, 0.0)
+        assert reload(engine, config_with(dry_run=True))
+        release.set()
+        await engine.drain()
+
+        # Enforced under version 1, although version 2 is dry-run
+        assert [b["enforcement"] for b in engine.breaches] == ["done"]
+        assert engine.ruleset.version == 2
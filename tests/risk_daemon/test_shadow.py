@@ -0,0 +1,223 @@
+"""
+Tests for shadow evaluation of a candidate rule set.
+
+Test Coverage Goals:
+- Each rule is classified as both, live_only, shadow_only or action_differs,
+  per rule and in total, with one audit record per difference
+- Events nothing breached on are counted but not compared
+- A candidate rule sharing a live rule's name keeps its own memory: it
+  neither advances the live window nor latches the live session
+- shadow_config swaps in the candidate rules and symbols
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from daemon.account_state import AccountState
+from daemon.dispatch import RuleDispatcher
+from daemon.metrics import DaemonMetrics
+from daemon.shadow import (
+    ACTION_DIFFERS,
+    BOTH,
+    LIVE_ONLY,
+    SHADOW_ONLY,
+    ShadowLane,
+    shadow_config,
+)
+from rules import max_trades_per_window, trailing_drawdown
+
+CONTRACT = "CON.F.US.MNQ.Z25"
+
+
+def trade(pnl=None):
+    return SimpleNamespace(
+        type="trade_execution",
+        data={"contractId": CONTRACT, "profitAndLoss": pnl, "fees": 0.0},
+    )
+
+
+def static_rule(action):
+    """A rule that breaches with ``action`` on every fill, or never if None."""
+
+    def check(event, config, state):
+        if action is None:
+            return {"status": "VALID", "reason": "", "action": ""}
+        return {"status": "BREACH", "reason": f"would {action}", "action": action}
+
+    return SimpleNamespace(EVENT_TYPES=("trade_execution",), check=check)
+
+
+def rule_set(rules, configs=None):
+    configs = configs or {name: {} for name in rules}
+    return SimpleNamespace(dispatcher=RuleDispatcher(rules, {"rules": configs}))
+
+
+def make_partition(state=None):
+    return SimpleNamespace(account_id=1, label="1", state=state or AccountState(1))
+
+
+def make_lane():
+    audit = Mock()
+    return ShadowLane(DaemonMetrics(), Mock(), audit), audit
+
+
+def run_both(live, shadow, lane, partition, event):
+    """Apply ``event``, evaluate the live rules, then hand their breaches to the lane."""
+    state = partition.state
+    state.apply(event)
+    breaches = []
+    for binding in live.dispatcher.rules_for(event):
+        result = binding.evaluate(event, state)
+        if result["status"] == "BREACH":
+            breaches.append((binding.name, result["action"], result["reason"]))
+    lane.evaluate(shadow, event, partition, breaches)
+    return breaches
+
+
+class TestCompare:
+    def test_differences_are_classified(self):
+        lane, audit = make_lane()
+        shadow = rule_set(
+            {
+                "same": static_rule("flatten"),
+                "added": static_rule("flatten"),
+                "changed": static_rule("flatten_all"),
+                "removed": static_rule(None),
+            }
+        )
+        live = [
+            ("same", "flatten", "r"),
+            ("changed", "flatten", "r"),
+            ("removed", "flatten", "r"),
+        ]
+
+        lane.evaluate(shadow, trade(), make_partition(), live)
+
+        stats = lane.stats()
+        assert stats["events"] == 1
+        assert [stats[kind] for kind in (BOTH, LIVE_ONLY, SHADOW_ONLY)] == [1, 1, 1]
+        assert stats[ACTION_DIFFERS] == 1
+        assert stats["rules"]["same"] == {
+            "live": 1,
+            "shadow": 1,
+            LIVE_ONLY: 0,
+            SHADOW_ONLY: 0,
+            ACTION_DIFFERS: 0,
+        }
+        assert stats["rules"]["changed"][ACTION_DIFFERS] == 1
+        assert stats["rules"]["added"]["live"] == 0
+        assert stats["rules"]["removed"]["shadow"] == 0
+
+        differences = {
+            call.kwargs["fields"]["rule"]: call.kwargs["fields"]["difference"]
+            for call in audit.call_args_list
+        }
+        assert differences == {
+            "added": SHADOW_ONLY,
+            "changed": ACTION_DIFFERS,
+            "removed": LIVE_ONLY,
+        }
+        fields = audit.call_args_list[0].kwargs["fields"]
+        assert (fields["kind"], fields["account"], fields["contract"]) == (
+            "shadow",
+            1,
+            CONTRACT,
+        )
+
+    def test_no_breach_is_not_compared(self):
+        lane, audit = make_lane()
+
+        lane.evaluate(
+            rule_set({"quiet": static_rule(None)}), trade(), make_partition(), []
+        )
+
+        stats = lane.stats()
+        assert stats["events"] == 1
+        assert stats["rules"] == {}
+        assert not any(stats[kind] for kind in (BOTH, LIVE_ONLY, SHADOW_ONLY))
+        audit.assert_not_called()
+
+
+class TestShadowState:
+    def test_candidate_window_is_separate(self, clock):
+        rules = {"max_trades_per_window": max_trades_per_window}
+        live = rule_set(
+            rules,
+            {
+                "max_trades_per_window": {
+                    "enabled": True,
+                    "parameters": {"max_trades": 2},
+                }
+            },
+        )
+        # Same name and window, so the same WindowSpec: only ShadowState keeps them apart
+        shadow = rule_set(
+            rules,
+            {
+                "max_trades_per_window": {
+                    "enabled": True,
+                    "parameters": {"max_trades": 1},
+                }
+            },
+        )
+        partition = make_partition()
+        partition.state.clock = clock
+        lane, _ = make_lane()
+
+        for _ in range(2):
+            assert run_both(live, shadow, lane, partition, trade()) == []
+            clock.advance(1)
+
+        assert lane.counts[SHADOW_ONLY] == 1
+        spec = live.dispatcher.bindings[0].config["windows"]["trades"]
+        assert partition.state.window(spec, CONTRACT).total(clock()) == (2, 2.0)
+
+    def test_candidate_session_does_not_latch_live(self, clock):
+        rules = {"trailing_drawdown": trailing_drawdown}
+        live = rule_set(
+            rules,
+            {
+                "trailing_drawdown": {
+                    "enabled": True,
+                    "parameters": {"max_drawdown_usd": 1000},
+                }
+            },
+        )
+        shadow = rule_set(
+            rules,
+            {
+                "trailing_drawdown": {
+                    "enabled": True,
+                    "parameters": {"max_drawdown_usd": 100},
+                }
+            },
+        )
+        partition = make_partition()
+        partition.state.clock = clock
+        lane, _ = make_lane()
+
+        for pnl in (None, 300.0, -250.0):
+            assert run_both(live, shadow, lane, partition, trade(pnl)) == []
+
+        assert lane.counts[SHADOW_ONLY] == 1
+        session = partition.state.rule_state("trailing_drawdown")["session"]
+        assert session.peak == 300.0
+        assert not session.latched
+
+
+class TestShadowConfig:
+    def test_swaps_rules_and_symbols(self):
+        config = {
+            "dry_run": False,
+            "symbols": ["MNQ"],
+            "rules": {"live": {}},
+            "shadow": {"rules": {"candidate": {}}, "symbols": ["ES"]},
+        }
+
+        assert shadow_config(config) == {
+            "dry_run": False,
+            "symbols": ["ES"],
+            "rules": {"candidate": {}},
+        }
+        del config["shadow"]["symbols"]
+        assert shadow_config(config)["symbols"] == ["MNQ"]
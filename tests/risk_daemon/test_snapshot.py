@@ -0,0 +1,227 @@
+"""
+Tests for the crash-recovery snapshot.
+
+Test Coverage Goals:
+- A torn or corrupted half falls back to the other half's generation
+- Growing the file never overwrites the only valid copy
+- Accounts are re-encoded only when their saved state changed; quotes that
+  do not move a P&L session leave them alone
+- The enforcement journal is written to its own file, without a snapshot write
+- A saved account and journal are restored and reconciled on start
+"""
+
+import json
+import math
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from daemon import snapshot as snapshot_module
+from daemon.account_state import AccountState
+from daemon.pnl import PnlSession, parse_session
+from daemon.snapshot import (
+    HEADER,
+    MappedHalves,
+    StateSnapshot,
+    restore_account,
+)
+
+from project_x_py import EventType
+
+CONTRACT = "CON.F.US.MNQ.Z25"
+
+
+def event(event_type, data):
+    return SimpleNamespace(type=event_type, data=data)
+
+
+def quote(price):
+    return event(EventType.QUOTE_UPDATE, {"symbol": "F.US.MNQ", "last": price})
+
+
+def position(size):
+    return event(
+        EventType.POSITION_UPDATED,
+        {
+            "contractId": CONTRACT,
+            "accountId": 1,
+            "type": 1,
+            "size": size,
+            "averagePrice": 20000.0,
+        },
+    )
+
+
+def make_partition(account_id=1):
+    state = AccountState(account_id)
+    state.set_point_value("MNQ", 2.0)
+    return SimpleNamespace(account_id=account_id, label=str(account_id), state=state)
+
+
+def tear(path, offset):
+    with open(path, "r+b") as f:
+        f.seek(offset + HEADER.size)
+        f.write(b"\xff\xff")
+
+
+class TestMappedHalves:
+    def test_torn_half_falls_back_to_previous_generation(self, tmp_path):
+        halves = MappedHalves(tmp_path / "state.snap", 1024)
+        halves.open()
+        halves.write(b'{"n":1}')
+        halves.write(b'{"n":2}')
+        halves.close()
+
+        # Generation 2 is in the first half
+        tear(halves.path, 0)
+
+        assert MappedHalves(halves.path, 1024).load()[1] == b'{"n":1}'
+
+    def test_both_halves_invalid(self, tmp_path):
+        halves = MappedHalves(tmp_path / "state.snap", 1024)
+        halves.open()
+        halves.write(b'{"n":1}')
+        halves.write(b'{"n":2}')
+        halves.close()
+
+        tear(halves.path, 0)
+        tear(halves.path, HEADER.size + 1024)
+
+        assert MappedHalves(halves.path, 1024).load() is None
+        assert MappedHalves(tmp_path / "missing.snap", 1024).load() is None
+
+    def test_grow_keeps_a_valid_copy(self, tmp_path):
+        for writes in (1, 2):
+            path = tmp_path / f"state-{writes}.snap"
+            halves = MappedHalves(path, 64)
+            halves.open()
+            for n in range(writes):
+                halves.write(json.dumps({"n": n}).encode())
+            large = json.dumps({"pad": "x" * 200}).encode()
+            halves.write(large)
+            halves.close()
+
+            # The write after growing went to the second half
+            assert halves.generation % 2 == 1
+            assert MappedHalves(path, 64).load()[1] == large
+            tear(path, path.stat().st_size // 2)
+            fallback = MappedHalves(path, 64).load()
+            if writes == 2:
+                # Generation 2 was in the first half, which did not move
+                assert fallback[1] == b'{"n": 1}'
+            else:
+                # Generation 1 was in the old second half, now overwritten
+                assert fallback is None
+
+
+class TestStateSnapshot:
+    def test_round_trip(self, tmp_path):
+        snapshot = StateSnapshot(tmp_path / "state.snap")
+        partition = make_partition()
+        partition.state.apply(position(2))
+        partition.state.apply(
+            event("trade_execution", {"contractId": CONTRACT, "profitAndLoss": -50.0})
+        )
+        snapshot.open()
+        snapshot.enforcement_started((1, CONTRACT, "flatten"), "daily loss")
+        snapshot.save([partition], [{"rule": "daily_loss_limit"}])
+        snapshot.close()
+
+        saved = StateSnapshot(tmp_path / "state.snap").load()
+
+        account = saved["accounts"]["1"]
+        assert account["positions"] == {CONTRACT: 2}
+        assert account["realized_pnl"] == -50.0
+        assert saved["breaches"] == [{"rule": "daily_loss_limit"}]
+        assert list(saved["journal"]) == [f"1|{CONTRACT}|flatten"]
+
+    def test_too_old_is_ignored(self, tmp_path, monkeypatch):
+        snapshot = StateSnapshot(tmp_path / "state.snap", max_age_s=10)
+        snapshot.open()
+        snapshot.save([make_partition()], [])
+        snapshot.close()
+
+        now = snapshot_module.time.time()
+        monkeypatch.setattr(snapshot_module.time, "time", lambda: now + 60)
+
+        assert StateSnapshot(tmp_path / "state.snap", max_age_s=10).load() is None
+
+    def test_journal_is_written_on_its_own(self, tmp_path):
+        snapshot = StateSnapshot(tmp_path / "state.snap")
+        snapshot.open()
+        snapshot.save([make_partition()], [])
+        key = (1, CONTRACT, "flatten")
+
+        snapshot.enforcement_started(key, "test")
+        assert StateSnapshot(tmp_path / "state.snap").load()["journal"]
+        snapshot.enforcement_finished(key)
+
+        stats = snapshot.stats()
+        assert stats["writes"] == 1
+        assert stats["journal_writes"] == 2
+        assert stats["in_flight"] == 0
+        snapshot.close()
+        assert StateSnapshot(tmp_path / "state.snap").load()["journal"] == {}
+
+    def test_only_changed_accounts_are_saved(self, tmp_path):
+        snapshot = StateSnapshot(tmp_path / "state.snap")
+        partitions = [make_partition(1), make_partition(2)]
+        snapshot.open()
+        snapshot.save(partitions, [])
+        assert not snapshot.unsaved(partitions)
+
+        for price in (20001.0, 20002.0, 19990.0):
+            partitions[0].state.apply(quote(price))
+        assert not snapshot.unsaved(partitions)
+
+        partitions[1].state.apply(position(1))
+        assert not partitions[0].state.unsaved
+        assert partitions[1].state.unsaved
+        snapshot.save(partitions, [])
+        assert not snapshot.unsaved(partitions)
+        snapshot.close()
+
+        saved = StateSnapshot(tmp_path / "state.snap").load()
+        assert saved["accounts"]["2"]["positions"] == {CONTRACT: 1}
+        # Account 1 kept its earlier encoding: the quotes' marks were not saved
+        assert saved["accounts"]["1"]["marks"] == {}
+
+    def test_pnl_session_changes_mark_the_account(self):
+        state = make_partition().state
+        session = state.rule_state("trailing_drawdown")["session"] = PnlSession(
+            *parse_session({"reset_time": None})
+        )
+        session.update(0.0, 0.0)
+        state.dump()
+        assert not state.unsaved
+
+        session.update(-10.0, 1.0)
+        assert not state.unsaved
+        session.update(25.0, 2.0)
+        assert state.unsaved
+        state.dump()
+        session.latched = True
+        assert state.unsaved
+        state.dump()
+        session.latched = True
+        assert not state.unsaved
+        assert session.next_reset == math.inf
+
+    def test_restore_reports_differences_and_in_flight(self, tmp_path):
+        snapshot = StateSnapshot(tmp_path / "state.snap")
+        partition = make_partition()
+        partition.state.apply(position(3))
+        snapshot.open()
+        snapshot.save([partition], [])
+        snapshot.enforcement_started((1, CONTRACT, "flatten"), "daily loss")
+        snapshot.close()
+        saved = StateSnapshot(tmp_path / "state.snap").load()
+
+        restarted = make_partition()
+        restarted.state.apply(position(1))  # the REST seed
+        audit = Mock()
+        differences = restore_account(restarted, saved, Mock(), audit)
+
+        assert differences == 1
+        messages = [call.args[0] for call in audit.call_args_list]
+        assert "was 3 in the snapshot, broker reports 1" in messages[0]
+        assert "flatten of CON.F.US.MNQ.Z25 was in flight" in messages[1]
@@ -0,0 +1,283 @@
+"""
+Tests for multi-account supervision.
+
+Test Coverage Goals:
+- The login's own account reuses the suite's connection and OrderManager;
+  any other account gets its own user hub and AccountOrders for its ID
+- User-hub payloads reach the partition they arrived on, and translate()
+  drops any payload carrying another accountId
+- Flattens for a non-primary account are sent with that account's ID,
+  through the shared client or the enforcement lane
+- Terminal order statuses become ORDER_* events once per change
+- Accounts resolve by ID or name; refreshed tokens reach every user hub
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from daemon import supervisor as supervisor_module
+from daemon.enforcement import AccountOrders
+from daemon.metrics import DaemonMetrics
+from daemon.supervisor import POSITION_UPDATE, USER_HUB_FEEDS, Supervisor
+
+from project_x_py import EventType
+from project_x_py.models import Position
+from project_x_py.types import OrderSide, PositionType
+
+CONTRACT = "CON.F.US.MNQ.Z25"
+PRIMARY = 1
+OTHER = 2
+
+
+class StubRealtime:
+    """User-hub connection that records its callbacks instead of connecting."""
+
+    def __init__(self, jwt_token=None, account_id=None, config=None):
+        self.jwt_token = jwt_token
+        self.account_id = account_id
+        self.callbacks = {}
+        self.connect = AsyncMock(return_value=True)
+        self.subscribe_user_updates = AsyncMock()
+        self.disconnect = AsyncMock()
+
+    async def add_callback(self, feed, callback):
+        self.callbacks[feed] = callback
+
+    async def update_jwt_token(self, token):
+        self.jwt_token = token
+
+
+class StubSuite(dict):
+    def __init__(self, client, orders):
+        super().__init__(
+            MNQ=SimpleNamespace(
+                orders=orders,
+                instrument_info=SimpleNamespace(
+                    id=CONTRACT, tickValue=0.5, tickSize=0.25
+                ),
+            )
+        )
+        self.client = client
+        self.realtime = StubRealtime(client.session_token, str(PRIMARY))
+
+
+def long_position(account_id, size):
+    return Position(
+        id=account_id * 10,
+        accountId=account_id,
+        contractId=CONTRACT,
+        creationTimestamp="2025-03-03T15:00:00Z",
+        type=PositionType.LONG,
+        size=size,
+        averagePrice=20000.0,
+    )
+
+
+@pytest.fixture
+def suite(monkeypatch):
+    monkeypatch.setattr(supervisor_module, "ProjectXRealtimeClient", StubRealtime)
+    positions = {PRIMARY: [long_position(PRIMARY, 1)], OTHER: [long_position(OTHER, 3)]}
+
+    async def search_open_positions(account_id):
+        return positions[account_id]
+
+    client = SimpleNamespace(
+        account_info=SimpleNamespace(id=PRIMARY, name="PRIMARY"),
+        session_token="token-1",
+        config=None,
+        search_open_positions=AsyncMock(side_effect=search_open_positions),
+        list_accounts=AsyncMock(
+            return_value=[
+                SimpleNamespace(id=PRIMARY, name="PRIMARY"),
+                SimpleNamespace(id=OTHER, name="Eval-2"),
+            ]
+        ),
+        _make_request=AsyncMock(return_value={"success": True, "orderId": 99}),
+    )
+    orders = Mock(
+        search_open_orders=AsyncMock(return_value=[]),
+        place_market_order=AsyncMock(),
+        cancel_order=AsyncMock(return_value=True),
+    )
+    return StubSuite(client, orders)
+
+
+async def supervise(suite, lane=None):
+    supervisor = Supervisor(suite, Mock(), Mock(), DaemonMetrics(), lane=lane)
+    handler = AsyncMock()
+    await supervisor.add_account(PRIMARY, "PRIMARY", handler)
+    await supervisor.add_account(OTHER, "Eval-2", handler)
+    return supervisor, handler
+
+
+async def flatten(partition):
+    now = time.perf_counter()
+    return await partition.executor.flatten(CONTRACT, "test", now, now)
+
+
+class TestAddAccount:
+    @pytest.mark.asyncio
+    async def test_connections_and_orders(self, suite):
+        supervisor, _ = await supervise(suite)
+        primary, other = supervisor.get(PRIMARY), supervisor.get(OTHER)
+
+        assert primary.shared_connection and primary.realtime is suite.realtime
+        assert primary.orders is suite["MNQ"].orders
+        assert not other.shared_connection
+        assert (other.realtime.account_id, other.realtime.jwt_token) == (
+            "2",
+            "token-1",
+        )
+        other.realtime.subscribe_user_updates.assert_awaited_once()
+        assert isinstance(other.orders, AccountOrders)
+        assert other.orders.account_id == OTHER
+        suite.client.search_open_positions.assert_any_await(account_id=OTHER)
+        assert other.state.position(CONTRACT)["size"] == 3
+        assert primary.state.position(CONTRACT)["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_payloads_reach_their_partition(self, suite):
+        supervisor, handler = await supervise(suite)
+        other = supervisor.get(OTHER)
+        payload = {"accountId": OTHER, "contractId": CONTRACT, "size": 0}
+
+        assert set(other.realtime.callbacks) == set(USER_HUB_FEEDS)
+        await other.realtime.callbacks[POSITION_UPDATE](payload)
+
+        handler.assert_awaited_once_with(other, POSITION_UPDATE, payload)
+
+    @pytest.mark.asyncio
+    async def test_resolve_accounts(self, suite):
+        supervisor = Supervisor(suite, Mock(), Mock(), DaemonMetrics())
+
+        assert await supervisor.resolve_accounts([]) == [(PRIMARY, "PRIMARY")]
+        assert await supervisor.resolve_accounts([OTHER, "eval-2"]) == [
+            (OTHER, "Eval-2"),
+            (OTHER, "Eval-2"),
+        ]
+        with pytest.raises(ValueError):
+            await supervisor.resolve_accounts(["Eval-3"])
+
+
+class TestTranslate:
+    @pytest.mark.asyncio
+    async def test_other_accounts_payloads_are_dropped(self, suite):
+        supervisor, _ = await supervise(suite)
+        primary, other = supervisor.get(PRIMARY), supervisor.get(OTHER)
+        update = {"accountId": OTHER, "contractId": CONTRACT, "size": 5, "type": 1}
+
+        assert primary.translate(POSITION_UPDATE, update) == []
+        (event,) = other.translate(POSITION_UPDATE, {"action": 1, "data": update})
+        assert event.type == EventType.POSITION_UPDATED
+        assert event.source == "UserHub:2"
+
+        other.state.apply(event)
+        assert other.state.position(CONTRACT)["size"] == 5
+        assert primary.state.position(CONTRACT)["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_position_events(self, suite):
+        supervisor, _ = await supervise(suite)
+        other = supervisor.get(OTHER)
+
+        (opened,) = other.translate(
+            POSITION_UPDATE, {"contractId": "CON.F.US.ES.Z25", "size": 1}
+        )
+        (closed,) = other.translate(
+            POSITION_UPDATE, {"contractId": CONTRACT, "size": 0}
+        )
+
+        assert opened.type == EventType.POSITION_OPENED
+        assert closed.type == EventType.POSITION_CLOSED
+        assert other.translate(POSITION_UPDATE, {"size": 1}) == []
+
+    @pytest.mark.asyncio
+    async def test_terminal_status_once(self, suite):
+        supervisor, _ = await supervise(suite)
+        other = supervisor.get(OTHER)
+        order = {
+            "id": 42,
+            "accountId": OTHER,
+            "contractId": CONTRACT,
+            "creationTimestamp": "2025-03-03T15:00:00Z",
+            "updateTimestamp": None,
+            "status": 1,
+            "type": 1,
+            "side": 0,
+            "size": 1,
+        }
+
+        working = other.translate("order_update", order)
+        filled = other.translate("order_update", {**order, "status": 2})
+        repeated = other.translate("order_update", {**order, "status": 2})
+
+        assert [event.type for event in working] == ["order_update"]
+        assert [event.type for event in filled] == [
+            "order_update",
+            EventType.ORDER_FILLED,
+        ]
+        assert filled[1].data["old_status"] == 1
+        assert filled[1].data["order"].accountId == OTHER
+        assert len(repeated) == 1
+
+
+class TestRouting:
+    @pytest.mark.asyncio
+    async def test_flatten_uses_the_partitions_account(self, suite):
+        supervisor, _ = await supervise(suite)
+
+        response = await flatten(supervisor.get(OTHER))
+
+        assert response.orderId == 99
+        payload = suite.client._make_request.await_args.kwargs["data"]
+        assert (payload["accountId"], payload["side"], payload["size"]) == (
+            OTHER,
+            OrderSide.SELL,
+            3,
+        )
+        suite["MNQ"].orders.place_market_order.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_primary_flatten_uses_order_manager(self, suite):
+        supervisor, _ = await supervise(suite)
+
+        await flatten(supervisor.get(PRIMARY))
+
+        suite["MNQ"].orders.place_market_order.assert_awaited_once_with(
+            CONTRACT, OrderSide.SELL, 1, PRIMARY
+        )
+        suite.client._make_request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_lane_gets_every_accounts_orders(self, suite):
+        lane = Mock(place_market_order=AsyncMock(return_value=Mock(orderId=7)))
+        supervisor, _ = await supervise(suite, lane)
+
+        for partition in supervisor:
+            assert partition.orders.lane is lane
+            await flatten(partition)
+
+        assert [call.args for call in lane.place_market_order.await_args_list] == [
+            (CONTRACT, OrderSide.SELL, 1, PRIMARY),
+            (CONTRACT, OrderSide.SELL, 3, OTHER),
+        ]
+        suite.client._make_request.assert_not_awaited()
+
+
+class TestTokens:
+    @pytest.mark.asyncio
+    async def test_refresh_reaches_own_connections(self, suite):
+        supervisor, _ = await supervise(suite)
+        suite.client.session_token = "token-2"
+
+        await supervisor.refresh_tokens()
+
+        assert supervisor.get(OTHER).realtime.jwt_token == "token-2"
+        # The suite's own connection is refreshed by the SDK
+        assert suite.realtime.jwt_token == "token-1"
+
+        await supervisor.close()
+        supervisor.get(OTHER).realtime.disconnect.assert_awaited_once()
+        suite.realtime.disconnect.assert_not_awaited()
@@ -0,0 +1,129 @@
+"""
+Tests for the bucketed sliding-window counters.
+
+Test Coverage Goals:
+- Events expire bucket by bucket as the window advances
+- A gap longer than the window resets it; a clock stepping back counts in
+  the newest slot
+- WindowStore evicts the least recently used key and reuses its arrays
+- build_windows validates overrides; dump/load round-trips
+- max_trades_per_window validates its parameters, enforcement included
+"""
+
+import pytest
+from daemon.windows import SlidingWindow, WindowSpec, WindowStore, build_windows
+from rules import max_trades_per_window
+
+
+class TestSlidingWindow:
+    def test_advance_expires_old_buckets(self):
+        window = SlidingWindow(10, 10)
+
+        window.add(100.0, 2.0)
+        window.add(100.5, 3.0)
+        window.add(104.2)
+
+        assert window.total(105.0) == (3, 6.0)
+        # The bucket for t=100 leaves once the window reaches t=110
+        assert window.total(109.9) == (3, 6.0)
+        assert window.total(110.0) == (1, 1.0)
+        assert window.total(113.9) == (1, 1.0)
+        assert window.total(114.0) == (0, 0.0)
+
+    def test_gap_longer_than_window_resets(self):
+        window = SlidingWindow(10, 10)
+        window.add(100.0)
+        window.add(101.0)
+
+        assert window.add(500.0) == 1
+        assert window.head == 500
+
+    def test_clock_stepping_back_counts_in_newest_slot(self):
+        window = SlidingWindow(10, 10)
+        window.add(105.0)
+
+        assert window.add(102.0) == 2
+        assert window.head == 105
+        # Both leave together, with the newest slot
+        assert window.total(114.9) == (2, 2.0)
+        assert window.total(115.0) == (0, 0.0)
+
+    def test_dump_and_load(self):
+        window = SlidingWindow(60, 6)
+        for t in (0.0, 11.0, 12.0, 35.0):
+            window.add(t, t)
+
+        restored = SlidingWindow(60, 6)
+        restored.load(*window.dump())
+
+        assert restored.total(40.0) == window.total(40.0) == (4, 58.0)
+        assert restored.total(75.0) == (1, 35.0)
+
+
+class TestWindowStore:
+    def test_lru_eviction_reuses_arrays(self):
+        store = WindowStore(WindowSpec("rule", "trades", 10.0, 10, 3))
+        account = store.get()
+        first = store.get("A")
+        first.add(100.0)
+        store.get("B").add(100.0)
+
+        # Touch the account window and "A", so "B" is least recently used
+        assert store.get() is account
+        assert store.get("A") is first
+        counts = store.get("B").counts
+        store.get("A")
+        store.get()
+        evicted = store.get("C")
+
+        assert list(store.windows) == ["A", None, "C"]
+        assert evicted.counts is counts
+        assert evicted.total(100.0) == (0, 0.0)
+        assert store.get("A").total(100.0) == (1, 1.0)
+
+
+class TestBuildWindows:
+    def test_overrides_merge_with_declared(self):
+        specs = build_windows(
+            "max_trades", {"trades": {"seconds": 60}}, {"trades": {"buckets": 12}}
+        )
+
+        assert specs == {"trades": WindowSpec("max_trades", "trades", 60.0, 12, 1024)}
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"orders": {"seconds": 1}},
+            {"trades": {"seconds": 0}},
+            {"trades": {"buckets": 5000}},
+            {"trades": {"max_keys": True}},
+            [],
+        ],
+    )
+    def test_invalid_overrides(self, overrides):
+        with pytest.raises(ValueError):
+            build_windows("max_trades", {"trades": {"seconds": 60}}, overrides)
+
+
+class TestMaxTradesPerWindow:
+    def test_prepare_defaults(self):
+        config = max_trades_per_window.prepare({"parameters": {}})
+
+        assert config["parameters"] == {
+            "max_trades": 10,
+            "per": "contract",
+            "enforcement": "flatten",
+        }
+
+    @pytest.mark.parametrize(
+        "parameters",
+        [
+            {"max_trades": 0},
+            {"per": "symbol"},
+            {"enforcement": "close"},
+            {"enforcement": None},
+        ],
+    )
+    def test_invalid_parameters(self, parameters):
+        with pytest.raises(ValueError):
+            max_trades_per_window.prepare({"parameters": parameters})